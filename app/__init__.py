@@ -1,27 +1,71 @@
+import os
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_marshmallow import Marshmallow
-from config import Config
-from config import DevelopmentConfig, TestingConfig
-
-# Set the environment variable to determine the configuration (development, testing, or production)
-environment = 'development'  # Change this to 'testing' or 'production' as needed
-
-# Initialize Flask application
-app = Flask(__name__)
-
-# Configure the application based on the environment
-if environment == 'development':
-    app.config.from_object(DevelopmentConfig)
-elif environment == 'testing':
-    app.config.from_object(TestingConfig)
-
-# app = Flask(__name__)
-# app.config.from_object(Config)
-    
-# Initialize SQLAlchemy and Marshmallow
-db = SQLAlchemy(app)
-ma = Marshmallow(app)
-
-# Import routes from the 'api' module
-from app.api import routes
\ No newline at end of file
+from config import config_by_name
+from app.utils.session import RoutingSession
+
+# Initialize SQLAlchemy and Marshmallow; they are bound to an application in create_app().
+# The routing session lets selected reads go to a read replica (see app.utils.replica).
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+ma = Marshmallow()
+
+
+def create_app(config=None):
+    """
+    Create and configure a Flask application.
+
+    Parameters:
+        config (optional): Configuration class, or its name ('development', 'testing' or
+            'production'). Defaults to the APP_ENV environment variable, or 'development'.
+
+    Returns:
+        The configured Flask application with the API routes registered.
+    """
+    if config is None:
+        config = os.environ.get('APP_ENV', 'development')
+    if isinstance(config, str):
+        config = config_by_name[config]
+
+    # Initialize Flask application
+    app = Flask(__name__)
+    app.config.from_object(config)
+
+    if app.config.get('METRICS_ENABLED'):
+        from app.utils.metrics import configure_pool_metrics
+        configure_pool_metrics(app)
+
+    # Bind SQLAlchemy and Marshmallow to the application
+    db.init_app(app)
+    ma.init_app(app)
+
+    from app.utils.engine import configure_engines
+    with app.app_context():
+        configure_engines(app)
+
+    # Opt-in SQL/serialization timings, Server-Timing headers and slow request/query logs
+    from app.utils.instrumentation import init_instrumentation
+    init_instrumentation(app)
+
+    # Prometheus metrics at /metrics (request latencies, pool usage, cache hits, payload sizes)
+    if app.config.get('METRICS_ENABLED'):
+        from app.utils.metrics import init_metrics
+        init_metrics(app)
+
+    # Response compression negotiated with Accept-Encoding (registered last, so it runs first)
+    from app.utils.compression import init_compression
+    init_compression(app)
+
+    # Optional queue of submitted comments, written in batches by a background thread
+    from app.utils.ingest import init_comment_ingest
+    init_comment_ingest(app)
+
+    # Register routes from the 'api' module
+    from app.api.routes import api
+    app.register_blueprint(api)
+
+    # Maintenance commands, e.g. `flask --app main reconcile-comment-counts`
+    from app.commands import register_commands
+    register_commands(app)
+
+    return app
@@ -0,0 +1,45 @@
+import os
+from quart import Quart
+from config import config_by_name
+from app.aio.database import async_db
+
+
+def create_async_app(config=None):
+    """
+    Create the async (ASGI) variant of the article API.
+
+    It serves the same routes and JSON contract as the Flask application, with the same request
+    handlers (app.api.handlers), caches, read replica routing, compression and metrics, but runs
+    its queries on an AsyncSession so one process can keep many requests in flight.
+    Serve it with an ASGI server, e.g. `hypercorn asgi:app`.
+
+    Parameters:
+        config (optional): Configuration class, or its name ('development', 'testing' or
+            'production'). Defaults to the APP_ENV environment variable, or 'development'.
+
+    Returns:
+        The configured Quart application.
+    """
+    if config is None:
+        config = os.environ.get('APP_ENV', 'development')
+    if isinstance(config, str):
+        config = config_by_name[config]
+
+    # Initialize Quart application
+    app = Quart(__name__)
+    app.config.from_object(config)
+
+    # Bind the async engines and session factory to the application
+    async_db.init_app(app)
+
+    # Prometheus metrics at /metrics and response compression, as in the Flask application
+    from app.aio.bindings import init_metrics, init_compression
+    if app.config.get('METRICS_ENABLED'):
+        init_metrics(app)
+    init_compression(app)
+
+    # Register routes from the 'routes' module
+    from app.aio.routes import api
+    app.register_blueprint(api)
+
+    return app
@@ -0,0 +1,204 @@
+import asyncio
+import time
+from functools import wraps
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from quart import current_app, g, request, make_response, Response
+from quart.wrappers.response import DataBody, IterableBody
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.util import await_only
+from app.aio.database import async_db
+from app.api.handlers import response_cache
+from app.utils.compression import ENCODINGS, select_encoding, mark_encoded
+from app.utils.conditional import is_fresh
+from app.utils.metrics import metrics_registry, observe_request, watch_pool
+from app.utils.replica import (read_watermark, watermark_lag, cached_replica_check, record_replica_check,
+                               pinned_to_primary, pin_client)
+
+# Quart counterparts of the Flask decorators and hooks of app.utils (conditional requests,
+# response cache, read replica, compression and metrics). They share those modules' logic and
+# state, and run the synchronous parts on an AsyncSession through run_sync.
+
+
+async def run_handler(handler, *args, **kwargs):
+    """Run a handler of app.api.handlers on a new AsyncSession and return its result."""
+    async with async_db.session() as session:
+        return await session.run_sync(handler, *args, **kwargs)
+
+
+def greenlet_sleep(seconds):
+    """Wait inside run_sync without blocking the event loop (see app.utils.bulk.bulk_delete)."""
+    await_only(asyncio.sleep(seconds))
+
+
+def conditional(validators):
+    """
+    Decorator adding ETag/Last-Modified headers to a GET view and answering 304 when the client
+    copy is current (see app.utils.conditional.conditional).
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            current = await run_handler(validators, request.args, **kwargs)
+            if current is None:
+                return await view(*args, **kwargs)
+
+            etag, weak, last_modified = current
+            if is_fresh(request, etag, last_modified):
+                response = Response(b'', status=304)
+            else:
+                response = await make_response(await view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=weak)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            return response
+        return wrapper
+    return decorator
+
+
+def cached(scope, ident_arg=None):
+    """
+    Decorator caching successful JSON responses of a GET view in the shared response cache
+    (see app.utils.response_cache.ResponseCache.cached).
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            backend = response_cache.backend_for(current_app)
+            if backend is None:
+                return await view(*args, **kwargs)
+
+            key = response_cache.key(backend, scope, kwargs.get(ident_arg) if ident_arg else None, request.args)
+            entry = response_cache.lookup(backend, key)
+            if entry is not None:
+                headers, body = entry
+                response = Response(body, status=200, mimetype='application/json', headers=headers)
+                response.headers['X-Cache'] = 'HIT'
+                # Answer conditional requests from the cached validators without touching the database
+                return await response.make_conditional(request)
+
+            response = await make_response(await view(*args, **kwargs))
+            if response.status_code == 200 and isinstance(response.response, DataBody):
+                response_cache.store(backend, key, response.headers, await response.get_data(),
+                                     current_app.config.get('RESPONSE_CACHE_TTL', 60))
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+
+async def replica_usable(replica):
+    """
+    Return True if reads may be sent to the replica (see app.utils.replica.replica_usable).
+
+    Shares the cached checks of the Flask application, keyed by the replica's sync engine.
+    """
+    config = current_app.config
+    usable = cached_replica_check(replica.sync_engine, config)
+    if usable is not None:
+        return usable
+
+    try:
+        async with async_db.engine.connect() as connection:
+            primary_marks = await connection.run_sync(read_watermark)
+        async with replica.connect() as connection:
+            replica_marks = await connection.run_sync(read_watermark)
+        usable = watermark_lag(primary_marks, replica_marks) <= config.get('REPLICA_MAX_LAG', 0)
+    except SQLAlchemyError as e:
+        current_app.logger.warning("Read replica unavailable, reading from the primary: %s", e)
+        usable = False
+    record_replica_check(replica.sync_engine, usable)
+    return usable
+
+
+def read_replica(view):
+    """
+    Decorator sending the reads of a GET view to the read replica, under the same conditions as
+    app.utils.replica.read_replica: sessions opened by the view read from the replica.
+    """
+    @wraps(view)
+    async def wrapper(*args, **kwargs):
+        replica = async_db.replica
+        if replica is not None and not pinned_to_primary(request.cookies) and await replica_usable(replica):
+            g.read_engine = replica
+        return await view(*args, **kwargs)
+    return wrapper
+
+
+async def pin_after_write(response):
+    """after_request handler pinning a client to the primary after a successful write."""
+    return pin_client(request, response, current_app.config, async_db.replica is not None)
+
+
+async def _stream(body, compressor):
+    async with body as chunks:
+        async for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+    yield compressor.finish()
+
+
+async def compress_response(response, config):
+    """Encode `response` with the best coding accepted by the client (see app.utils.compression)."""
+    encoding = select_encoding(response, request.accept_encodings, config)
+    if encoding is None:
+        return response
+    compress, stream = ENCODINGS[encoding]
+    level = config['COMPRESSION_LEVELS'][encoding]
+
+    if isinstance(response.response, DataBody):
+        data = await response.get_data()
+        if len(data) < config['COMPRESSION_MIN_SIZE']:
+            return response
+        response.set_data(compress(data, level))
+    else:
+        response.response = IterableBody(_stream(response.response, stream(level)))
+        response.headers.pop('Content-Length', None)
+    return mark_encoded(response, encoding)
+
+
+def init_compression(app):
+    """Compress responses negotiated with Accept-Encoding when COMPRESSION_ENABLED is set."""
+    if not app.config.get('COMPRESSION_ENABLED'):
+        return
+
+    @app.after_request
+    async def compress(response):
+        return await compress_response(response, app.config)
+
+
+async def metrics_view():
+    """Render every metric in the Prometheus text exposition format."""
+    return Response(generate_latest(metrics_registry()), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app):
+    """
+    Record request and database pool metrics in the shared registry and serve them at /metrics.
+
+    async_db.init_app() must have run, so that the pools of its engines can be watched.
+    """
+    engine, _, replica = app.extensions['async_db']
+    watch_pool('default', engine.sync_engine)
+    if replica is not None:
+        watch_pool('replica', replica.sync_engine)
+
+    @app.before_request
+    async def start_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    async def record_request(response):
+        start = g.pop('metrics_start', None)
+        if start is None:
+            return response
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        observe_request(request.method, route, response.status_code, response.content_length,
+                        time.perf_counter() - start)
+        return response
+
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
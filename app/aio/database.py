@@ -0,0 +1,91 @@
+import os
+from quart import current_app, g, has_request_context
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.utils.engine import apply_sqlite_pragmas, sqlite_pragmas
+from app.utils.replica import REPLICA_BIND, watch_replica
+from app.utils.session import READ_ENGINE_KEY, ReadRoutingSession
+
+# Async drivers used in place of the synchronous ones configured for the Flask application
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+}
+
+
+def async_database_url(app, uri=None):
+    """
+    Derive the async database URL from SQLALCHEMY_DATABASE_URI (or from another database URI).
+
+    Relative SQLite paths are resolved against the instance folder, like Flask-SQLAlchemy does,
+    so both applications share the same database file.
+    """
+    url = make_url(uri or app.config['SQLALCHEMY_DATABASE_URI'])
+    url = url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+    if url.get_backend_name() == 'sqlite' and url.database and url.database != ':memory:':
+        if not os.path.isabs(url.database):
+            os.makedirs(app.instance_path, exist_ok=True)
+            url = url.set(database=os.path.join(app.instance_path, url.database))
+    return url
+
+
+class AsyncDatabase:
+    """
+    Async engines and session factory for the Quart application, the counterpart of `db`.
+
+    The engines use the same SQLALCHEMY_ENGINE_OPTIONS and SQLITE_PRAGMAS as the Flask
+    application; SQLALCHEMY_BINDS['replica'] adds a read replica engine. Views open a session per
+    request with `async with async_db.session() as session`.
+    """
+
+    def init_app(self, app):
+        engine = self._create_engine(app, async_database_url(app))
+        replica_uri = (app.config.get('SQLALCHEMY_BINDS') or {}).get(REPLICA_BIND)
+        replica = self._create_engine(app, async_database_url(app, replica_uri)) if replica_uri else None
+        if replica is not None:
+            watch_replica(replica.sync_engine)
+
+        # Objects stay usable after commit; attribute refreshes would need awaiting
+        sessions = async_sessionmaker(engine, expire_on_commit=False, sync_session_class=ReadRoutingSession)
+        app.extensions['async_db'] = (engine, sessions, replica)
+
+        @app.after_serving
+        async def dispose_engines():
+            await engine.dispose()
+            if replica is not None:
+                await replica.dispose()
+
+    @staticmethod
+    def _create_engine(app, url):
+        options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+        if url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:'):
+            # aiosqlite opens a thread per connection, so keep connections in a pool
+            options.setdefault('poolclass', AsyncAdaptedQueuePool)
+        engine = create_async_engine(url, **options)
+        apply_sqlite_pragmas(engine.sync_engine, sqlite_pragmas(app.config))
+        return engine
+
+    @property
+    def engine(self):
+        """Async engine of the current application."""
+        return current_app.extensions['async_db'][0]
+
+    @property
+    def replica(self):
+        """Async engine of the read replica of the current application, or None."""
+        return current_app.extensions['async_db'][2]
+
+    def session(self):
+        """
+        Create a new AsyncSession for the current application.
+
+        Its reads go to the replica when app.aio.bindings.read_replica selected it for the request.
+        """
+        replica = g.get('read_engine') if has_request_context() else None
+        info = {READ_ENGINE_KEY: replica.sync_engine} if replica is not None else {}
+        return current_app.extensions['async_db'][1](info=info)
+
+
+# Async database shared by the Quart views, bound to an application in create_async_app()
+async_db = AsyncDatabase()
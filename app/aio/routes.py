@@ -0,0 +1,328 @@
+import asyncio
+from quart import Blueprint, current_app, request, jsonify, Response, stream_with_context
+from app.aio.bindings import run_handler, greenlet_sleep, conditional, cached, read_replica, pin_after_write
+from app.aio.database import async_db
+from app.api import handlers
+from app.api.handlers import response_cache
+from app.utils.bulk import iter_ndjson, iter_json_array
+from app.utils.conditional import article_validators, list_validators
+from app.utils.serializer import dumps
+
+# Quart binding of the API: the request handling is shared with the Flask application and lives
+# in app.api.handlers, run on an AsyncSession through run_sync. Queued comment ingestion is only
+# served by the Flask application, whose writer thread runs in its application context; here
+# comments are always written by the request.
+
+# Blueprint holding the async API routes, registered on the application by create_async_app()
+api = Blueprint('api', __name__)
+
+# Pin clients to the primary database for a short window after they write, so they read their own writes
+api.after_request(pin_after_write)
+
+
+def json_response(payload, status=200):
+    """Build a JSON response from `payload` using the fast encoder."""
+    return Response(dumps(payload), status=status, mimetype='application/json')
+
+
+def versioned_response(payload, status, validators=None):
+    """
+    JSON response of an article update, with the validators a GET of the updated article returns
+    (see app.utils.conditional.article_validators), so its ETag serves both If-Match and If-None-Match.
+    """
+    response = json_response(payload, status)
+    if validators is not None:
+        etag, weak, last_modified = validators
+        response.set_etag(etag, weak=weak)
+        response.last_modified = last_modified
+    return response
+
+
+async def request_items():
+    """
+    Return the items of a bulk request body: a JSON array, or NDJSON lines when the Content-Type
+    is application/x-ndjson (see app.utils.bulk.iter_request_items).
+    """
+    if request.mimetype == 'application/x-ndjson':
+        return iter_ndjson((await request.get_data()).splitlines())
+    return iter_json_array(await request.get_json())
+
+
+def feed_turn():
+    """
+    Lock taken by requests of this application while they read the latest articles feed.
+
+    A refresh holds the feed's thread lock while its query waits for the database; another
+    request running on the same event loop thread must not block on that lock meanwhile.
+    """
+    return current_app.extensions.setdefault('feed_turn', asyncio.Lock())
+
+
+# Create a new article
+@api.route('/api/articles', methods=['POST'])
+async def create_article():
+    """
+    Create a new article (see app.api.routes.create_article).
+
+    Returns:
+        JSON response with the created article's data and a success message, or an error message on failure.
+    """
+    try:
+        return json_response(*await run_handler(handlers.create_article, await request.get_json()))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+# Create many articles at once
+@api.route('/api/articles/bulk', methods=['POST'])
+async def create_articles_bulk():
+    """
+    Create many articles from a JSON array or an NDJSON body (see app.api.routes.create_articles_bulk).
+
+    Returns:
+        JSON response with the number and ids of inserted articles and the per-item errors of
+        rejected ones, or an error message on failure.
+    """
+    try:
+        items = await request_items()
+        return json_response(*await run_handler(handlers.create_articles_bulk, items, request.args,
+                                                current_app.config))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+# Retrieve a list of articles
+@api.route('/api/articles', methods=['GET'])
+@read_replica
+@cached('list')
+@conditional(list_validators)
+async def get_articles():
+    """
+    Retrieve a list of articles with optional filters, pagination, and sorting.
+
+    Accepts the same parameters as app.api.routes.get_articles.
+
+    Returns:
+        JSON response with the list of articles, total count, and a success message, or an error message on failure.
+    """
+    try:
+        return json_response(*await run_handler(handlers.list_articles, request.args, current_app.config))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+# Retrieve the newest published articles
+@api.route('/api/articles/latest', methods=['GET'])
+async def get_latest_articles():
+    """
+    Retrieve the newest published articles from the in-memory feed (see app.api.routes.get_latest_articles).
+
+    Returns:
+        JSON response with a page of article summaries and the next cursor, or an error message on failure.
+    """
+    try:
+        async with feed_turn():
+            body = await run_handler(handlers.latest_articles_body, request.args, current_app.config)
+        return Response(body, status=200, mimetype='application/json')
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+# Search articles by relevance
+@api.route('/api/articles/search', methods=['GET'])
+@read_replica
+async def search_articles():
+    """
+    Search articles by keyword, best matches first (see app.api.routes.search_articles).
+
+    Returns:
+        JSON response with the matching articles, each with its rank and highlights, or an error message on failure.
+    """
+    try:
+        return json_response(*await run_handler(handlers.search_articles, request.args, current_app.config))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+# Retrieve a specific article by ID
+@api.route('/api/article/<int:article_id>', methods=['GET'])
+@read_replica
+@cached('article', ident_arg='article_id')
+@conditional(article_validators)
+async def get_article(article_id):
+    """
+    Retrieve a specific article by ID (see app.api.routes.get_article).
+
+    Returns:
+        JSON response with the article data and a success message, or an error message on failure.
+    """
+    try:
+        return json_response(*await run_handler(handlers.get_article, request.args, article_id))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+# Report response cache statistics
+@api.route('/api/cache/stats', methods=['GET'])
+async def get_cache_stats():
+    """
+    Report the hit and miss counters of the response cache.
+
+    Returns:
+        JSON response with hits, misses, hit ratio and number of cached entries.
+    """
+    return jsonify({"data":response_cache.stats(current_app),"message":"Data retrieved successfully"}), 200
+
+# Retrieve authors with their article and comment totals
+@api.route('/api/authors', methods=['GET'])
+@read_replica
+async def get_authors():
+    """
+    Retrieve authors with their number of articles, last publication date and number of comments.
+
+    Same parameters and output as app.api.routes.get_authors.
+    """
+    try:
+        return json_response(*await run_handler(handlers.list_authors, request.args))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+# Retrieve one author's article and comment totals
+@api.route('/api/authors/<author>', methods=['GET'])
+@read_replica
+async def get_author(author):
+    """
+    Retrieve the aggregates of one author (see app.api.routes.get_author).
+    """
+    try:
+        return json_response(*await run_handler(handlers.get_author, author))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+# Create a new comment for a specific article
+@api.route('/api/articles/<int:article_id>/comments', methods=['POST'])
+async def create_comment(article_id):
+    """
+    Create a new comment for a specific article.
+
+    Parameters:
+        article_id: ID of the article to which the comment belongs.
+
+    Returns:
+        JSON response with the created comment's data and a success message, or an error message on failure.
+    """
+    try:
+        return json_response(*await run_handler(handlers.create_comment, article_id, await request.get_json()))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+# Create many comments for a specific article at once
+@api.route('/api/articles/<int:article_id>/comments/bulk', methods=['POST'])
+async def create_comments_bulk(article_id):
+    """
+    Create many comments for a specific article (see app.api.routes.create_comments_bulk).
+
+    Returns:
+        JSON response with the number and ids of inserted comments and the per-item errors of
+        rejected ones, or an error message on failure.
+    """
+    try:
+        items = await request_items()
+        return json_response(*await run_handler(handlers.create_comments_bulk, article_id, items, request.args,
+                                                current_app.config))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+# Retrieve the comments of a specific article
+@api.route('/api/articles/<int:article_id>/comments', methods=['GET'])
+@read_replica
+async def get_comments(article_id):
+    """
+    Retrieve the comments of a specific article with keyset pagination or as an NDJSON stream.
+
+    Accepts the same parameters as app.api.routes.get_comments.
+
+    Returns:
+        JSON response with a page of comments and the next cursor, an NDJSON stream of comments,
+        or an error message on failure.
+    """
+    try:
+        stream = (request.args.get('format') == 'ndjson'
+                  or request.accept_mimetypes.best == 'application/x-ndjson')
+        if not stream:
+            return json_response(*await run_handler(handlers.list_comments, request.args, article_id))
+
+        if not await run_handler(handlers.article_exists, article_id):
+            return json_response(*handlers.ARTICLE_NOT_FOUND)
+        _, statement = handlers.comments_statement(request.args, article_id)
+
+        @stream_with_context
+        async def generate():
+            # Fetch rows in chunks from a server-side cursor so memory use stays bounded
+            async with async_db.session() as session:
+                result = await session.stream_scalars(statement.execution_options(yield_per=handlers.STREAM_CHUNK_SIZE))
+                async for chunk in result.partitions():
+                    yield handlers.comment_lines(chunk)
+
+        return Response(generate(), mimetype='application/x-ndjson')
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+# Update a specific article by ID
+@api.route('/api/articles/<int:article_id>', methods=['PUT'])
+async def update_article(article_id):
+    """
+    Update a specific article by ID (see app.api.routes.update_article).
+
+    Returns:
+        JSON response with the updated article's data and a success message, or an error message on failure.
+        409 if a concurrent update committed first.
+    """
+    try:
+        return versioned_response(*await run_handler(handlers.update_article, request.args, article_id,
+                                                     await request.get_json(), request.if_match))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+# Partially update a specific article by ID
+@api.route('/api/articles/<int:article_id>', methods=['PATCH'])
+async def patch_article(article_id):
+    """
+    Update only the fields given in the request body, with a single UPDATE ... RETURNING.
+
+    Same contract as app.api.routes.patch_article.
+    """
+    try:
+        return versioned_response(*await run_handler(handlers.patch_article, request.args, article_id,
+                                                     await request.get_json(), request.if_match))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+# Delete a specific article by ID
+@api.route('/api/articles/<int:article_id>', methods=['DELETE'])
+async def delete_article(article_id):
+    """
+    Delete a specific article by ID.
+
+    Parameters:
+        article_id: ID of the article to delete.
+
+    Returns:
+        JSON response with a success message, or an error message on failure.
+    """
+    try:
+        return json_response(*await run_handler(handlers.delete_article, article_id))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+# Delete many articles at once
+@api.route('/api/articles/bulk', methods=['DELETE'])
+async def delete_articles_bulk():
+    """
+    Delete the articles selected by id and/or by filter, in batches (see app.api.routes.delete_articles_bulk).
+
+    Pauses between batches (BULK_DELETE_PAUSE) let the event loop serve other requests.
+
+    Returns:
+        JSON response with the number and ids of deleted articles, the number of deleted comments
+        and of batches, or an error message on failure.
+    """
+    try:
+        return json_response(*await run_handler(handlers.delete_articles_bulk, await request.get_json(),
+                                                request.args, current_app.config, sleep=greenlet_sleep))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
@@ -0,0 +1,679 @@
+import time
+from datetime import datetime
+from sqlalchemy.orm.exc import StaleDataError
+from app import db
+from app.models.article import Article, indian_timezone, normalize_author
+from app.models.comment import Comment
+from app.schemas.article_schema import ArticleSchema, ArticleInputSchema
+from app.schemas.comment_schema import CommentSchema, CommentInputSchema
+from app.utils.pagination import (sort_keys, article_sort_fields, author_sort_fields, order_by_clauses,
+                                  keyset_filter, encode_cursor, decode_cursor)
+from app.utils.parser import parse_pagination_args, parse_include_args, parse_fields_args, parse_sort_args
+from app.utils.cache import TTLCache
+from app.utils.changes import ChangeSet, on_change, notify
+from app.utils.bulk import bulk_insert, bulk_delete
+from app.utils.search import keyword_condition, normalize_keyword, render_highlight, ranked_search, search_index_usable
+from app.utils.comments import article_comments, comment_previews, count_comments
+from app.utils.serializer import article_serializer, article_projection, comment_serializer, author_serializer, dumps
+from app.utils.response_cache import ResponseCache
+from app.utils.versioning import if_match_versions, article_update_statement
+from app.utils.metrics import record_cache
+from app.utils.feed import latest_feed
+from app.utils.deletions import record_deletion
+from app.utils.conditional import article_validators, article_validator_columns, article_validators_from
+from app.utils.authors import (refresh_author_stats, add_article_authors, author_move_update, move_author_article,
+                               author_article_columns, authors_page_query, author_query)
+
+# Request handling shared by the Flask API (app.api.routes) and the async API (app.aio.routes).
+# Handlers run on a synchronous session (db.session, or the session of an AsyncSession through
+# run_sync), receive the query arguments, JSON body and configuration they need, and return a
+# (payload, status) pair that each application turns into its own response.
+
+# Create instances of the data schema classes
+article_schema = ArticleSchema()
+article_summary_schema = ArticleSchema(exclude=('comments',))
+comment_schema = CommentSchema()
+article_input_schema = ArticleInputSchema()
+comment_input_schema = CommentInputSchema()
+
+# Set default values for pagination and sorting
+DEFAULT_PER_PAGE = 10
+MAX_PER_PAGE = 100
+DEFAULT_SORT_BY = 'pub_date'
+DEFAULT_SORT_ORDER = 'asc'
+
+# Number of comments fetched from the database per chunk when streaming NDJSON
+STREAM_CHUNK_SIZE = 500
+
+# Upper bound for the batch_size argument of the bulk endpoints
+MAX_BULK_BATCH_SIZE = 5000
+
+# Response to requests naming an article that does not exist
+ARTICLE_NOT_FOUND = {"message": "No articles found with provided id"}, 404
+
+# Total article counts keyed by the normalized filter set (author, keyword)
+total_count_cache = TTLCache(maxsize=512)
+
+# Serialized responses of article reads, keyed by article id or list-query parameters
+response_cache = ResponseCache()
+
+
+@on_change
+def invalidate_total_counts(changes):
+    """
+    Drop cached totals whenever articles are created, updated or deleted.
+
+    Updates are included because changing an author, title or content can move an article
+    in or out of a filtered result set.
+    """
+    if changes.created or changes.updated or changes.deleted:
+        total_count_cache.clear()
+
+
+@on_change
+def invalidate_responses(changes):
+    """
+    Drop cached responses affected by a commit.
+
+    Every change can alter some list page (membership, order or embedded comments), while
+    single-article responses are only dropped for the articles that changed. Created articles
+    have no cached responses: a reused id had its own dropped when it was deleted.
+    """
+    response_cache.invalidate_articles(changes.updated | changes.deleted | changes.commented)
+    response_cache.invalidate_lists()
+
+
+def parse_per_page(args):
+    """Parse the per_page argument, capped at MAX_PER_PAGE."""
+    _, per_page = parse_pagination_args(args)
+    return min(max(per_page, 1), MAX_PER_PAGE)
+
+
+def parse_batch_size(args, config):
+    """Parse the batch_size argument of the bulk endpoints."""
+    batch_size = args.get('batch_size', config['BULK_BATCH_SIZE'], type=int)
+    return min(max(batch_size, 1), MAX_BULK_BATCH_SIZE)
+
+
+def parse_older_than(value):
+    """Parse an ISO 8601 timestamp into the naive Indian Standard Time stored in the database."""
+    timestamp = datetime.fromisoformat(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(indian_timezone).replace(tzinfo=None)
+    return timestamp
+
+
+def article_exists(session, article_id):
+    """Return True if the article exists, without loading its columns."""
+    return session.scalar(db.select(Article.id).where(Article.id == article_id)) is not None
+
+
+def dump_articles(session, rows, include_comments, comments_limit=None, serializer=article_serializer):
+    """
+    Serialize article column tuples with the requested comment embedding.
+
+    Rows must be selected with the columns of `serializer` (article_serializer or a projection
+    of it). Without comments no comment query runs; otherwise the comments of all articles are
+    loaded with one extra query (capped ones with a windowed query) and a `comment_count` field
+    is added.
+    """
+    result = serializer.to_dicts(rows)
+    if not include_comments:
+        return result
+
+    article_ids = [item["id"] for item in result]
+    if comments_limit is None:
+        comments = article_comments(session, article_ids)
+        for item in result:
+            item["comments"] = comment_serializer.to_dicts(comments[item["id"]])
+            item["comment_count"] = len(item["comments"])
+        return result
+
+    previews = comment_previews(session, article_ids, comments_limit)
+    for item in result:
+        count, comments = previews[item["id"]]
+        item["comments"] = comment_serializer.to_dicts(comments)
+        item["comment_count"] = count
+    return result
+
+
+def create_article(session, data):
+    """
+    Create a new article.
+
+    Parameters:
+        session: Session to write with.
+        data: JSON body with the title, content and author.
+
+    Returns:
+        (payload, status) with the created article's data, or 400 if a required field is blank.
+    """
+    # Check if required fields are present
+    if not all(data.get(key) for key in ['title','content']):
+        return {"message": "Title and content fields are required and cannot be blank"}, 400
+
+    # Create a new Article instance
+    new_article = Article(
+        title=data['title'],
+        content=data['content'],
+        author=data['author']
+    )
+
+    # Add the new article to the database and commit changes
+    session.add(new_article)
+    session.commit()
+
+    # Serialize the article data
+    result = article_summary_schema.dump(new_article)
+    result["comments"] = []
+    return {"data":result,"message":"Data inserted successfully"}, 201
+
+
+def bulk_response(inserted_ids, errors, label):
+    """
+    Build the (payload, status) of a bulk insert endpoint.
+
+    The status is 201 if at least one item was stored and 400 if every item was rejected.
+    """
+    payload = {
+        "inserted": len(inserted_ids),
+        "ids": inserted_ids,
+        "errors": errors,
+        "message": f"{len(inserted_ids)} {label} inserted, {len(errors)} rejected",
+    }
+    return payload, 201 if inserted_ids or not errors else 400
+
+
+def create_articles_bulk(session, items, args, config):
+    """
+    Create many articles.
+
+    Parameters:
+        session: Session to write with.
+        items: Iterable of submitted articles (see app.utils.bulk.iter_ndjson and iter_json_array).
+        args: Query arguments (batch_size).
+        config: Application configuration (BULK_BATCH_SIZE).
+
+    Returns:
+        (payload, status) with the number and ids of inserted articles and the per-item errors of
+        rejected ones (by position in the submitted list).
+    """
+    inserted_ids, errors = bulk_insert(session, Article, items, article_input_schema, parse_batch_size(args, config),
+                                       on_batch=lambda ids: add_article_authors(session, ids))
+    notify(ChangeSet(created=set(inserted_ids)))
+    return bulk_response(inserted_ids, errors, "articles")
+
+
+def list_articles(session, args, config):
+    """
+    Retrieve a list of articles with optional filters, pagination, and sorting.
+
+    Parameters:
+        session: Session to query.
+        args: Query arguments, documented on app.api.routes.get_articles.
+        config: Application configuration (SEARCH_BACKEND, TOTAL_COUNT_CACHE_TTL).
+
+    Returns:
+        (payload, status) with the list of articles, total count and next cursor.
+    """
+    # Parse query parameters
+    page, per_page = parse_pagination_args(args)
+    page = max(page, 1)
+    per_page = min(max(per_page, 1), MAX_PER_PAGE)
+    cursor = args.get('cursor')
+    author_filter = args.get('author')
+    keyword_filter = normalize_keyword(args.get('keyword'))
+    include_total = args.get('include_total', 'true').lower() not in ('false', '0', 'no')
+    include_comments, comments_limit = parse_include_args(default_include=False, args=args)
+    serializer = article_projection(*parse_fields_args(args))
+    keys = parse_sort_args(article_sort_fields, DEFAULT_SORT_BY, DEFAULT_SORT_ORDER, args)
+
+    # Start building the articles query, selecting plain column tuples of the requested fields
+    # (and the sort keys, which cursors are built from) for fast serialization
+    articles_query = db.select(*serializer.select_columns(column for column, _ in keys))
+
+    # Apply author filter if provided
+    if author_filter:
+        articles_query = articles_query.where(Article.author_key == normalize_author(author_filter))
+
+    # Apply keyword filter if provided (full-text index when available, substring match otherwise)
+    if keyword_filter:
+        use_index = search_index_usable(session.connection(), config)
+        articles_query = articles_query.where(keyword_condition(keyword_filter, use_index=use_index))
+
+    # Apply sorting based on parameters, with the article id as a tiebreak for a stable order
+    count_query = articles_query
+    articles_query = articles_query.order_by(*order_by_clauses(keys))
+
+    # Reuse a cached total for this filter set when available
+    count_key = (normalize_author(author_filter) if author_filter else None, keyword_filter or None)
+    total_article = total_count_cache.get(count_key) if include_total else None
+    if include_total:
+        record_cache('total_count', total_article is not None)
+
+    if cursor is not None:
+        # Keyset pagination: continue after the last (sort value, id) seen by the client
+        if cursor:
+            articles_query = articles_query.where(keyset_filter(keys, decode_cursor(keys, cursor)))
+        items = session.execute(articles_query.limit(per_page + 1)).all()
+        next_cursor = encode_cursor(keys, items[per_page - 1]) if len(items) > per_page else None
+        items = items[:per_page]
+        first_page = not cursor
+        last_page = next_cursor is None
+    else:
+        # Offset pagination; the total is counted below only when it is actually needed
+        items = session.execute(articles_query.limit(per_page).offset((page - 1) * per_page)).all()
+        first_page = page == 1
+        last_page = len(items) < per_page
+
+    if include_total and total_article is None:
+        if first_page and last_page:
+            # The whole result set fits on the first page, so no COUNT query is needed
+            total_article = len(items)
+        else:
+            total_article = session.scalar(db.select(db.func.count()).select_from(count_query.subquery()))
+        total_count_cache.set(count_key, total_article, ttl=config['TOTAL_COUNT_CACHE_TTL'])
+
+    # Serialize the articles data
+    result = dump_articles(session, items, include_comments, comments_limit, serializer)
+    if not result:
+        return {"data":[],"message":"No articles found"}, 200
+    payload = {"data":result,"message":"Data retrieved successfully"}
+    if include_total:
+        payload["total_article"] = total_article
+    if cursor is not None:
+        payload["next_cursor"] = next_cursor
+    return payload, 200
+
+
+def latest_articles_body(session, args, config):
+    """
+    Return a page of the latest articles feed (see app.utils.feed) as JSON bytes.
+
+    Parameters:
+        session: Session used when the feed must be refreshed.
+        args: Query arguments (per_page, cursor).
+        config: Application configuration (FEED_SIZE, FEED_MAX_AGE).
+    """
+    return latest_feed.page(session, config, parse_per_page(args), args.get('cursor'))
+
+
+def search_articles(session, args, config):
+    """
+    Search articles by keyword, best matches first.
+
+    Parameters:
+        session: Session to query.
+        args: Query arguments (q, page, per_page).
+        config: Application configuration (SEARCH_BACKEND).
+
+    Returns:
+        (payload, status) with the matching articles, each with its rank and highlights, or 400
+        without search terms.
+    """
+    keyword = args.get('q', '')
+    if not keyword.strip():
+        return {"message": "Search query parameter q is required"}, 400
+    page, per_page = parse_pagination_args(args)
+    per_page = min(max(per_page, 1), MAX_PER_PAGE)
+
+    result = []
+    for article, rank, title, snippet in ranked_search(session, config, keyword, max(page, 1), per_page):
+        item = article_summary_schema.dump(article)
+        item["rank"] = rank
+        item["highlight"] = {"title": render_highlight(title), "content": render_highlight(snippet)}
+        result.append(item)
+
+    if not result:
+        return {"data":[],"message":"No articles found"}, 200
+    return {"data":result,"message":"Data retrieved successfully"}, 200
+
+
+def get_article(session, args, article_id):
+    """
+    Retrieve a specific article by ID.
+
+    Parameters:
+        session: Session to query.
+        args: Query arguments (include, comments_limit).
+        article_id: ID of the article to retrieve.
+
+    Returns:
+        (payload, status) with the article data, or 404 if it does not exist.
+    """
+    include_comments, comments_limit = parse_include_args(default_include=True, args=args)
+
+    # Retrieve the article columns from the database
+    article = session.execute(
+        db.select(*article_serializer.columns).where(Article.id == article_id)
+    ).first()
+    if article is None:
+        return {"data":[],"message":"No articles found with provided id"}, 404
+    result = dump_articles(session, [article], include_comments, comments_limit)[0]
+    return {"data":result,"message":"Data retrieved successfully"}, 200
+
+
+def list_authors(session, args):
+    """
+    Retrieve a page of authors from the maintained aggregates (see app.utils.authors).
+
+    Parameters:
+        session: Session to query.
+        args: Query arguments (per_page, cursor, sort).
+
+    Returns:
+        (payload, status) with a page of authors and the next cursor.
+    """
+    per_page = parse_per_page(args)
+    cursor = args.get('cursor')
+    keys = parse_sort_args(author_sort_fields, 'article_count', 'desc', args)
+
+    rows = session.execute(
+        authors_page_query(keys, per_page, decode_cursor(keys, cursor) if cursor else None)
+    ).all()
+    next_cursor = encode_cursor(keys, rows[per_page - 1]) if len(rows) > per_page else None
+    return {"data":author_serializer.to_dicts(rows[:per_page]),"next_cursor":next_cursor,
+            "message":"Data retrieved successfully"}, 200
+
+
+def get_author(session, author):
+    """
+    Retrieve the aggregates of one author.
+
+    Parameters:
+        session: Session to query.
+        author: Author name, matched like the author filter of article lists.
+
+    Returns:
+        (payload, status) with the author's aggregates, or 404 if the author has no articles.
+    """
+    row = session.execute(author_query(author)).first()
+    if row is None:
+        return {"message": "No author found with provided name"}, 404
+    return {"data":author_serializer.to_dict(row),"message":"Data retrieved successfully"}, 200
+
+
+def comment_fields_missing(data):
+    """Return True if a submitted comment has no author or no content."""
+    return not all(data.get(key) for key in ['author','content'])
+
+
+def create_comment(session, article_id, data):
+    """
+    Create a new comment for a specific article.
+
+    Parameters:
+        session: Session to write with.
+        article_id: ID of the article to which the comment belongs.
+        data: JSON body with the author and content.
+
+    Returns:
+        (payload, status) with the created comment's data, 400 if a required field is blank or
+        404 if the article does not exist.
+    """
+    # Check if required fields are present
+    if comment_fields_missing(data):
+        return {"message": "Author and content fields are required and cannot be blank"}, 400
+
+    # Check that the article exists without loading it (and its comments collection)
+    if not article_exists(session, article_id):
+        return ARTICLE_NOT_FOUND
+
+    new_comment = Comment(
+        author=data['author'],
+        content=data['content'],
+        article_id=article_id
+    )
+    # Add the new comment to the database and commit changes
+    session.add(new_comment)
+    session.commit()
+    return {"data":comment_schema.dump(new_comment),"message":"Comment added successfully"}, 201
+
+
+def create_comments_bulk(session, article_id, items, args, config):
+    """
+    Create many comments for a specific article.
+
+    Parameters:
+        session: Session to write with.
+        article_id: ID of the article to which the comments belong.
+        items: Iterable of submitted comments (see app.utils.bulk.iter_ndjson and iter_json_array).
+        args: Query arguments (batch_size).
+        config: Application configuration (BULK_BATCH_SIZE).
+
+    Returns:
+        (payload, status) with the number and ids of inserted comments and the per-item errors of
+        rejected ones, or 404 if the article does not exist.
+    """
+    if not article_exists(session, article_id):
+        return ARTICLE_NOT_FOUND
+
+    inserted_ids, errors = bulk_insert(
+        session, Comment, items, comment_input_schema, parse_batch_size(args, config),
+        defaults={"article_id": article_id},
+        on_batch=lambda ids: count_comments(session, article_id, len(ids)),
+    )
+    if inserted_ids:
+        notify(ChangeSet(commented={article_id}))
+    return bulk_response(inserted_ids, errors, "comments")
+
+
+def comments_statement(args, article_id):
+    """
+    Build the statement selecting an article's comments in the requested order.
+
+    Comments are ordered by (created_at, id), ascending unless sort_order is 'desc', and start
+    after the cursor if one is given.
+
+    Returns:
+        Tuple (keys, statement): the sort keys (to encode the next cursor) and the statement.
+    """
+    cursor = args.get('cursor')
+    sort_order = args.get('sort_order', DEFAULT_SORT_ORDER)
+    keys = sort_keys(Comment, [('created_at', sort_order.lower() == 'desc')])
+    statement = (db.select(Comment)
+                 .where(Comment.article_id == article_id)
+                 .order_by(*order_by_clauses(keys)))
+    if cursor:
+        statement = statement.where(keyset_filter(keys, decode_cursor(keys, cursor)))
+    return keys, statement
+
+
+def comment_lines(comments):
+    """Encode comments as NDJSON, one JSON object per line, for comment streams."""
+    return b''.join(dumps(item) + b'\n' for item in comment_schema.dump(comments, many=True))
+
+
+def list_comments(session, args, article_id):
+    """
+    Retrieve one page of the comments of a specific article with keyset pagination.
+
+    Parameters:
+        session: Session to query.
+        args: Query arguments (per_page, cursor, sort_order).
+        article_id: ID of the article whose comments are returned.
+
+    Returns:
+        (payload, status) with a page of comments and the next cursor, or 404 if the article does
+        not exist.
+    """
+    per_page = parse_per_page(args)
+    if not article_exists(session, article_id):
+        return ARTICLE_NOT_FOUND
+    keys, statement = comments_statement(args, article_id)
+
+    comments = session.execute(statement.limit(per_page + 1)).scalars().all()
+    next_cursor = encode_cursor(keys, comments[per_page - 1]) if len(comments) > per_page else None
+    result = comment_schema.dump(comments[:per_page], many=True)
+    return {"data":result,"next_cursor":next_cursor,"message":"Data retrieved successfully"}, 200
+
+
+def update_article(session, args, article_id, data, if_match):
+    """
+    Update a specific article by ID, through the ORM.
+
+    Parameters:
+        session: Session to write with.
+        args: Query arguments of the request, digested into the ETag like for a GET.
+        article_id: ID of the article to update.
+        data: JSON body with the new title, content and/or author.
+        if_match: Parsed If-Match header of the request (see if_match_versions).
+
+    Returns:
+        (payload, status, validators) with the updated article's data and the validators a GET of
+        it returns (see article_validators); or (payload, status) with 400, 404, 409 if a concurrent
+        update committed first, or 412 if the article changed since the client read it.
+    """
+    if not data:
+        return {"message": "No data provided for update"}, 400
+
+    # Retrieve the article from the database
+    article = session.get(Article, article_id)
+    if article is None:
+        return ARTICLE_NOT_FOUND
+    versions = if_match_versions(if_match)
+    if versions is not None and article.version not in versions:
+        return {"message": "Article was modified since it was retrieved"}, 412
+
+    # Update article fields if data is provided
+    article.title = data.get('title', article.title)
+    article.content = data.get('content', article.content)
+    article.author = data.get('author', article.author)
+
+    # Commit changes to the database; the version_id_col check fails if another update
+    # committed since the article was loaded. The validators are read in the same transaction,
+    # so they describe the committed article
+    try:
+        session.flush()
+        validators = article_validators(session, args, article_id)
+        session.commit()
+    except StaleDataError:
+        session.rollback()
+        return {"message": "Article was modified by a concurrent update, retry with the current version"}, 409
+    return {"data":article_schema.dump(article),"message":"Article updated successfully"}, 200, validators
+
+
+def patch_article(session, args, article_id, data, if_match):
+    """
+    Update only the fields given in the request body, with a single UPDATE ... RETURNING.
+
+    Parameters:
+        session: Session to write with.
+        args: Query arguments of the request, digested into the ETag like for a GET.
+        article_id: ID of the article to update.
+        data: JSON body with the fields to change (title, content, author).
+        if_match: Parsed If-Match header of the request (see if_match_versions).
+
+    Returns:
+        (payload, status, validators) with the updated article's data (without comments) and the
+        validators a GET of it returns (see article_validators), read by the same statement; or
+        (payload, status) with 400, 404, or 412 if the article changed since the client read it.
+    """
+    if not data:
+        return {"message": "No data provided for update"}, 400
+    errors = article_input_schema.validate(data, partial=True)
+    if errors:
+        return {"message": "Invalid article data", "errors": errors}, 400
+
+    versions = if_match_versions(if_match)
+    # A new author moves the article between two authors' aggregates; it leaves the previous
+    # one in the same transaction, before the update, which returns no previous value
+    previous_author = None
+    if 'author' in data:
+        previous_author = session.scalar(author_move_update(article_id, normalize_author(data['author'])))
+    returning = article_serializer.select_columns([Article.__table__.c.author_key,
+                                                   *article_validator_columns(article_id)])
+    article = session.execute(article_update_statement(article_id, data, versions, returning=returning)).first()
+    if article is None:
+        session.rollback()
+        if session.get(Article, article_id) is None:
+            return ARTICLE_NOT_FOUND
+        return {"message": "Article was modified since it was retrieved"}, 412
+    if previous_author is not None:
+        move_author_article(session, article, previous_author)
+    session.commit()
+    notify(ChangeSet(updated={article_id}))
+    return ({"data": article_serializer.to_dict(article), "message": "Article updated successfully"}, 200,
+            article_validators_from(args, article_id, article))
+
+
+def articles_deleted(session, rows):
+    """
+    Record articles returned by a DELETE ... RETURNING in the deleting transaction: count the
+    delete for list validators and replica checks, and update the authors' aggregates.
+    """
+    record_deletion(session)
+    refresh_author_stats(session, removed=rows)
+
+
+def delete_article(session, article_id):
+    """
+    Delete a specific article by ID with one statement; the database deletes its comments.
+
+    Parameters:
+        session: Session to write with.
+        article_id: ID of the article to delete.
+
+    Returns:
+        (payload, status) with a success message, or 404 if the article does not exist.
+    """
+    article = Article.__table__
+    deleted = session.execute(
+        db.delete(article).where(article.c.id == article_id).returning(article.c.id, *author_article_columns())
+    ).first()
+    if deleted is not None:
+        articles_deleted(session, [deleted])
+    session.commit()
+
+    if deleted is None:
+        return {"message": "Article not found or already deleted"}, 404
+    notify(ChangeSet(deleted={article_id}))
+    return {"message": "Article and associated comments deleted successfully"}, 200
+
+
+def delete_articles_bulk(session, data, args, config, sleep=time.sleep):
+    """
+    Delete the articles selected by id and/or by filter, in batches, without loading them.
+
+    Parameters:
+        session: Session to write with.
+        data: JSON body with ids, author and/or older_than, documented on
+            app.api.routes.delete_articles_bulk.
+        args: Query arguments (batch_size).
+        config: Application configuration (BULK_BATCH_SIZE, BULK_DELETE_PAUSE).
+        sleep (optional): Function waiting between batches (see app.utils.bulk.bulk_delete).
+
+    Returns:
+        (payload, status) with the number and ids of deleted articles, the number of deleted
+        comments and of batches, or 400 if no valid selection is given.
+    """
+    if not isinstance(data, dict) or not any(data.get(key) for key in ['ids', 'author', 'older_than']):
+        return {"message": "ids, author or older_than is required to select the articles to delete"}, 400
+    ids = data.get('ids') or None
+    if ids is not None and (not isinstance(ids, list) or not all(type(item) is int for item in ids)):
+        return {"message": "ids must be a list of article ids"}, 400
+
+    conditions = []
+    if data.get('author'):
+        conditions.append(Article.author_key == normalize_author(data['author']))
+    if data.get('older_than'):
+        conditions.append(Article.pub_date < parse_older_than(data['older_than']))
+
+    rows, batches = bulk_delete(session, Article, parse_batch_size(args, config), ids=ids,
+                                condition=db.and_(*conditions) if conditions else None,
+                                returning=author_article_columns(),
+                                pause=config['BULK_DELETE_PAUSE'],
+                                on_batch=lambda rows: articles_deleted(session, rows),
+                                sleep=sleep)
+    deleted_ids = [row.id for row in rows]
+    notify(ChangeSet(deleted=set(deleted_ids)))
+
+    # Comments are deleted by the database; their number is the stored comment_count
+    comments = sum(row.comment_count for row in rows)
+    return {
+        "deleted": len(deleted_ids),
+        "ids": deleted_ids,
+        "comments_deleted": comments,
+        "batches": batches,
+        "message": f"{len(deleted_ids)} articles and {comments} comments deleted",
+    }, 200
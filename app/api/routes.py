@@ -1,25 +1,39 @@
-from flask import request, jsonify
-from app import app, db
-from app.models.article import Article
-from app.models.comment import Comment
-from app.schemas.article_schema import ArticleSchema
-from app.schemas.comment_schema import CommentSchema
+import queue
+from flask import Blueprint, current_app, request, jsonify, Response, stream_with_context, url_for
+from app import db
+from app.api import handlers
+from app.api.handlers import response_cache, comment_input_schema
+from app.utils.bulk import iter_request_items
+from app.utils.serializer import json_response
+from app.utils.conditional import conditional, article_validators, list_validators
+from app.utils.replica import read_replica, pin_after_write
+from app.utils.ingest import comment_ingest
 
+# Flask binding of the API: the request handling itself is shared with the async application
+# and lives in app.api.handlers
 
-# Create instances of the data schema classes
-article_schema = ArticleSchema()
-comment_schema = CommentSchema()
+# Blueprint holding the API routes, registered on the application by create_app()
+api = Blueprint('api', __name__)
 
-# Set default values for pagination and sorting
-DEFAULT_PER_PAGE = 10
-DEFAULT_SORT_BY = 'pub_date'
-DEFAULT_SORT_ORDER = 'asc'
+# Pin clients to the primary database for a short window after they write, so they read their own writes
+api.after_request(pin_after_write)
 
 
+def versioned_response(payload, status, validators=None):
+    """
+    JSON response of an article update, with the validators a GET of the updated article returns
+    (see app.utils.conditional.article_validators), so its ETag serves both If-Match and If-None-Match.
+    """
+    response = json_response(payload, status)
+    if validators is not None:
+        etag, weak, last_modified = validators
+        response.set_etag(etag, weak=weak)
+        response.last_modified = last_modified
+    return response
 
 
 # Create a new article
-@app.route('/api/articles', methods=['POST'])
+@api.route('/api/articles', methods=['POST'])
 def create_article():
     """
     Create a new article.
@@ -31,197 +45,369 @@ def create_article():
         JSON response with the created article's data and a success message, or an error message on failure.
     """
     try:
-        data = request.get_json()
+        return json_response(*handlers.create_article(db.session, request.get_json()))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+# Create many articles at once
+@api.route('/api/articles/bulk', methods=['POST'])
+def create_articles_bulk():
+    """
+    Create many articles from a JSON array or an NDJSON stream.
 
-        # Check if required fields are present
-        if not all(data.get(key) for key in ['title','content']):
-            return jsonify({"message": "Title and content fields are required and cannot be blank"}), 400
-        
-        # Create a new Article instance
-        new_article = Article(
-            title=data['title'],
-            content=data['content'],
-            author=data['author']
-        )
-
-        # Add the new article to the database and commit changes
-        db.session.add(new_article)
-        db.session.commit()
-
-        # Serialize the article data and return a success response
-        result=article_schema.dump(new_article)
-        return jsonify({"data":result,"message":"Data inserted successfully"}), 201
+    Parameters:
+        batch_size (optional): Number of articles inserted per statement and transaction.
+
+    Returns:
+        JSON response with the number and ids of inserted articles and the per-item errors of
+        rejected ones (by position in the submitted list), or an error message on failure.
+    """
+    try:
+        return json_response(*handlers.create_articles_bulk(db.session, iter_request_items(), request.args,
+                                                            current_app.config))
     except Exception as e:
         return jsonify({"message": str(e)}), 400
 
 # Retrieve a list of articles
-@app.route('/api/articles', methods=['GET'])
+@api.route('/api/articles', methods=['GET'])
+@read_replica
+@response_cache.cached('list')
+@conditional(list_validators)
 def get_articles():
     """
     Retrieve a list of articles with optional filters, pagination, and sorting.
 
     Parameters:
         page (optional): Page number for pagination.
-        sort_by (optional): Field to sort by.
-        sort_order (optional): Sort order ('asc' or 'desc').
+        per_page (optional): Number of articles per page (capped at MAX_PER_PAGE).
+        cursor (optional): Cursor token for keyset pagination. Pass an empty value to start
+            from the first page; each response then carries the `next_cursor` to follow.
+        sort (optional): Comma-separated sort fields, '-' for descending, e.g. '-pub_date,title'.
+            Only indexed fields are accepted (see article_sort_fields); the id breaks ties.
+        sort_by (optional): Single field to sort by, e.g. 'comment_count' for the most discussed articles.
+        sort_order (optional): Sort order of sort_by ('asc' or 'desc').
         author_filter (optional): Filter articles by author.
         keyword_filter (optional): Filter articles by keyword.
+        include_total (optional): Set to 'false' to skip counting the matching articles.
+        include (optional): Set to 'comments' to embed each article's comments (omitted by default).
+        comments_limit (optional): Embed at most this many of the newest comments per article.
+        fields (optional): Comma-separated article fields to return, e.g. 'id,title,author,pub_date'
+            ('excerpt' gives the start of the content). Only these columns are read.
+        view (optional): 'summary' for id, title, author, pub_date, comment_count and a content excerpt.
 
     Returns:
         JSON response with the list of articles, total count, and a success message, or an error message on failure.
     """
     try:
-        # Parse query parameters
-        page = request.args.get('page', 1, type=int)
-        sort_by = request.args.get('sort_by', DEFAULT_SORT_BY)
-        sort_order = request.args.get('sort_order', DEFAULT_SORT_ORDER)  # Default to ascending order
-        author_filter = request.args.get('author')
-        keyword_filter = request.args.get('keyword')
-
-        # Start building the articles query
-        articles_query = Article.query
-        
-        # Apply author filter if provided
-        if author_filter:
-            articles_query = articles_query.filter(db.func.lower(Article.author) == author_filter.lower())
-
-        # Apply keyword filter if provided
-        if keyword_filter:
-            articles_query = articles_query.filter(
-                db.or_(
-                    Article.title.ilike(f'%{keyword_filter}%'),
-                    Article.content.ilike(f'%{keyword_filter}%')
-                )
-            )
-        
-        # Apply sorting based on parameters
-        if sort_order.lower() == 'desc':
-            articles_query = articles_query.order_by(getattr(Article, sort_by).desc())
-        else:
-            articles_query = articles_query.order_by(getattr(Article, sort_by).asc())
-        
-        # Count total articles before pagination
-        total_article = articles_query.count()
-        total_article = total_article if total_article else 0
-
-        # Paginate the query
-        articles = articles_query.paginate(page=page, per_page=DEFAULT_PER_PAGE, error_out=False)
-
-        
-        # Serialize the articles data and return a success response
-        result = article_schema.dump(articles.items, many=True)
-        if result:
-            return jsonify({"data":result,"total_article":total_article,"message":"Data retrieved successfully"}), 200
-        else:
-            return jsonify({"data":[],"message":"No articles found"}), 200
+        return json_response(*handlers.list_articles(db.session, request.args, current_app.config))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+# Retrieve the newest published articles
+@api.route('/api/articles/latest', methods=['GET'])
+def get_latest_articles():
+    """
+    Retrieve the newest published articles from the in-memory feed (see app.utils.feed).
+
+    Pages are cut from pre-serialized summaries (the 'summary' view), newest first, without
+    querying the database.
+
+    Parameters:
+        per_page (optional): Number of articles per page (capped at MAX_PER_PAGE).
+        cursor (optional): Cursor token returned as `next_cursor` by the previous page.
+
+    Returns:
+        JSON response with a page of article summaries and the next cursor (None at the end of
+        the feed), or an error message on failure.
+    """
+    try:
+        body = handlers.latest_articles_body(db.session, request.args, current_app.config)
+        return Response(body, status=200, mimetype='application/json')
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+# Search articles by relevance
+@api.route('/api/articles/search', methods=['GET'])
+@read_replica
+def search_articles():
+    """
+    Search articles by keyword, best matches first.
+
+    Parameters:
+        q: Search terms; every term must match a word (or word prefix) in the title or content.
+        page (optional): Page number for pagination.
+        per_page (optional): Number of results per page (capped at MAX_PER_PAGE).
+
+    Returns:
+        JSON response with the matching articles, each with its bm25 rank and highlighted
+        title and content snippet, or an error message on failure.
+    """
+    try:
+        return json_response(*handlers.search_articles(db.session, request.args, current_app.config))
     except Exception as e:
         return jsonify({"message": str(e)}), 400
 
 # Retrieve a specific article by ID
-@app.route('/api/article/<int:article_id>', methods=['GET'])
+@api.route('/api/article/<int:article_id>', methods=['GET'])
+@read_replica
+@response_cache.cached('article', ident_arg='article_id')
+@conditional(article_validators)
 def get_article(article_id):
     """
     Retrieve a specific article by ID.
 
     Parameters:
         article_id: ID of the article to retrieve.
+        include (optional): Comments are embedded by default; pass an empty value to omit them.
+        comments_limit (optional): Embed at most this many of the newest comments.
 
     Returns:
         JSON response with the article data and a success message, or an error message on failure.
     """
     try:
-        # Retrieve the article from the database
-        article = db.session.get(Article, article_id)
-        if article is not None:
-            # Serialize the article data and return a success response
-            return jsonify({"data":article_schema.dump(article),"message":"Data retrieved successfully"}), 200
-        else:
-            return jsonify({"data":[],"message":"No articles found with provided id"}), 404
+        return json_response(*handlers.get_article(db.session, request.args, article_id))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+# Report response cache statistics
+@api.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """
+    Report the hit and miss counters of the response cache.
+
+    Returns:
+        JSON response with hits, misses, hit ratio and number of cached entries.
+    """
+    return jsonify({"data":response_cache.stats(),"message":"Data retrieved successfully"}), 200
+
+# Retrieve authors with their article and comment totals
+@api.route('/api/authors', methods=['GET'])
+@read_replica
+def get_authors():
+    """
+    Retrieve authors with their number of articles, last publication date and number of comments.
+
+    The figures are read from maintained aggregates (see app.utils.authors), never computed by
+    grouping the articles.
+
+    Parameters:
+        per_page (optional): Number of authors per page (capped at MAX_PER_PAGE).
+        cursor (optional): Cursor token returned as `next_cursor` by the previous page.
+        sort (optional): Comma-separated sort fields, '-' for descending (default '-article_count'):
+            author_key (name), article_count, last_published_at, comment_count.
+
+    Returns:
+        JSON response with a page of authors and the next cursor, or an error message on failure.
+    """
+    try:
+        return json_response(*handlers.list_authors(db.session, request.args))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+# Retrieve one author's article and comment totals
+@api.route('/api/authors/<author>', methods=['GET'])
+@read_replica
+def get_author(author):
+    """
+    Retrieve the aggregates of one author.
+
+    Parameters:
+        author: Author name; matched like the author filter of article lists (ignoring case and
+            extra whitespace).
+
+    Returns:
+        JSON response with the author's number of articles, last publication date and number of
+        comments, or an error message on failure.
+    """
+    try:
+        return json_response(*handlers.get_author(db.session, author))
     except Exception as e:
         return jsonify({"message": str(e)}), 400
 
 # Create a new comment for a specific article
-@app.route('/api/articles/<int:article_id>/comments', methods=['POST'])
+@api.route('/api/articles/<int:article_id>/comments', methods=['POST'])
 def create_comment(article_id):
     """
     Create a new comment for a specific article.
 
+    When comment ingestion is enabled (COMMENT_INGEST_ENABLED), the comment is only validated and
+    queued: the response is 202 with a tracking id whose status tells when the comment is stored,
+    and 429 when the queue is full.
+
     Parameters:
         article_id: ID of the article to which the comment belongs.
 
     Returns:
         JSON response with the created comment's data and a success message, or an error message on failure.
     """
-
     try:
         data = request.get_json()
+        ingest = comment_ingest()
+        if ingest is not None and not handlers.comment_fields_missing(data):
+            return enqueue_comment(ingest, article_id, data)
+        return json_response(*handlers.create_comment(db.session, article_id, data))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+# Create many comments for a specific article at once
+@api.route('/api/articles/<int:article_id>/comments/bulk', methods=['POST'])
+def create_comments_bulk(article_id):
+    """
+    Create many comments for a specific article from a JSON array or an NDJSON stream.
+
+    Parameters:
+        article_id: ID of the article to which the comments belong.
+        batch_size (optional): Number of comments inserted per statement and transaction.
+
+    Returns:
+        JSON response with the number and ids of inserted comments and the per-item errors of
+        rejected ones (by position in the submitted list), or an error message on failure.
+    """
+    try:
+        return json_response(*handlers.create_comments_bulk(db.session, article_id, iter_request_items(),
+                                                            request.args, current_app.config))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
+
+def enqueue_comment(ingest, article_id, data):
+    """Validate a comment and queue it for the background writer (see create_comment)."""
+    errors = comment_input_schema.validate(data)
+    if errors:
+        return jsonify({"message": "Invalid comment data", "errors": errors}), 400
+    try:
+        tracking_id = ingest.submit(article_id, comment_input_schema.load(data))
+    except queue.Full:
+        response = jsonify({"message": "Too many comments waiting to be stored, retry later"})
+        response.headers['Retry-After'] = '1'
+        return response, 429
+
+    status_url = url_for('api.get_comment_ingest_status', tracking_id=tracking_id)
+    response = jsonify({"data": {"tracking_id": tracking_id, "status": "queued", "status_url": status_url},
+                        "message": "Comment accepted for processing"})
+    response.headers['Location'] = status_url
+    return response, 202
+
+# Report the comment ingestion queue
+@api.route('/api/comments/ingest', methods=['GET'])
+def get_comment_ingest_stats():
+    """
+    Report the depth, capacity and counters of this process's comment ingestion queue.
+
+    Returns:
+        JSON response with the queue statistics, or 404 if comment ingestion is disabled.
+    """
+    ingest = comment_ingest()
+    if ingest is None:
+        return jsonify({"message": "Comment ingestion is not enabled"}), 404
+    return jsonify({"data":ingest.stats(),"message":"Data retrieved successfully"}), 200
+
+# Retrieve the status of a queued comment
+@api.route('/api/comments/ingest/<tracking_id>', methods=['GET'])
+def get_comment_ingest_status(tracking_id):
+    """
+    Retrieve the status of a comment accepted with 202.
+
+    Parameters:
+        tracking_id: Tracking id returned when the comment was submitted.
+
+    Returns:
+        JSON response with the status ('queued', 'stored' with the comment_id, 'rejected' or
+        'failed' with a message), or 404 if the id is unknown or its status expired.
+    """
+    ingest = comment_ingest()
+    status = ingest.status(tracking_id) if ingest is not None else None
+    if status is None:
+        return jsonify({"message": "No queued comment found with provided tracking id"}), 404
+    return jsonify({"data":status,"message":"Data retrieved successfully"}), 200
+
+# Retrieve the comments of a specific article
+@api.route('/api/articles/<int:article_id>/comments', methods=['GET'])
+@read_replica
+def get_comments(article_id):
+    """
+    Retrieve the comments of a specific article with keyset pagination or as an NDJSON stream.
+
+    Parameters:
+        article_id: ID of the article whose comments are returned.
+        per_page (optional): Number of comments per page (capped at MAX_PER_PAGE).
+        cursor (optional): Cursor token returned as `next_cursor` by the previous page.
+        sort_order (optional): 'asc' (oldest first, default) or 'desc' (newest first).
+        format (optional): 'ndjson' to stream every comment after the cursor, one JSON object
+            per line, instead of returning a single page. Also selected by an
+            'Accept: application/x-ndjson' header.
 
-        # Check if required fields are present
-        if not all(data.get(key) for key in ['author','content']):
-            return jsonify({"message": "Author and content fields are required and cannot be blank"}), 400
-       
-        # Retrieve the article from the database
-        article = Article.query.filter_by(id=article_id).first()
-
-        # Create a new Comment instance associated with the article
-        if article is not None:
-            new_comment = Comment(
-                author=data['author'],
-                content=data['content'],
-                article=article
-            )
-            # Add the new comment to the database and commit changes
-            db.session.add(new_comment)
-            db.session.commit()
-
-            # Serialize the comment data and return a success response
-            return jsonify({"data":comment_schema.dump(new_comment),"message":"Comment added successfully"}), 201
-        else:
-            return jsonify({"message": "No articles found with provided id"}), 404
+    Returns:
+        JSON response with a page of comments and the next cursor, an NDJSON stream of comments,
+        or an error message on failure.
+    """
+    try:
+        stream = (request.args.get('format') == 'ndjson'
+                  or request.accept_mimetypes.best == 'application/x-ndjson')
+        if not stream:
+            return json_response(*handlers.list_comments(db.session, request.args, article_id))
+
+        if not handlers.article_exists(db.session, article_id):
+            return json_response(*handlers.ARTICLE_NOT_FOUND)
+        _, statement = handlers.comments_statement(request.args, article_id)
+
+        def generate():
+            # Fetch rows in chunks from a server-side cursor so memory use stays bounded
+            result = db.session.execute(statement.execution_options(yield_per=handlers.STREAM_CHUNK_SIZE))
+            for chunk in result.scalars().partitions():
+                yield handlers.comment_lines(chunk)
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
     except Exception as e:
         return jsonify({"message": str(e)}), 400
 
 # Update a specific article by ID
-@app.route('/api/articles/<int:article_id>', methods=['PUT'])
+@api.route('/api/articles/<int:article_id>', methods=['PUT'])
 def update_article(article_id):
     """
     Update a specific article by ID.
 
     Parameters:
         article_id: ID of the article to update.
+        If-Match (header, optional): ETag of the version the client edited; the update fails with
+            412 if the article has changed since.
 
     Returns:
         JSON response with the updated article's data and a success message, or an error message on failure.
+        409 if a concurrent update committed first.
     """
-
     try:
-        data = request.get_json()
-        if data:
-            # Retrieve the article from the database
-            article = db.session.get(Article, article_id)
-            if article is not None:
-                # Update article fields if data is provided
-                article.title = data.get('title', article.title)
-                article.content = data.get('content', article.content)
-                article.author = data.get('author', article.author)
-
-                # Commit changes to the database
-                db.session.commit()
-                
-                # Serialize the updated article data and return a success response
-                return jsonify({"data":article_schema.dump(article),"message":"Article updated successfully"}), 200
-            else:
-                return jsonify({"message": "No articles found with provided id"}), 404
-        else:
-            return jsonify({"message": "No data provided for update"}), 400
+        return versioned_response(*handlers.update_article(db.session, request.args, article_id,
+                                                           request.get_json(), request.if_match))
     except Exception as e:
-        print("e---",e)
         return jsonify({"message": str(e)}), 400
 
+# Partially update a specific article by ID
+@api.route('/api/articles/<int:article_id>', methods=['PATCH'])
+def patch_article(article_id):
+    """
+    Update only the fields given in the request body, with a single UPDATE ... RETURNING.
+
+    The article is neither loaded before nor re-read after the update, and its comments are not
+    returned.
+
+    Parameters:
+        article_id: ID of the article to update.
+        title, content, author (JSON body, optional): New field values; at least one is required.
+        If-Match (header, optional): ETag of the version the client edited; the update fails with
+            412 if the article has changed since.
 
+    Returns:
+        JSON response with the updated article's data and a success message, with the ETag and
+        Last-Modified of the updated article, or an error message on failure.
+    """
+    try:
+        return versioned_response(*handlers.patch_article(db.session, request.args, article_id,
+                                                          request.get_json(), request.if_match))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
 
-# Delete a specific article by ID 
-@app.route('/api/articles/<int:article_id>', methods=['DELETE'])
+# Delete a specific article by ID
+@api.route('/api/articles/<int:article_id>', methods=['DELETE'])
 def delete_article(article_id):
     """
     Delete a specific article by ID.
@@ -232,23 +418,30 @@ def delete_article(article_id):
     Returns:
         JSON response with a success message, or an error message on failure.
     """
-
     try:
-        # Retrieve the article from the database
-        article = db.session.get(Article, article_id)
+        return json_response(*handlers.delete_article(db.session, article_id))
+    except Exception as e:
+        return jsonify({"message": str(e)}), 400
 
-        if article is not None:
-            # Delete associated comments first
-            Comment.query.filter_by(article_id=article.id).delete()
+# Delete many articles at once
+@api.route('/api/articles/bulk', methods=['DELETE'])
+def delete_articles_bulk():
+    """
+    Delete the articles selected by id and/or by filter, in batches, without loading them.
 
-            # Then delete the article
-            db.session.delete(article)
-            db.session.commit()
+    Parameters:
+        batch_size (optional): Number of articles deleted per statement and transaction.
+        ids (JSON body, optional): List of article ids; unknown ids are ignored.
+        author (JSON body, optional): Only delete articles by this author (case-insensitive).
+        older_than (JSON body, optional): ISO 8601 timestamp; only delete articles published before it.
+        At least one of ids, author and older_than is required.
 
-            return jsonify({"message": "Article and associated comments deleted successfully"}), 200
-        else:
-            return jsonify({"message": "Article not found or already deleted"}), 404
+    Returns:
+        JSON response with the number and ids of deleted articles, the number of deleted comments
+        and of batches, or an error message on failure.
+    """
+    try:
+        return json_response(*handlers.delete_articles_bulk(db.session, request.get_json(), request.args,
+                                                            current_app.config))
     except Exception as e:
         return jsonify({"message": str(e)}), 400
-    
-
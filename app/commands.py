@@ -0,0 +1,22 @@
+import click
+from flask.cli import with_appcontext
+from app import db
+from app.utils.changes import ChangeSet, notify
+from app.utils.comments import reconcile_comment_counts
+from app.utils.authors import rebuild_author_stats
+
+
+@click.command('reconcile-comment-counts')
+@with_appcontext
+def reconcile_comment_counts_command():
+    """Recompute article comment counts that differ from the stored comments, then the author aggregates."""
+    article_ids = reconcile_comment_counts(db.session)
+    authors = rebuild_author_stats(db.session)
+    db.session.commit()
+    notify(ChangeSet(commented=set(article_ids)))
+    click.echo(f"{len(article_ids)} article comment counts corrected, {authors} author aggregates rebuilt")
+
+
+def register_commands(app):
+    """Add the maintenance commands to the application's `flask` command line."""
+    app.cli.add_command(reconcile_comment_counts_command)
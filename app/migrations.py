@@ -0,0 +1,184 @@
+from datetime import datetime
+from sqlalchemy.schema import CreateIndex
+from app import db
+from app.models.article import Article, normalize_author
+from app.models.author import AuthorStats
+from app.models.comment import Comment
+from app.models.deletions import ArticleDeletions
+from app.utils.search import ensure_search_index
+from app.utils.comments import reconcile_comment_counts
+from app.utils.authors import rebuild_author_stats
+
+# Applied schema versions; db.create_all() creates it but never alters existing tables
+schema_version = db.Table(
+    'schema_version',
+    db.Column('version', db.Integer, primary_key=True),
+    db.Column('description', db.String(250), nullable=False),
+    db.Column('applied_at', db.DateTime, nullable=False),
+)
+
+# Ordered list of (version, description, upgrade function) registered with @migration
+MIGRATIONS = []
+
+
+def migration(version, description):
+    """
+    Register a schema migration.
+
+    The decorated function receives a connection inside a transaction. Migrations must be
+    idempotent, because a database created by db.create_all() already has the latest schema
+    and only needs its version recorded.
+    """
+    def register(func):
+        MIGRATIONS.append((version, description, func))
+        MIGRATIONS.sort(key=lambda item: item[0])
+        return func
+    return register
+
+
+def _create_indexes(connection, table, names):
+    """Create the named indexes declared on a model table if they do not exist yet."""
+    indexes = {index.name: index for index in table.indexes}
+    for name in names:
+        connection.execute(CreateIndex(indexes[name], if_not_exists=True))
+
+
+@migration(1, 'Full-text search index on article title and content')
+def add_search_index(connection):
+    ensure_search_index(connection)
+
+
+@migration(2, 'Indexes for comment lookups, author filter and cursor pagination')
+def add_hot_column_indexes(connection):
+    _create_indexes(connection, Article.__table__, [
+        'ix_article_pub_date_id',
+        'ix_article_created_at_id',
+        'ix_article_updated_at_id',
+        'ix_article_title_id',
+        'ix_article_author_id',
+    ])
+    _create_indexes(connection, Comment.__table__, ['ix_comment_article_id_created_at_id'])
+
+
+@migration(3, 'Backfill article.updated_at for rows created without it')
+def backfill_updated_at(connection):
+    connection.execute(
+        db.update(Article.__table__)
+        .where(Article.__table__.c.updated_at.is_(None))
+        .values(updated_at=db.func.coalesce(Article.__table__.c.created_at, Article.__table__.c.pub_date))
+    )
+
+
+@migration(4, 'Denormalized article.comment_count with its sort index')
+def add_comment_count(connection):
+    columns = {column['name'] for column in db.inspect(connection).get_columns('article')}
+    if 'comment_count' not in columns:
+        connection.execute(db.text('ALTER TABLE article ADD COLUMN comment_count INTEGER NOT NULL DEFAULT 0'))
+    _create_indexes(connection, Article.__table__, ['ix_article_comment_count_id'])
+    reconcile_comment_counts(connection)
+
+
+def _has_cascade(connection):
+    """Return True if comment.article_id already deletes comments with their article."""
+    foreign_keys = db.inspect(connection).get_foreign_keys('comment')
+    return any(key['referred_table'] == 'article' and (key.get('options') or {}).get('ondelete', '').upper() == 'CASCADE'
+               for key in foreign_keys)
+
+
+@migration(5, 'ON DELETE CASCADE on comment.article_id')
+def add_comment_cascade(connection):
+    if _has_cascade(connection):
+        return
+    comment = Comment.__table__
+
+    # Comments of articles deleted without them can never be read; they would violate the constraint
+    connection.execute(db.delete(comment).where(
+        comment.c.article_id.not_in(db.select(Article.__table__.c.id))))
+
+    if connection.dialect.name != 'sqlite':
+        for key in db.inspect(connection).get_foreign_keys('comment'):
+            if key['referred_table'] == 'article':
+                connection.execute(db.text(f'ALTER TABLE comment DROP CONSTRAINT {key["name"]}'))
+        connection.execute(db.text('ALTER TABLE comment ADD CONSTRAINT comment_article_id_fkey FOREIGN KEY (article_id) '
+                                   'REFERENCES article (id) ON DELETE CASCADE'))
+        return
+
+    # SQLite cannot alter a constraint: rebuild the table with the model's definition and copy the rows
+    for index in comment.indexes:
+        connection.execute(db.text(f'DROP INDEX IF EXISTS {index.name}'))
+    connection.execute(db.text('ALTER TABLE comment RENAME TO comment_old'))
+    comment.create(connection)
+    columns = ', '.join(column.name for column in comment.columns)
+    connection.execute(db.text(f'INSERT INTO comment ({columns}) SELECT {columns} FROM comment_old'))
+    connection.execute(db.text('DROP TABLE comment_old'))
+
+
+@migration(6, 'Article version column for optimistic concurrency')
+def add_article_version(connection):
+    columns = {column['name'] for column in db.inspect(connection).get_columns('article')}
+    if 'version' not in columns:
+        connection.execute(db.text('ALTER TABLE article ADD COLUMN version INTEGER NOT NULL DEFAULT 1'))
+
+
+@migration(7, 'Normalized article.author_key and maintained per-author aggregates')
+def add_author_stats(connection):
+    article = Article.__table__
+    columns = {column['name'] for column in db.inspect(connection).get_columns('article')}
+    if 'author_key' not in columns:
+        connection.execute(db.text("ALTER TABLE article ADD COLUMN author_key VARCHAR(100) NOT NULL DEFAULT ''"))
+        # Normalized in Python, since SQL lower() only folds ASCII letters in SQLite
+        authors = connection.execute(db.select(article.c.author).distinct()).scalars().all()
+        if authors:
+            connection.execute(
+                db.update(article)
+                .where(article.c.author == db.bindparam('b_author'))
+                .values(author_key=db.bindparam('b_author_key'), updated_at=article.c.updated_at),
+                [{'b_author': author, 'b_author_key': normalize_author(author)} for author in authors],
+            )
+    _create_indexes(connection, article, ['ix_article_author_key_pub_date_id'])
+    AuthorStats.__table__.create(connection, checkfirst=True)
+    rebuild_author_stats(connection)
+
+
+@migration(8, 'Article deletion counter used by list validators and replica lag checks')
+def add_article_deletions(connection):
+    # The counter row is inserted together with the table (see app.models.deletions)
+    ArticleDeletions.__table__.create(connection, checkfirst=True)
+
+
+@migration(9, 'Drop the lower(author) index superseded by article.author_key')
+def drop_author_lower_index(connection):
+    # The author filter reads ix_article_author_key_pub_date_id; the old index only slowed writes
+    connection.execute(db.text('DROP INDEX IF EXISTS ix_article_author_lower'))
+
+
+def current_version(engine):
+    """Return the highest applied schema version, or 0 for an unversioned database."""
+    with engine.begin() as connection:
+        schema_version.create(connection, checkfirst=True)
+        return connection.execute(db.select(db.func.max(schema_version.c.version))).scalar() or 0
+
+
+def upgrade(engine):
+    """
+    Apply every pending migration, each in its own transaction.
+
+    Parameters:
+        engine: SQLAlchemy engine of the database to upgrade.
+
+    Returns:
+        List of the versions that were applied.
+    """
+    current = current_version(engine)
+    applied = []
+    for version, description, func in MIGRATIONS:
+        if version <= current:
+            continue
+        with engine.begin() as connection:
+            func(connection)
+            connection.execute(schema_version.insert().values(
+                version=version, description=description, applied_at=datetime.now()
+            ))
+        applied.append(version)
+    return applied
+
@@ -1,10 +1,23 @@
 
 from datetime import datetime
+from sqlalchemy.orm import validates
 from app import db
 import pytz 
 indian_timezone = pytz.timezone('Asia/Kolkata')  # 'Asia/Kolkata' for Indian Standard Time
 
 
+def normalize_author(name):
+    """Return the key identifying an author name: lower case, with runs of whitespace collapsed."""
+    if name is None:
+        return None
+    return ' '.join(name.split()).lower()
+
+
+def _default_author_key(context):
+    # Rows inserted with Core statements (e.g. bulk imports) only carry the author
+    return normalize_author(context.get_current_parameters()['author'])
+
+
 class Article(db.Model):
     """
     Model class for Article, representing articles in the application.
@@ -13,9 +26,12 @@ class Article(db.Model):
         title (str): Title of the article.
         content (str): Content of the article.
         author (str): Author of the article.
+        author_key (str): Normalized author name (see normalize_author), set whenever the author is.
         is_published (bool): Flag indicating if the article is published (default is True).
         pub_date (datetime): Published date of the article (default is the current date in Indian Standard Time).
         comments (relationship): Relationship with Comment model, establishing a backref for easy access to comments.
+        comment_count (int): Number of comments, maintained on write (see app.utils.comments).
+        version (int): Incremented by every update; ORM updates of a stale version fail (optimistic concurrency).
         created_at (datetime): Timestamp for the creation date of the article.
         updated_at (datetime): Timestamp for the last update of the article.
     """
@@ -24,12 +40,36 @@ class Article(db.Model):
     title = db.Column(db.String(250), nullable=False)
     content = db.Column(db.Text, nullable=False)
     author = db.Column(db.String(100), nullable=False)
+    author_key = db.Column(db.String(100), nullable=False, default=_default_author_key)
     is_published = db.Column(db.Boolean, default=True) # I'm using by default published
     pub_date = db.Column(db.DateTime, default=lambda: datetime.now(indian_timezone)) # I'm using by default published date
-    comments = db.relationship('Comment', backref='article', lazy=True)
+    # The database deletes the comments of a deleted article, so they are never loaded for it
+    comments = db.relationship('Comment', backref='article', lazy=True,
+                               cascade='all, delete-orphan', passive_deletes=True)
+    comment_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(indian_timezone))
-    updated_at = db.Column(db.DateTime,onupdate=lambda: datetime.now(indian_timezone))
+    updated_at = db.Column(db.DateTime,default=lambda: datetime.now(indian_timezone),onupdate=lambda: datetime.now(indian_timezone))
+
+    # Indexes for (sort column, id) ordering used by cursor pagination and for the author filter
+    # (author_key)
+    __table_args__ = (
+        db.Index('ix_article_pub_date_id', pub_date, id),
+        db.Index('ix_article_created_at_id', created_at, id),
+        db.Index('ix_article_updated_at_id', updated_at, id),
+        db.Index('ix_article_title_id', title, id),
+        db.Index('ix_article_author_id', author, id),
+        db.Index('ix_article_comment_count_id', comment_count, id),
+        db.Index('ix_article_author_key_pub_date_id', author_key, pub_date, id),
+    )
+
+    # ORM updates and deletes check and increment the version (UPDATE ... WHERE version = ?)
+    __mapper_args__ = {'version_id_col': version}
 
+    @validates('author')
+    def _set_author_key(self, key, author):
+        self.author_key = normalize_author(author)
+        return author
 
     def __repr__(self):
         """
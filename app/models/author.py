@@ -0,0 +1,40 @@
+from app import db
+
+
+class AuthorStats(db.Model):
+    """
+    Model class for AuthorStats, the per-author aggregates of the article table.
+
+    Rows are maintained on write (see app.utils.authors), so author listings never group the
+    article table.
+
+    Attributes:
+        id (int): Primary key, the tiebreak of sorted author lists.
+        author_key (str): Normalized author name (see normalize_author), unique.
+        author (str): Author name as written on one of the author's articles.
+        article_count (int): Number of articles by the author.
+        last_published_at (datetime): Latest publication date of the author's published articles.
+        comment_count (int): Total number of comments on the author's articles.
+    """
+
+    __tablename__ = 'author_stats'
+
+    id = db.Column(db.Integer, primary_key=True)
+    author_key = db.Column(db.String(100), nullable=False, unique=True, index=True)
+    author = db.Column(db.String(100), nullable=False)
+    article_count = db.Column(db.Integer, nullable=False, default=0)
+    last_published_at = db.Column(db.DateTime)
+    comment_count = db.Column(db.Integer, nullable=False, default=0)
+
+    # Indexes for (sort column, id) ordering of author lists
+    __table_args__ = (
+        db.Index('ix_author_stats_article_count_id', article_count, id),
+        db.Index('ix_author_stats_last_published_at_id', last_published_at, id),
+        db.Index('ix_author_stats_comment_count_id', comment_count, id),
+    )
+
+    def __repr__(self):
+        """
+        Return a string representation of the AuthorStats object.
+        """
+        return f"<AuthorStats {self.author_key}>"
@@ -11,16 +11,22 @@ class Comment(db.Model):
         id (int): Primary key for the comment.
         author (str): Author of the comment.
         content (str): Content of the comment.
-        article_id (int): Foreign key referencing the associated article's id.
+        article_id (int): Foreign key referencing the associated article's id; comments are deleted
+            by the database together with their article (ON DELETE CASCADE).
         created_at (datetime): Timestamp for the creation date of the comment.
     """
     
     id = db.Column(db.Integer, primary_key=True)
     author = db.Column(db.String(100), nullable=False)
     content = db.Column(db.Text, nullable=False)
-    article_id = db.Column(db.Integer, db.ForeignKey('article.id'), nullable=False)
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id', ondelete='CASCADE'), nullable=False)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(indian_timezone))
 
+    # Index for looking up an article's comments in (created_at, id) order and for deleting them
+    __table_args__ = (
+        db.Index('ix_comment_article_id_created_at_id', article_id, created_at, id),
+    )
+
     def __repr__(self):
         """
         Return a string representation of the Comment object.
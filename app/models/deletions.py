@@ -0,0 +1,35 @@
+from sqlalchemy import event
+from app import db
+
+
+class ArticleDeletions(db.Model):
+    """
+    Model class for ArticleDeletions, a single row counting the transactions that deleted articles.
+
+    Deleting an article moves no highest id or latest timestamp, so list validators and replica
+    lag checks read this row to notice deletes (see app.utils.deletions). The row is inserted
+    when the table is created.
+
+    Attributes:
+        id (int): Primary key, always 1.
+        generation (int): Incremented by every transaction that deletes articles.
+        deleted_at (datetime): Time of the latest of these transactions.
+    """
+
+    __tablename__ = 'article_deletions'
+
+    id = db.Column(db.Integer, primary_key=True)
+    generation = db.Column(db.Integer, nullable=False, default=0)
+    deleted_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        """
+        Return a string representation of the ArticleDeletions object.
+        """
+        return f"<ArticleDeletions {self.generation}>"
+
+
+@event.listens_for(ArticleDeletions.__table__, 'after_create')
+def create_deletions_row(target, connection, **kw):
+    """Insert the single counter row together with its table."""
+    connection.execute(db.insert(target).values(id=1, generation=0))
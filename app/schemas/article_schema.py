@@ -1,9 +1,11 @@
 
+from marshmallow import fields, validate
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
 from app import ma
+from app.utils.instrumentation import TimedDumpMixin
 from app.models.article import Article
 
-class ArticleSchema(SQLAlchemyAutoSchema):
+class ArticleSchema(TimedDumpMixin, SQLAlchemyAutoSchema):
     """
     Schema for serializing and deserializing Article model data.
 
@@ -12,6 +14,7 @@ class ArticleSchema(SQLAlchemyAutoSchema):
 
     Meta:
         model (Article): Specifies the model to be serialized/deserialized.
+        exclude (tuple): Internal columns left out of the output (the normalized author key).
     """
     # Define a nested field for serializing comments associated with an article
     comments = ma.Nested("CommentSchema", many=True)
@@ -19,11 +22,18 @@ class ArticleSchema(SQLAlchemyAutoSchema):
     class Meta:
         # Specifies the model to use for the schema
         model = Article
+        exclude = ('author_key',)
 
 
+class ArticleInputSchema(ma.Schema):
+    """
+    Schema for validating article data submitted by clients.
 
-
-
-
-
-
+    Attributes:
+        title (String): Required, non-blank title of at most 250 characters.
+        content (String): Required, non-blank content.
+        author (String): Required, non-blank author name of at most 100 characters.
+    """
+    title = fields.String(required=True, validate=validate.Length(min=1, max=250))
+    content = fields.String(required=True, validate=validate.Length(min=1))
+    author = fields.String(required=True, validate=validate.Length(min=1, max=100))
@@ -1,8 +1,10 @@
+from marshmallow import fields, validate
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
 from app import ma
+from app.utils.instrumentation import TimedDumpMixin
 from app.models.comment import Comment
 
-class CommentSchema(SQLAlchemyAutoSchema):
+class CommentSchema(TimedDumpMixin, SQLAlchemyAutoSchema):
     """
     Schema for serializing and deserializing Comment model data.
 
@@ -11,4 +13,16 @@ class CommentSchema(SQLAlchemyAutoSchema):
     """
     
     class Meta:
-        model = Comment
\ No newline at end of file
+        model = Comment
+
+
+class CommentInputSchema(ma.Schema):
+    """
+    Schema for validating comment data submitted by clients.
+
+    Attributes:
+        author (String): Required, non-blank author name of at most 100 characters.
+        content (String): Required, non-blank content.
+    """
+    author = fields.String(required=True, validate=validate.Length(min=1, max=100))
+    content = fields.String(required=True, validate=validate.Length(min=1))
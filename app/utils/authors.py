@@ -0,0 +1,258 @@
+from types import SimpleNamespace
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, scoped_session
+from app import db
+from app.models.article import Article, normalize_author
+from app.models.author import AuthorStats
+from app.utils.pagination import order_by_clauses, keyset_filter
+from app.utils.serializer import author_serializer
+
+# Article attributes the author aggregates are computed from; comment totals are kept by deltas
+# (see author_comment_count_update)
+_AGGREGATED_ATTRIBUTES = ('author_key', 'is_published', 'pub_date')
+
+_AGGREGATE_COLUMNS = ['author_key', 'author', 'article_count', 'last_published_at', 'comment_count']
+
+# Dialects whose INSERT supports ON CONFLICT ... DO UPDATE
+_UPSERT_INSERTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+
+def author_aggregates_query():
+    """
+    Statement computing the aggregates of every author from the article table.
+
+    Returns:
+        SELECT of (author_key, author, article_count, last_published_at, comment_count) rows.
+    """
+    article = Article.__table__
+    return (db.select(
+        article.c.author_key,
+        db.func.max(article.c.author),
+        db.func.count(),
+        db.func.max(db.case((article.c.is_published.is_(True), article.c.pub_date))),
+        db.func.coalesce(db.func.sum(article.c.comment_count), 0),
+    ).group_by(article.c.author_key))
+
+
+def _group_articles(rows):
+    """Sum article rows per author into {author_key: [author, articles, comments, latest publication]}."""
+    deltas = {}
+    for row in rows:
+        delta = deltas.setdefault(row.author_key, [row.author, 0, 0, None])
+        delta[1] += 1
+        delta[2] += row.comment_count or 0
+        if row.is_published and row.pub_date is not None and (delta[3] is None or row.pub_date > delta[3]):
+            delta[3] = row.pub_date
+    return deltas
+
+
+def _latest_of(current, new):
+    """SQL expression of the later of two nullable timestamps."""
+    return db.case((new.is_(None), current), (current.is_(None), new), (new > current, new), else_=current)
+
+
+def refresh_author_stats(connection, removed=(), added=()):
+    """
+    Apply the articles removed from and added to authors to their aggregates, in the caller's
+    transaction, without reading the authors' other articles.
+
+    Counts and comment totals move by deltas, and added articles are upserted with INSERT ...
+    ON CONFLICT (author_key) DO UPDATE, so concurrent writers neither lose an update nor race to
+    create an author. Only when a removed article was the author's latest publication is
+    last_published_at looked up again, through the (author_key, pub_date, id) index. Authors left
+    without articles are removed.
+
+    Called after the articles are written (an article moved to another author is removed with
+    its previous values and added with its new ones).
+
+    Parameters:
+        connection: Connection (or session) inside the transaction that changed the articles.
+        removed (optional): Rows of the deleted articles, or previous values of the changed
+            ones, with author_key, author, is_published, pub_date and comment_count attributes.
+        added (optional): Rows of the inserted articles, or new values of the changed ones.
+    """
+    removed, added = _group_articles(removed), _group_articles(added)
+    stats = AuthorStats.__table__
+    article = Article.__table__
+
+    if removed:
+        latest = (db.select(db.func.max(article.c.pub_date))
+                  .where(article.c.author_key == stats.c.author_key, article.c.is_published.is_(True))
+                  .scalar_subquery())
+        connection.execute(
+            db.update(stats)
+            .where(stats.c.author_key == db.bindparam('b_author_key'))
+            .values(article_count=stats.c.article_count - db.bindparam('b_articles'),
+                    comment_count=stats.c.comment_count - db.bindparam('b_comments'),
+                    last_published_at=db.case(
+                        (stats.c.last_published_at <= db.bindparam('b_published', type_=db.DateTime), latest),
+                        else_=stats.c.last_published_at)),
+            [{'b_author_key': key, 'b_articles': articles, 'b_comments': comments, 'b_published': published}
+             for key, (_, articles, comments, published) in removed.items()],
+        )
+
+    if added:
+        bind = connection.get_bind() if isinstance(connection, (Session, scoped_session)) else connection
+        insert = _UPSERT_INSERTS[bind.dialect.name](stats).values([
+            {'author_key': key, 'author': author, 'article_count': articles,
+             'last_published_at': published, 'comment_count': comments}
+            for key, (author, articles, comments, published) in added.items()
+        ])
+        connection.execute(insert.on_conflict_do_update(index_elements=[stats.c.author_key], set_={
+            'article_count': stats.c.article_count + insert.excluded.article_count,
+            'comment_count': stats.c.comment_count + insert.excluded.comment_count,
+            'last_published_at': _latest_of(stats.c.last_published_at, insert.excluded.last_published_at),
+        }))
+
+    if removed:
+        connection.execute(db.delete(stats).where(stats.c.author_key.in_(list(removed)),
+                                                  stats.c.article_count <= 0))
+
+
+def author_article_columns():
+    """Article columns the author aggregates are computed from, e.g. for RETURNING."""
+    article = Article.__table__
+    return [article.c.author_key, article.c.author, article.c.is_published, article.c.pub_date,
+            article.c.comment_count]
+
+
+def author_move_update(article_id, author_key):
+    """
+    Statement subtracting an article from its current author's aggregates before it is updated to
+    `author_key`.
+
+    The author, comment count and remaining latest publication are read from the article row by
+    subqueries, so the caller does not read the previous values first. It matches no row if the
+    author does not change.
+
+    Returns:
+        The UPDATE ... RETURNING statement; it returns the previous author_key of the article.
+    """
+    stats = AuthorStats.__table__
+    article = Article.__table__
+    current = lambda column: db.select(column).where(article.c.id == article_id).scalar_subquery()
+    latest = (db.select(db.func.max(article.c.pub_date))
+              .where(article.c.author_key == stats.c.author_key, article.c.is_published.is_(True),
+                     article.c.id != article_id)
+              .scalar_subquery())
+    return (db.update(stats)
+            .where(stats.c.author_key == current(article.c.author_key), stats.c.author_key != author_key)
+            .values(article_count=stats.c.article_count - 1,
+                    comment_count=stats.c.comment_count - current(article.c.comment_count),
+                    last_published_at=latest)
+            .returning(stats.c.author_key))
+
+
+def move_author_article(connection, row, previous_author_key):
+    """
+    Add an article moved by author_move_update() to its new author's aggregates, and remove the
+    previous author if it has no articles left.
+
+    Parameters:
+        connection: Connection (or session) inside the transaction that updated the article.
+        row: Updated article row with the author_article_columns().
+        previous_author_key: author_key returned by author_move_update().
+    """
+    stats = AuthorStats.__table__
+    refresh_author_stats(connection, added=[row])
+    connection.execute(db.delete(stats).where(stats.c.author_key == previous_author_key, stats.c.article_count <= 0))
+
+
+def add_article_authors(connection, article_ids):
+    """Add the given (just inserted) articles to their authors' aggregates."""
+    article = Article.__table__
+    rows = connection.execute(db.select(*author_article_columns()).where(article.c.id.in_(article_ids)))
+    refresh_author_stats(connection, added=rows.all())
+
+
+def rebuild_author_stats(connection):
+    """
+    Recompute the aggregates of every author from the article table.
+
+    Used to backfill the table and to repair it after articles were written by hand.
+
+    Returns:
+        Number of authors.
+    """
+    stats = AuthorStats.__table__
+    connection.execute(db.delete(stats))
+    return connection.execute(db.insert(stats).from_select(_AGGREGATE_COLUMNS, author_aggregates_query())).rowcount
+
+
+def author_comment_count_update(article_id, delta):
+    """Statement adding `delta` to the comment total of an article's author."""
+    stats = AuthorStats.__table__
+    article = Article.__table__
+    author_key = db.select(article.c.author_key).where(article.c.id == article_id).scalar_subquery()
+    return (db.update(stats)
+            .where(stats.c.author_key == author_key)
+            .values(comment_count=stats.c.comment_count + delta))
+
+
+def _previous_values(state, comment_count):
+    """Values of the aggregated attributes of a flushed article before the flush, with its stored comment count."""
+    values = {'author': state.obj().author, 'comment_count': comment_count}
+    for name in _AGGREGATED_ATTRIBUTES:
+        history = state.attrs[name].history
+        values[name] = history.deleted[0] if history.deleted else state.attrs[name].value
+    return SimpleNamespace(**values)
+
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    pass
+
+
+# Setting an expired attribute loads the value it replaces, so the flush knows which values to
+# remove from the aggregates
+for _name in _AGGREGATED_ATTRIBUTES:
+    event.listen(getattr(Article, _name), 'set', _load_previous_value, active_history=True)
+
+
+@event.listens_for(Session, 'after_flush')
+def _refresh_flushed_authors(session, flush_context):
+    # Articles written through the ORM (sync and async sessions); Core statements call
+    # refresh_author_stats() themselves
+    removed = [instance for instance in session.deleted if isinstance(instance, Article)]
+    added = [instance for instance in session.new if isinstance(instance, Article)]
+    changed = {}
+    for instance in session.dirty:
+        if not isinstance(instance, Article):
+            continue
+        state = db.inspect(instance)
+        if any(state.attrs[name].history.has_changes() for name in _AGGREGATED_ATTRIBUTES):
+            changed[state.identity[0]] = state
+    if changed:
+        # The comment counts moved between authors are read from the rows just updated, which
+        # this transaction holds, not from the loaded instances: a comment committed since an
+        # article was loaded is counted by the article row only
+        article = Article.__table__
+        rows = session.connection().execute(
+            db.select(article.c.id, *author_article_columns()).where(article.c.id.in_(list(changed)))
+        ).all()
+        for row in rows:
+            removed.append(_previous_values(changed[row.id], row.comment_count))
+            added.append(row)
+    if removed or added:
+        refresh_author_stats(session.connection(), removed, added)
+
+
+def authors_page_query(keys, per_page, cursor_values=None):
+    """
+    Statement selecting one page of author aggregates (plus one row to detect the next page).
+
+    Parameters:
+        keys: Sort keys as returned by author_sort_fields.keys().
+        per_page (int): Number of authors on the page.
+        cursor_values (optional): Decoded cursor of the previous page.
+    """
+    query = (db.select(*author_serializer.select_columns(column for column, _ in keys))
+             .order_by(*order_by_clauses(keys)))
+    if cursor_values is not None:
+        query = query.where(keyset_filter(keys, cursor_values))
+    return query.limit(per_page + 1)
+
+
+def author_query(name):
+    """Statement selecting the aggregates of the author with the given name (any case or spacing)."""
+    return db.select(*author_serializer.columns).where(AuthorStats.author_key == normalize_author(name))
@@ -0,0 +1,170 @@
+import time
+from itertools import repeat
+import json
+from flask import request
+from marshmallow import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from app import db
+
+
+def iter_request_items():
+    """
+    Yield the items of a bulk request body.
+
+    Accepts a JSON array, or an NDJSON stream (one JSON object per line) when the request
+    Content-Type is application/x-ndjson. NDJSON bodies are read line by line, so large
+    imports are never loaded into memory at once. Lines that are not valid JSON are yielded
+    as ValueError instances so they can be reported per item.
+    """
+    if request.mimetype == 'application/x-ndjson':
+        return iter_ndjson(request.stream)
+    return iter_json_array(request.get_json())
+
+
+def iter_ndjson(lines):
+    """
+    Yield the objects of an NDJSON body, given as an iterable of lines (str or bytes).
+
+    Blank lines are skipped and lines that are not valid JSON are yielded as ValueError instances.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"Invalid JSON: {e}")
+
+
+def iter_json_array(data):
+    """Return the items of a parsed JSON array body, or raise ValueError for any other body."""
+    if not isinstance(data, list):
+        raise ValueError("Request body must be a JSON array of objects or an NDJSON stream")
+    return iter(data)
+
+
+def bulk_insert(session, model, items, schema, batch_size, defaults=None, on_batch=None):
+    """
+    Validate items one by one and insert the valid ones in batches.
+
+    Each batch is sent as a single executemany INSERT and committed on its own, so a failing
+    batch never undoes earlier ones. If a batch is rejected by the database, its rows are retried
+    individually so that only the offending items are reported.
+
+    Parameters:
+        session: Session to insert with; it is committed after each batch.
+        model: Model class to insert into.
+        items: Iterable of submitted objects (or ValueError for unparsable items).
+        schema: Marshmallow schema used to validate and load each item.
+        batch_size: Number of rows per INSERT statement and transaction.
+        defaults (optional): Column values added to every row (e.g. a foreign key).
+        on_batch (optional): Callable receiving the ids inserted by a batch, run in the batch's
+            transaction before it commits (e.g. to maintain a denormalized counter).
+
+    Returns:
+        Tuple (inserted_ids, errors) where errors is a list of {"index", "errors"} dicts
+        referring to positions in the submitted items.
+    """
+    inserted_ids = []
+    errors = []
+    batch = []
+
+    for index, item in enumerate(items):
+        try:
+            if isinstance(item, Exception):
+                raise ValidationError(str(item))
+            if not isinstance(item, dict):
+                raise ValidationError("Item must be a JSON object")
+            row = schema.load(item)
+        except ValidationError as e:
+            errors.append({"index": index, "errors": e.messages})
+            continue
+        row.update(defaults or {})
+        batch.append((index, row))
+        if len(batch) >= batch_size:
+            _insert_batch(session, model, batch, inserted_ids, errors, on_batch)
+            batch = []
+
+    if batch:
+        _insert_batch(session, model, batch, inserted_ids, errors, on_batch)
+    return inserted_ids, errors
+
+
+def _insert_batch(session, model, batch, inserted_ids, errors, on_batch=None):
+    """Insert one batch with executemany, falling back to row-by-row inserts on failure."""
+    statement = db.insert(model).returning(model.id)
+    try:
+        ids = session.scalars(statement, [row for _, row in batch]).all()
+        if on_batch is not None:
+            on_batch(ids)
+        session.commit()
+        inserted_ids.extend(ids)
+        return
+    except SQLAlchemyError:
+        session.rollback()
+        if len(batch) == 1:
+            index, _ = batch[0]
+            errors.append({"index": index, "errors": {"_schema": ["Item could not be stored"]}})
+            return
+
+    for entry in batch:
+        _insert_batch(session, model, [entry], inserted_ids, errors, on_batch)
+
+
+def bulk_delete(session, model, batch_size, ids=None, condition=None, returning=(), pause=0, on_batch=None,
+                sleep=time.sleep):
+    """
+    Delete rows in batches of set-based statements, without loading them.
+
+    Each batch is a single DELETE ... WHERE id IN (SELECT ... LIMIT batch_size) RETURNING
+    statement in its own transaction, so write locks are only held for one batch at a time.
+    Dependent rows are removed by the database (ON DELETE CASCADE).
+
+    Parameters:
+        session: Session to delete with; it is committed after each batch.
+        model: Model class to delete from.
+        batch_size: Maximum number of rows deleted per statement and transaction.
+        ids (optional): Primary keys of the rows to delete; unknown ones are ignored.
+        condition (optional): SQL expression the deleted rows must match (combined with ids).
+        returning (optional): Extra columns returned for every deleted row.
+        pause (optional): Seconds to wait between batches, letting other writers take the lock.
+        on_batch (optional): Callable receiving the rows deleted by a batch, run in the batch's
+            transaction before it commits (e.g. to maintain aggregates).
+        sleep (optional): Function waiting `pause` seconds; the async application passes one that
+            lets the event loop run other requests meanwhile.
+
+    Returns:
+        Tuple (rows, batches): the (id, *returning) rows of the deleted rows and the number of
+        DELETE statements run.
+    """
+    table = model.__table__
+    primary_key = table.c.id
+    rows = []
+    batches = 0
+
+    if ids is None:
+        chunks = repeat(None)  # Until a batch comes back short
+    else:
+        unique = list(dict.fromkeys(ids))
+        chunks = (unique[start:start + batch_size] for start in range(0, len(unique), batch_size))
+
+    for chunk in chunks:
+        selected = db.select(primary_key).order_by(primary_key).limit(batch_size)
+        if chunk is not None:
+            selected = selected.where(primary_key.in_(chunk))
+        if condition is not None:
+            selected = selected.where(condition)
+        statement = db.delete(table).where(primary_key.in_(selected.scalar_subquery())).returning(primary_key, *returning)
+        deleted = session.execute(statement).all()
+        if on_batch is not None and deleted:
+            on_batch(deleted)
+        session.commit()
+        rows.extend(deleted)
+        batches += 1
+
+        if chunk is None and len(deleted) < batch_size:
+            break
+        if pause and deleted:
+            sleep(pause)
+    return rows, batches
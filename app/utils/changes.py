@@ -0,0 +1,74 @@
+from dataclasses import dataclass, field
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Callbacks notified with a ChangeSet after every commit that touched articles or comments
+_listeners = []
+
+
+@dataclass
+class ChangeSet:
+    """
+    Article ids affected by a committed transaction.
+
+    Attributes:
+        created (set): Ids of inserted articles.
+        updated (set): Ids of modified articles.
+        deleted (set): Ids of deleted articles.
+        commented (set): Ids of articles that received new comments.
+    """
+    created: set = field(default_factory=set)
+    updated: set = field(default_factory=set)
+    deleted: set = field(default_factory=set)
+    commented: set = field(default_factory=set)
+
+    def __bool__(self):
+        return bool(self.created or self.updated or self.deleted or self.commented)
+
+
+def on_change(func):
+    """Register `func` to be called with a ChangeSet after each relevant commit."""
+    _listeners.append(func)
+    return func
+
+
+def notify(changes):
+    """
+    Dispatch a ChangeSet to every registered listener.
+
+    ORM writes are collected automatically; code that writes through Core statements
+    (bulk inserts, set-based deletes) calls this directly after committing.
+    """
+    if changes:
+        for listener in _listeners:
+            listener(changes)
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changes(session, flush_context):
+    # Imported here to avoid a circular import with the models, which import `app`
+    from app.models.article import Article
+    from app.models.comment import Comment
+
+    changes = session.info.setdefault('changes', ChangeSet())
+    for instance in session.new:
+        if isinstance(instance, Article):
+            changes.created.add(instance.id)
+        elif isinstance(instance, Comment):
+            changes.commented.add(instance.article_id)
+    for instance in session.dirty:
+        if isinstance(instance, Article) and session.is_modified(instance, include_collections=False):
+            changes.updated.add(instance.id)
+    for instance in session.deleted:
+        if isinstance(instance, Article):
+            changes.deleted.add(instance.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _dispatch_changes(session):
+    notify(session.info.pop('changes', None))
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop('changes', None)
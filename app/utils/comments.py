@@ -0,0 +1,186 @@
+from sqlalchemy import event
+from app import db
+from app.models.article import Article
+from app.models.comment import Comment
+from app.utils.authors import author_comment_count_update
+from app.utils.serializer import comment_serializer
+
+# The functions below run their queries on the session they are given: db.session in the Flask
+# application, the synchronous session of an AsyncSession (through run_sync) in the async one.
+
+
+def comment_count_update(article_id, delta):
+    """
+    Statement adding `delta` to an article's comment_count.
+
+    The increment is computed by the database, so concurrent writers never lose an update, and
+    runs in the transaction that inserts or deletes the comments. updated_at is kept as is,
+    since a new comment does not modify the article itself.
+    """
+    article = Article.__table__
+    return (db.update(article)
+            .where(article.c.id == article_id)
+            .values(comment_count=article.c.comment_count + delta, updated_at=article.c.updated_at))
+
+
+def count_comments(connection, article_id, delta):
+    """
+    Add `delta` to the comment_count of an article and to the comment total of its author.
+
+    Parameters:
+        connection: Connection (or session) inside the transaction that inserts or deletes the comments.
+        article_id: ID of the article the comments belong to.
+        delta (int): Number of comments inserted (positive) or deleted (negative).
+    """
+    connection.execute(comment_count_update(article_id, delta))
+    connection.execute(author_comment_count_update(article_id, delta))
+
+
+@event.listens_for(Comment, 'after_insert')
+def _count_inserted_comment(mapper, connection, target):
+    # Comments added through the ORM (sync and async sessions); Core bulk inserts call
+    # count_comments() themselves
+    count_comments(connection, target.article_id, 1)
+
+
+@event.listens_for(Comment, 'after_delete')
+def _count_deleted_comment(mapper, connection, target):
+    count_comments(connection, target.article_id, -1)
+
+
+def reconcile_comment_counts(connection):
+    """
+    Recompute the comment_count of every article whose stored count differs from its comments.
+
+    Used to backfill the column and to repair counts after comments were written without
+    maintaining it (e.g. by hand or by an older release).
+
+    Parameters:
+        connection: Connection (or session) to run the UPDATE on, inside its transaction.
+
+    Returns:
+        List of the ids of the corrected articles.
+    """
+    article = Article.__table__
+    actual = (db.select(db.func.count())
+              .where(Comment.__table__.c.article_id == article.c.id)
+              .scalar_subquery())
+    return connection.execute(
+        db.update(article)
+        .where(article.c.comment_count != actual)
+        .values(comment_count=actual, updated_at=article.c.updated_at)
+        .returning(article.c.id)
+    ).scalars().all()
+
+
+def comment_counts_query(article_ids):
+    """Statement selecting (article_id, count) pairs for the given articles."""
+    return (db.select(Comment.article_id, db.func.count())
+            .where(Comment.article_id.in_(article_ids))
+            .group_by(Comment.article_id))
+
+
+def comment_counts(session, article_ids):
+    """
+    Count the comments of several articles in one query.
+
+    Parameters:
+        session: Session to query.
+        article_ids: Ids of the articles to count comments for.
+
+    Returns:
+        Dict mapping each article id to its number of comments.
+    """
+    counts = dict.fromkeys(article_ids, 0)
+    if counts:
+        counts.update(session.execute(comment_counts_query(list(counts))).tuples())
+    return counts
+
+
+def article_comments_query(article_ids):
+    """Statement selecting the comments of the given articles as column tuples, in insertion order."""
+    return (db.select(*comment_serializer.columns, Comment.article_id)
+            .where(Comment.article_id.in_(article_ids))
+            .order_by(Comment.id))
+
+
+def group_comments(article_ids, rows):
+    """Group rows of article_comments_query() by article id."""
+    comments = {article_id: [] for article_id in article_ids}
+    for row in rows:
+        comments[row.article_id].append(row)
+    return comments
+
+
+def article_comments(session, article_ids):
+    """
+    Load every comment of several articles in one query.
+
+    Parameters:
+        session: Session to query.
+        article_ids: Ids of the articles to load comments for.
+
+    Returns:
+        Dict mapping each article id to its comments as column tuples (see comment_serializer),
+        in insertion order.
+    """
+    if not article_ids:
+        return {}
+    return group_comments(article_ids, session.execute(article_comments_query(article_ids)))
+
+
+def comment_previews_query(article_ids, limit):
+    """
+    Statement selecting the newest `limit` comments of each given article, with the article's
+    total number of comments, using window functions.
+    """
+    ranked = (
+        db.select(
+            *comment_serializer.columns,
+            Comment.article_id,
+            db.func.row_number().over(
+                partition_by=Comment.article_id,
+                order_by=(Comment.created_at.desc(), Comment.id.desc()),
+            ).label('position'),
+            db.func.count().over(partition_by=Comment.article_id).label('total'),
+        )
+        .where(Comment.article_id.in_(article_ids))
+        .subquery()
+    )
+    return (
+        db.select(*[ranked.c[column.key] for column in comment_serializer.columns],
+                  ranked.c.article_id, ranked.c.total)
+        .where(ranked.c.position <= limit)
+        .order_by(ranked.c.article_id, ranked.c.position)
+    )
+
+
+def group_previews(article_ids, rows):
+    """Group rows of comment_previews_query() into {article_id: (comment_count, comments)}."""
+    counts = dict.fromkeys(article_ids, 0)
+    comments = {article_id: [] for article_id in article_ids}
+    for row in rows:
+        comments[row.article_id].append(row)
+        counts[row.article_id] = row.total
+    return {article_id: (counts[article_id], comments[article_id]) for article_id in counts}
+
+
+def comment_previews(session, article_ids, limit):
+    """
+    Load the newest comments of several articles, at most `limit` per article, in one query.
+
+    Parameters:
+        session: Session to query.
+        article_ids: Ids of the articles to load comments for.
+        limit: Maximum number of comments returned per article.
+
+    Returns:
+        Dict mapping each article id to a (comment_count, comments) pair, where comments are
+        column tuples (see comment_serializer) ordered newest first and comment_count is the
+        article's total number of comments.
+    """
+    if not article_ids:
+        return {}
+    if limit <= 0:
+        return {article_id: (count, []) for article_id, count in comment_counts(session, article_ids).items()}
+    return group_previews(article_ids, session.execute(comment_previews_query(article_ids, limit)))
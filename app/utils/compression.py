@@ -0,0 +1,174 @@
+import gzip
+import zlib
+from flask import request
+from app.utils.instrumentation import timed
+
+try:
+    import brotli  # Optional, better ratios than gzip at similar speed
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard  # Optional, much faster than gzip at similar ratios
+except ImportError:
+    zstandard = None
+
+
+class _GzipStream:
+    """Incremental gzip compressor for streamed responses."""
+
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk):
+        # Sync flush so every chunk (e.g. a batch of NDJSON lines) reaches the client right away
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    """Incremental brotli compressor for streamed responses."""
+
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, chunk):
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    """Incremental zstd compressor for streamed responses."""
+
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk):
+        return self._compressor.compress(chunk) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+# Available codings by Accept-Encoding token: (compress(data, level), streaming compressor class).
+# gzip is always available; the others only when their package is installed.
+ENCODINGS = {'gzip': (lambda data, level: gzip.compress(data, compresslevel=level, mtime=0), _GzipStream)}
+if brotli is not None:
+    ENCODINGS['br'] = (lambda data, level: brotli.compress(data, quality=level), _BrotliStream)
+if zstandard is not None:
+    ENCODINGS['zstd'] = (lambda data, level: zstandard.ZstdCompressor(level=level).compress(data), _ZstdStream)
+
+# Server preference between codings the client accepts with the same quality
+PREFERENCE = ('zstd', 'br', 'gzip')
+
+
+def negotiate(accept_encodings, available=None):
+    """
+    Pick the coding for a response from the parsed Accept-Encoding header.
+
+    Parameters:
+        accept_encodings: werkzeug Accept object (request.accept_encodings).
+        available (optional): Codings to choose from (default: every installed one).
+
+    Returns:
+        The accepted coding with the highest quality (ties broken by PREFERENCE), or None if
+        the response should not be encoded.
+    """
+    available = ENCODINGS if available is None else available
+    # An explicit entry (e.g. "gzip;q=0") takes precedence over the "*" wildcard
+    qualities = {value.lower(): quality for value, quality in accept_encodings}
+    best, best_quality = None, 0
+    for name in PREFERENCE:
+        if name not in available:
+            continue
+        quality = qualities.get(name, qualities.get('*', 0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+def _compressible(response, mimetypes):
+    # Quart responses have no direct_passthrough
+    if getattr(response, 'direct_passthrough', False) or 'Content-Encoding' in response.headers:
+        return False
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    return response.mimetype in mimetypes
+
+
+def select_encoding(response, accept_encodings, config):
+    """
+    Pick the coding of a Flask or Quart response, or None to send it as is.
+
+    Adds Accept-Encoding to the Vary header of every compressible response, whether or not the
+    client accepts a coding.
+    """
+    if not _compressible(response, config['COMPRESSION_MIMETYPES']):
+        return None
+    response.vary.add('Accept-Encoding')
+    return negotiate(accept_encodings)
+
+
+def mark_encoded(response, encoding):
+    """Label a response whose body was encoded with `encoding`."""
+    response.headers['Content-Encoding'] = encoding
+    # The encoded body differs byte for byte from the identity one, so a strong validator
+    # would be wrong; weak comparison (used for If-None-Match) still matches
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def _stream(chunks, compressor):
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def compress_response(response, config):
+    """
+    Encode `response` with the best coding accepted by the client.
+
+    Buffered bodies smaller than COMPRESSION_MIN_SIZE are left alone, since their headers and
+    round trip cost more than the bytes saved. Streamed bodies are compressed chunk by chunk,
+    with a flush after each chunk, so streaming keeps working.
+    """
+    encoding = select_encoding(response, request.accept_encodings, config)
+    if encoding is None:
+        return response
+    compress, stream = ENCODINGS[encoding]
+    level = config['COMPRESSION_LEVELS'][encoding]
+
+    if response.is_streamed:
+        response.response = _stream(response.response, stream(level))
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < config['COMPRESSION_MIN_SIZE']:
+            return response
+        with timed('compress'):
+            response.set_data(compress(data, level))
+    return mark_encoded(response, encoding)
+
+
+def init_compression(app):
+    """
+    Compress responses negotiated with Accept-Encoding when COMPRESSION_ENABLED is set.
+
+    Registered after the metrics hooks, so that they record the size actually sent.
+    """
+    if not app.config.get('COMPRESSION_ENABLED'):
+        return
+
+    @app.after_request
+    def compress(response):
+        return compress_response(response, app.config)
@@ -0,0 +1,150 @@
+import hashlib
+from functools import wraps
+from urllib.parse import urlencode
+import pytz
+from flask import request, make_response, Response
+from app import db
+from app.models.article import Article, indian_timezone
+from app.models.comment import Comment
+from app.utils.deletions import deletion_marks
+from app.utils.versioning import version_etag
+
+
+def _to_utc(value):
+    """Convert a naive timestamp stored in Indian Standard Time to an aware UTC datetime."""
+    if value is None:
+        return None
+    return indian_timezone.localize(value).astimezone(pytz.utc)
+
+
+def _digest(args, *parts):
+    """Hash the validator parts together with the query arguments, which select the representation."""
+    params = urlencode(sorted(args.items(multi=True)))
+    basis = '|'.join(str(part) for part in parts) + '|' + params
+    return hashlib.sha1(basis.encode()).hexdigest()
+
+
+def article_validator_columns(article_id):
+    """
+    Columns the validators of an article are computed from, for a SELECT or for the RETURNING
+    clause of a statement writing the article (see article_validators_from).
+    """
+    article = Article.__table__
+    last_comment_at = db.select(db.func.max(Comment.created_at)).where(Comment.article_id == article_id)
+    return [article.c.updated_at, article.c.version, article.c.comment_count,
+            last_comment_at.scalar_subquery().label('last_comment_at')]
+
+
+def article_validators_from(args, article_id, row):
+    """
+    Compute the validators of a single article response from its article_validator_columns().
+
+    The ETag covers the article's updated_at, its stored comment_count and the latest comment
+    timestamp, and starts with the article version ("v<version>.<digest>"), so it can be sent
+    back in If-Match to update the article; Last-Modified is the later of the two timestamps.
+    Responses to updates carry the same validators as a GET of the updated article.
+
+    Parameters:
+        args: Query arguments of the request.
+        article_id: ID of the article.
+        row: Row with (at least) the article_validator_columns().
+
+    Returns:
+        Tuple (etag, weak, last_modified).
+    """
+    updated_at, last_comment_at = _to_utc(row.updated_at), _to_utc(row.last_comment_at)
+    version, comment_count = row.version, row.comment_count
+    timestamps = [value for value in (updated_at, last_comment_at) if value is not None]
+    last_modified = max(timestamps) if timestamps else None
+    etag = version_etag(version, _digest(args, article_id, updated_at, comment_count, last_comment_at))
+    return etag, False, last_modified
+
+
+def article_validators(session, args, article_id):
+    """
+    Compute the validators of a single article response with one indexed query
+    (see article_validators_from).
+
+    Parameters:
+        session: Session to query.
+        args: Query arguments of the request.
+        article_id: ID of the article.
+
+    Returns:
+        Tuple (etag, weak, last_modified), or None if the article does not exist.
+    """
+    row = session.execute(
+        db.select(*article_validator_columns(article_id)).where(Article.id == article_id)
+    ).first()
+    if row is None:
+        return None
+    return article_validators_from(args, article_id, row)
+
+
+def list_validators(session, args):
+    """
+    Compute a cheap validator for article list responses from indexed maximums.
+
+    Any insert or update of an article and any new comment moves the highest article id, the
+    latest article update or the highest comment id, and any delete moves the deletion
+    generation; each is one index lookup, whatever the size of the tables. The ETag is weak
+    because it does not hash the representation itself.
+
+    Parameters:
+        session: Session to query.
+        args: Query arguments of the request.
+
+    Returns:
+        Tuple (etag, weak, last_modified); lists carry no Last-Modified because deletes do not
+        move any timestamp.
+    """
+    generation, _ = deletion_marks()
+    row = session.execute(
+        db.select(
+            db.select(db.func.max(Article.id)).scalar_subquery(),
+            db.select(db.func.max(Article.updated_at)).scalar_subquery(),
+            db.select(db.func.max(Comment.id)).scalar_subquery(),
+            generation,
+        )
+    ).first()
+    return _digest(args, *row), True, None
+
+
+def is_fresh(request, etag, last_modified):
+    """Return True if the client's cached copy matches the current validators (Flask or Quart request)."""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified is not None:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def conditional(validators):
+    """
+    Decorator adding ETag/Last-Modified headers to a GET view and answering 304 when the client
+    copy is current, without running the view or serializing anything.
+
+    Parameters:
+        validators: Function receiving the session, the query arguments and the view arguments
+            and returning (etag, weak, last_modified), or None to run the view unconditionally.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            current = validators(db.session, request.args, **kwargs)
+            if current is None:
+                return view(*args, **kwargs)
+
+            etag, weak, last_modified = current
+            if is_fresh(request, etag, last_modified):
+                response = Response(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=weak)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,38 @@
+from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app import db
+from app.models.article import Article, indian_timezone
+from app.models.deletions import ArticleDeletions
+
+_deletions = ArticleDeletions.__table__
+
+
+def record_deletion(connection):
+    """
+    Count a transaction that deletes articles, in that transaction.
+
+    Callers running DELETE statements on the article table call it once their RETURNING rows
+    show that articles were deleted, so a delete that matches nothing invalidates no validator.
+
+    Parameters:
+        connection: Connection (or session) inside the deleting transaction.
+    """
+    connection.execute(
+        db.update(_deletions)
+        .where(_deletions.c.id == 1)
+        .values(generation=_deletions.c.generation + 1, deleted_at=datetime.now(indian_timezone))
+    )
+
+
+def deletion_marks():
+    """Scalar subqueries of the deletion generation and the time of the latest delete."""
+    return (db.select(_deletions.c.generation).where(_deletions.c.id == 1).scalar_subquery(),
+            db.select(_deletions.c.deleted_at).where(_deletions.c.id == 1).scalar_subquery())
+
+
+@event.listens_for(Session, 'after_flush')
+def _count_flushed_deletes(session, flush_context):
+    # Articles deleted through the ORM unit of work
+    if any(isinstance(instance, Article) for instance in session.deleted):
+        record_deletion(session.connection())
@@ -0,0 +1,46 @@
+from sqlalchemy import event
+from app import db
+
+# Pragmas every SQLite connection needs: foreign key enforcement makes ON DELETE CASCADE work
+REQUIRED_SQLITE_PRAGMAS = {'foreign_keys': 'ON'}
+
+
+def sqlite_pragmas(config):
+    """Return the REQUIRED_SQLITE_PRAGMAS merged with the configured SQLITE_PRAGMAS."""
+    return {**REQUIRED_SQLITE_PRAGMAS, **(config.get('SQLITE_PRAGMAS') or {})}
+
+
+def apply_sqlite_pragmas(engine, pragmas):
+    """
+    Run the given PRAGMA statements on every new connection of an SQLite engine.
+
+    Parameters:
+        engine: SQLAlchemy engine; non-SQLite engines are left untouched.
+        pragmas: Dict mapping pragma names to values, e.g. {'journal_mode': 'WAL'}.
+    """
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    statements = [f"PRAGMA {name}={value}" for name, value in pragmas.items()]
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def configure_engines(app):
+    """Apply the configured connection settings to every engine of the application."""
+    from app.utils.replica import REPLICA_BIND, watch_replica
+
+    # The replica mirrors the primary's tables, so create_all()/drop_all() must never target it
+    db.metadatas.pop(REPLICA_BIND, None)
+
+    for bind_key, engine in db.engines.items():
+        apply_sqlite_pragmas(engine, sqlite_pragmas(app.config))
+        if bind_key == REPLICA_BIND:
+            watch_replica(engine)
@@ -0,0 +1,198 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from app import db
+from app.models.article import Article
+from app.utils.changes import on_change
+from app.utils.pagination import sort_keys, encode_cursor, decode_cursor
+from app.utils.serializer import article_projection, dumps
+
+# Feed order: newest publication first, ties broken by descending id
+FEED_KEYS = sort_keys(Article, [('pub_date', True)])
+
+
+class LatestFeed:
+    """
+    In-memory feed of the newest published articles, kept as pre-serialized summaries.
+
+    Up to FEED_SIZE articles are held in (pub_date, id) order, each already encoded to JSON
+    bytes, so a page is served by a binary search for the cursor and a join of the page's
+    entries, without querying, sorting or serializing anything.
+
+    Commits are reported through the change hub: deleted articles are dropped right away, and
+    created, updated and commented ones are re-read together, with one query by id, on the next
+    read. The feed is rebuilt from the database when a removal leaves it short while more
+    published articles exist, and every FEED_MAX_AGE seconds to pick up writes made by other
+    processes.
+    """
+
+    def __init__(self):
+        self.serializer = article_projection(view='summary')
+        self._keys = []  # Ascending (pub_date, id) of the articles in the feed
+        self._entries = {}  # id -> ((pub_date, id), JSON bytes)
+        self._pending = set()  # Ids to re-read before the next page is served
+        self._complete = False  # True if the feed holds every published article
+        self._built_at = None  # time.monotonic() of the last rebuild, None if it must be rebuilt
+        self._touched = None  # Ids changed while a refresh query runs (None when none runs)
+        self._deleted = None  # Ids deleted while a refresh query runs
+        self._lock = threading.RLock()  # Guards the feed; never held during a query
+        self._refresh_lock = threading.Lock()  # One thread queries the database at a time
+
+    def page(self, session, config, per_page, cursor=None):
+        """
+        Return one page of the feed as a JSON response body.
+
+        Parameters:
+            session: Session used to refresh the feed (a synchronous one, also under the async app).
+            config: Application configuration (FEED_SIZE, FEED_MAX_AGE).
+            per_page (int): Number of articles on the page.
+            cursor (optional): Cursor token returned as `next_cursor` by the previous page.
+
+        Returns:
+            JSON bytes with the page's article summaries, newest first, and the next cursor (None
+            at the end of the feed, after at most FEED_SIZE articles).
+        """
+        self._refresh(session, config)
+        with self._lock:
+            end = len(self._keys)
+            if cursor:
+                pub_date, article_id = decode_cursor(FEED_KEYS, cursor)
+                end = bisect_left(self._keys, (pub_date, article_id))
+            start = max(end - per_page, 0)
+            keys = self._keys[start:end][::-1]
+            items = [self._entries[article_id][1] for _, article_id in keys]
+            next_cursor = encode_cursor(FEED_KEYS, _Key(*keys[-1])) if keys and start > 0 else None
+        return (b'{"data":[' + b','.join(items) + b'],"next_cursor":' + dumps(next_cursor)
+                + b',"message":"Data retrieved successfully"}')
+
+    def invalidate(self, changes):
+        """
+        Record the articles affected by a commit (registered with the change hub).
+
+        Only touches memory, since it may run outside any request (e.g. in the async application).
+        """
+        with self._lock:
+            removed = [article_id for article_id in changes.deleted if self._remove(article_id)]
+            if removed and not self._complete:
+                # The newest articles left out of the feed now belong in it
+                self._built_at = None
+            self._pending |= changes.created | changes.updated
+            # New comments only change the comment_count of articles already in the feed
+            self._pending |= {article_id for article_id in changes.commented if article_id in self._entries}
+            if self._touched is not None:
+                self._touched |= changes.created | changes.updated | changes.deleted | changes.commented
+                self._deleted |= changes.deleted
+
+    def clear(self):
+        """Empty the feed; it is rebuilt by the next read."""
+        with self._lock:
+            self._keys, self._entries, self._pending = [], {}, set()
+            self._built_at = None
+
+    def _refresh(self, session, config):
+        # Readers are served from memory while one thread runs the refresh query. Applying
+        # changes can call for a rebuild (an article left the feed), hence the passes.
+        for _ in range(3):
+            with self._lock:
+                if not self._expired(config) and not self._pending:
+                    return
+            with self._refresh_lock:
+                with self._lock:
+                    rebuild = self._expired(config)
+                    ids, self._pending = self._pending, set()
+                    if not rebuild and not ids:
+                        continue
+                    self._touched, self._deleted = set(), set()
+                try:
+                    if rebuild:
+                        rows = self._read_newest(session, config)
+                    else:
+                        rows = session.execute(self._query().where(Article.id.in_(ids))).all()
+                except BaseException:
+                    with self._lock:
+                        self._pending |= ids
+                        self._touched = self._deleted = None
+                    raise
+                with self._lock:
+                    # Rows of articles changed during the query may be stale: drop them and read
+                    # them again, unless they were deleted
+                    touched, deleted = self._touched, self._deleted
+                    self._touched = self._deleted = None
+                    fresh = [row for row in rows if row.id not in touched]
+                    self._pending |= {row.id for row in rows if row.id in touched} - deleted
+                    if rebuild:
+                        self._load(fresh, complete=len(rows) < config['FEED_SIZE'])
+                    else:
+                        self._apply(ids, fresh, config['FEED_SIZE'])
+                    if len(fresh) < len(rows) and not self._complete:
+                        # The newest articles left out of the feed now belong in it
+                        self._built_at = None
+
+    def _expired(self, config):
+        return self._built_at is None or time.monotonic() - self._built_at >= config['FEED_MAX_AGE']
+
+    def _read_newest(self, session, config):
+        return session.execute(
+            self._query().order_by(Article.pub_date.desc(), Article.id.desc()).limit(config['FEED_SIZE'])
+        ).all()
+
+    def _load(self, rows, complete):
+        self._keys, self._entries = [], {}
+        for row in rows:
+            self._insert(row)
+        self._complete = complete
+        self._built_at = time.monotonic()
+
+    def _apply(self, ids, rows, size):
+        # Articles between the oldest kept entry and the next one are not in memory: an incomplete
+        # feed may only take in articles newer than its oldest entry
+        oldest = self._keys[0] if self._keys else None
+        if not self._complete and oldest is None:
+            self._built_at = None
+            return
+        for article_id in ids:
+            self._remove(article_id)
+        for row in rows:
+            if self._complete or (row.pub_date, row.id) > oldest:
+                self._insert(row)
+        if len(self._keys) > size:
+            for key in self._keys[:len(self._keys) - size]:
+                del self._entries[key[1]]
+            del self._keys[:len(self._keys) - size]
+            self._complete = False
+        elif len(self._keys) < size and not self._complete:
+            # An article was removed: the newest one left out of the feed now belongs in it
+            self._built_at = None
+
+    def _query(self):
+        return (db.select(*self.serializer.columns)
+                .where(Article.is_published.is_(True), Article.pub_date.is_not(None)))
+
+    def _insert(self, row):
+        key = (row.pub_date, row.id)
+        self._entries[row.id] = (key, dumps(self.serializer.to_dict(row)))
+        insort(self._keys, key)
+
+    def _remove(self, article_id):
+        entry = self._entries.pop(article_id, None)
+        if entry is None:
+            return False
+        del self._keys[bisect_left(self._keys, entry[0])]
+        return True
+
+
+class _Key:
+    """Attribute access to a (pub_date, id) key, as expected by encode_cursor."""
+
+    def __init__(self, pub_date, id):
+        self.pub_date = pub_date
+        self.id = id
+
+
+# Feed served by GET /api/articles/latest
+latest_feed = LatestFeed()
+
+
+@on_change
+def update_latest_feed(changes):
+    latest_feed.invalidate(changes)
@@ -0,0 +1,304 @@
+import atexit
+import glob
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+from app import db
+from app.models.article import Article
+from app.models.comment import Comment, indian_timezone
+from app.utils.cache import TTLCache
+from app.utils.changes import ChangeSet, notify
+from app.utils.comments import count_comments
+
+# Seconds an idle writer waits for a comment before checking whether it should stop
+IDLE_POLL_INTERVAL = 0.5
+
+# File name pattern of the comments spilled to disk at shutdown, one file per process
+SPILL_PATTERN = 'comment-ingest-*.ndjson'
+
+
+class CommentIngest:
+    """
+    Bounded queue of submitted comments written to the database by a background thread.
+
+    Requests only validate and enqueue comments. The writer thread takes up to
+    COMMENT_INGEST_BATCH_SIZE queued comments, waiting at most COMMENT_INGEST_MAX_DELAY seconds
+    for a batch to fill, and inserts the batch with one executemany INSERT, one comment_count
+    update per article and a single commit (group commit). A burst of comments thus costs a few
+    transactions instead of one lookup and one commit per comment.
+
+    Comments still queued when the process exits are appended to an NDJSON file in the spill
+    directory, and written by the next writer started on that directory.
+
+    The status of each comment is kept in memory for COMMENT_INGEST_STATUS_TTL seconds, by the
+    process that accepted it.
+
+    Attributes:
+        batch_size (int): Maximum number of comments written per transaction.
+        max_delay (float): Seconds the writer waits for a batch to fill before writing it.
+        spill_dir (str): Directory of the spill files.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.batch_size = app.config['COMMENT_INGEST_BATCH_SIZE']
+        self.max_delay = app.config['COMMENT_INGEST_MAX_DELAY']
+        self.spill_dir = app.config['COMMENT_INGEST_SPILL_DIR'] or app.instance_path
+        self.statuses = TTLCache(ttl=app.config['COMMENT_INGEST_STATUS_TTL'], maxsize=4 * app.config['COMMENT_INGEST_QUEUE_SIZE'])
+        self._queue = queue.Queue(maxsize=app.config['COMMENT_INGEST_QUEUE_SIZE'])
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._counts = Counter()
+
+    def start(self):
+        """
+        Start the writer thread of the current process, if not running yet.
+
+        Called before every request: threads do not survive a fork, so each worker process of
+        a preloading server starts its own writer on its first request.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='comment-ingest', daemon=True)
+            self._thread.start()
+
+    def submit(self, article_id, comment):
+        """
+        Queue a validated comment for insertion.
+
+        Parameters:
+            article_id: ID of the article the comment belongs to; checked by the writer.
+            comment (dict): Loaded comment fields (author, content).
+
+        Returns:
+            The tracking id of the comment.
+
+        Raises:
+            queue.Full: If the queue is at capacity; the client should retry later.
+        """
+        item = {
+            'tracking_id': uuid.uuid4().hex,
+            'article_id': article_id,
+            'author': comment['author'],
+            'content': comment['content'],
+            # Stamped on acceptance, so comments keep their submission order however they are batched
+            'created_at': datetime.now(indian_timezone).isoformat(),
+        }
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self._count('refused')
+            raise
+        self._set_status(item, 'queued')
+        self._count('accepted')
+        return item['tracking_id']
+
+    def status(self, tracking_id):
+        """Return the status of a submitted comment, or None if it is unknown or expired."""
+        return self.statuses.get(tracking_id)
+
+    def stats(self):
+        """Return the queue depth and capacity and the counters of this process."""
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            'queued': self._queue.qsize(),
+            'capacity': self._queue.maxsize,
+            'batch_size': self.batch_size,
+            'max_delay': self.max_delay,
+            'writer_running': self._thread is not None and self._thread.is_alive(),
+            **{name: counts.get(name, 0) for name in
+               ('accepted', 'refused', 'stored', 'rejected', 'failed', 'batches', 'spilled', 'restored')},
+        }
+
+    def wait_idle(self, timeout=None):
+        """
+        Wait until every queued comment has been processed.
+
+        Returns:
+            True if the queue drained, False if `timeout` seconds passed first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def shutdown(self, timeout=5):
+        """
+        Stop the writer and spill the comments still queued to disk.
+
+        The writer finishes the batch it is writing; the remaining comments are appended to this
+        process's spill file and synced before returning.
+        """
+        self._stop.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout)
+        self._spill()
+
+    def _run(self):
+        self._restore()
+        while not self._stop.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+            try:
+                self._write_safely(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_safely(self, batch):
+        try:
+            self._write(batch)
+        except Exception:
+            self.app.logger.exception("Comment ingestion batch failed")
+            for item in batch:
+                self._set_status(item, 'failed', message="Comment could not be stored")
+            self._count('failed', len(batch))
+
+    def _collect(self):
+        """Take the next batch: up to batch_size comments, waiting at most max_delay after the first."""
+        try:
+            batch = [self._queue.get(timeout=IDLE_POLL_INTERVAL)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stop.is_set():
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        """Insert a batch in one transaction, retrying its comments one by one if it fails."""
+        with self.app.app_context():
+            article_ids = {item['article_id'] for item in batch}
+            existing = set(db.session.scalars(db.select(Article.id).where(Article.id.in_(article_ids))))
+            db.session.rollback()
+
+            valid = []
+            for item in batch:
+                if item['article_id'] in existing:
+                    valid.append(item)
+                else:
+                    self._set_status(item, 'rejected', message="No articles found with provided id")
+                    self._count('rejected')
+            if not valid:
+                return
+
+            try:
+                self._insert(valid)
+                self._count('batches')
+                return
+            except SQLAlchemyError:
+                db.session.rollback()
+
+            # Isolate the comments the database refuses (e.g. their article was deleted meanwhile)
+            for item in valid:
+                try:
+                    self._insert([item])
+                    self._count('batches')
+                except SQLAlchemyError:
+                    db.session.rollback()
+                    self._set_status(item, 'failed', message="Comment could not be stored")
+                    self._count('failed')
+
+    def _insert(self, items):
+        rows = [{'article_id': item['article_id'], 'author': item['author'], 'content': item['content'],
+                 'created_at': datetime.fromisoformat(item['created_at'])} for item in items]
+        statement = db.insert(Comment).returning(Comment.id, sort_by_parameter_order=True)
+        ids = db.session.scalars(statement, rows).all()
+        per_article = Counter(item['article_id'] for item in items)
+        for article_id, count in per_article.items():
+            count_comments(db.session, article_id, count)
+        db.session.commit()
+        notify(ChangeSet(commented=set(per_article)))
+
+        for item, comment_id in zip(items, ids):
+            self._set_status(item, 'stored', comment_id=comment_id)
+        self._count('stored', len(items))
+
+    def _spill(self):
+        items = []
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            self._queue.task_done()
+        if not items:
+            return
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = os.path.join(self.spill_dir, SPILL_PATTERN.replace('*', str(os.getpid())))
+        with open(path, 'a') as file:
+            file.writelines(json.dumps(item) + '\n' for item in items)
+            file.flush()
+            os.fsync(file.fileno())
+        self._count('spilled', len(items))
+
+    def _restore(self):
+        """Write the comments spilled by earlier processes, in batches, before serving the queue."""
+        for path in glob.glob(os.path.join(self.spill_dir, SPILL_PATTERN)):
+            # Renaming claims the file atomically, so that only one process writes its comments
+            claimed = f'{path}.{os.getpid()}.claimed'
+            try:
+                os.rename(path, claimed)
+            except OSError:
+                continue
+            with open(claimed) as file:
+                items = [json.loads(line) for line in file if line.strip()]
+            for start in range(0, len(items), self.batch_size):
+                batch = items[start:start + self.batch_size]
+                for item in batch:
+                    self._set_status(item, 'queued')
+                self._write_safely(batch)
+            os.remove(claimed)
+            self._count('restored', len(items))
+
+    def _set_status(self, item, status, **fields):
+        self.statuses.set(item['tracking_id'], {'tracking_id': item['tracking_id'], 'article_id': item['article_id'],
+                                                'status': status, **fields})
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counts[name] += amount
+
+
+def comment_ingest():
+    """Return the comment ingestion queue of the current application, or None if it is disabled."""
+    return current_app.extensions.get('comment_ingest')
+
+
+def init_comment_ingest(app):
+    """
+    Queue submitted comments for group-committed insertion when COMMENT_INGEST_ENABLED is set.
+
+    The writer is started by the first request of each process and stopped at exit, spilling
+    the comments still queued to disk.
+    """
+    if not app.config.get('COMMENT_INGEST_ENABLED'):
+        return
+    ingest = CommentIngest(app)
+    app.extensions['comment_ingest'] = ingest
+    app.before_request(ingest.start)
+    atexit.register(ingest.shutdown)
@@ -0,0 +1,190 @@
+import json
+import logging
+import time
+from contextlib import nullcontext
+from flask import g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+from app import db
+
+# Structured (one JSON object per record) log of slow requests and slow queries
+logger = logging.getLogger(__name__)
+
+# Longest statement text written to the slow-query log
+MAX_LOGGED_STATEMENT = 1000
+
+
+class RequestMetrics:
+    """
+    Timings collected while one request is handled.
+
+    Attributes:
+        start (float): perf_counter() value when the request started.
+        queries (int): Number of SQL statements executed.
+        db_time (float): Seconds spent executing SQL statements.
+        phases (dict): Seconds spent per named phase, e.g. 'serialize' and 'encode'.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.phases = {}
+        self._active = set()
+
+
+class _Phase:
+    """Context manager adding its duration to a phase of the current request's metrics."""
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        metrics = self.metrics
+        metrics.phases[self.name] = metrics.phases.get(self.name, 0.0) + time.perf_counter() - self.start
+        metrics._active.discard(self.name)
+
+
+def _current_metrics():
+    if not has_request_context():
+        return None
+    return g.get('request_metrics')
+
+
+def timed(phase):
+    """
+    Time a block as `phase` of the current request, e.g. `with timed('serialize'): ...`.
+
+    A no-op when instrumentation is disabled or outside a request. Nested blocks of the same
+    phase (e.g. a nested schema dump) are only counted once.
+    """
+    metrics = _current_metrics()
+    if metrics is None or phase in metrics._active:
+        return nullcontext()
+    metrics._active.add(phase)
+    return _Phase(metrics, phase)
+
+
+class TimedDumpMixin:
+    """Schema mixin timing dump() calls as the 'serialize' phase of the request."""
+
+    def dump(self, obj, *, many=None):
+        with timed('serialize'):
+            return super().dump(obj, many=many)
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider timing the encoding of jsonify() responses as the 'encode' phase."""
+
+    def dumps(self, obj, **kwargs):
+        with timed('encode'):
+            return super().dumps(obj, **kwargs)
+
+
+def parameter_shape(parameters):
+    """Describe bound parameters by type only, so slow-query logs never contain user data."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: the number of parameter sets and the shape of the first one
+            return {'rows': len(parameters), 'row': parameter_shape(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _log(kind, **fields):
+    logger.warning(json.dumps({'event': kind, **fields}, default=str))
+
+
+def _instrument_engine(engine, slow_query_ms):
+    """Count and time the statements of `engine`, logging those slower than slow_query_ms."""
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_start'].pop()
+        _count_query(elapsed)
+        if elapsed * 1000 >= slow_query_ms:
+            _log('slow_query',
+                 duration_ms=round(elapsed * 1000, 3),
+                 statement=statement[:MAX_LOGGED_STATEMENT],
+                 parameters=parameter_shape(parameters),
+                 executemany=executemany,
+                 endpoint=request.endpoint if has_request_context() else None)
+
+
+    @event.listens_for(engine, 'handle_error')
+    def handle_error(exception_context):
+        # A failed statement never reaches after_cursor_execute: drop its start time, or the
+        # following statements on this connection would be timed from it
+        conn = exception_context.connection
+        starts = conn.info.get('query_start') if conn is not None else None
+        if starts and exception_context.execution_context is not None:
+            _count_query(time.perf_counter() - starts.pop())
+
+
+def _count_query(elapsed):
+    metrics = _current_metrics()
+    if metrics is not None:
+        metrics.queries += 1
+        metrics.db_time += elapsed
+
+
+def server_timing(metrics, total):
+    """Format the metrics as a Server-Timing header value (durations in milliseconds)."""
+    entries = [f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.queries} queries"']
+    entries += [f'{name};dur={seconds * 1000:.2f}' for name, seconds in sorted(metrics.phases.items())]
+    entries.append(f'total;dur={total * 1000:.2f}')
+    return ', '.join(entries)
+
+
+def init_instrumentation(app):
+    """
+    Enable per-request instrumentation when INSTRUMENTATION_ENABLED is set.
+
+    Counts and times SQL statements, times serialization ('serialize') and JSON encoding
+    ('encode'), adds a Server-Timing header to every response and logs requests slower than
+    SLOW_REQUEST_MS and statements slower than SLOW_QUERY_MS. When disabled nothing is
+    registered, so requests pay no cost.
+    """
+    config = app.config
+    if not config.get('INSTRUMENTATION_ENABLED'):
+        return
+
+    app.json = TimedJSONProvider(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            _instrument_engine(engine, config.get('SLOW_QUERY_MS', 100))
+
+    slow_request_ms = config.get('SLOW_REQUEST_MS', 500)
+
+    @app.before_request
+    def start_request_metrics():
+        g.request_metrics = RequestMetrics()
+
+    @app.after_request
+    def report_request_metrics(response):
+        metrics = g.pop('request_metrics', None)
+        if metrics is None:
+            return response
+        total = time.perf_counter() - metrics.start
+        response.headers['Server-Timing'] = server_timing(metrics, total)
+        if total * 1000 >= slow_request_ms:
+            _log('slow_request',
+                 method=request.method,
+                 path=request.path,
+                 endpoint=request.endpoint,
+                 status=response.status_code,
+                 duration_ms=round(total * 1000, 3),
+                 queries=metrics.queries,
+                 db_ms=round(metrics.db_time * 1000, 3),
+                 **{f'{name}_ms': round(seconds * 1000, 3) for name, seconds in metrics.phases.items()})
+        return response
@@ -0,0 +1,159 @@
+import os
+import time
+from flask import Response, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+from prometheus_client import (CollectorRegistry, Counter, Gauge, Histogram, REGISTRY,
+                               CONTENT_TYPE_LATEST, generate_latest, multiprocess)
+from app import db
+
+# Request latency buckets in seconds, from cache hits to slow exports
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Response body size buckets in bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Connection checkout wait buckets in seconds
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+REQUESTS = Counter('http_requests_total', 'HTTP requests handled', ['method', 'route', 'status'])
+LATENCY = Histogram('http_request_duration_seconds', 'Time spent handling HTTP requests',
+                    ['method', 'route'], buckets=LATENCY_BUCKETS)
+RESPONSE_SIZE = Histogram('http_response_size_bytes', 'Size of HTTP response bodies',
+                          ['method', 'route'], buckets=SIZE_BUCKETS)
+CACHE_REQUESTS = Counter('cache_requests_total', 'Cache lookups by cache and result (hit or miss)',
+                         ['cache', 'result'])
+POOL_WAIT = Histogram('db_pool_checkout_wait_seconds', 'Time spent waiting for a pooled database connection',
+                      ['bind'], buckets=POOL_WAIT_BUCKETS)
+POOL_IN_USE = Gauge('db_pool_connections_in_use', 'Database connections checked out of the pool',
+                    ['bind'], multiprocess_mode='livesum')
+
+
+def record_cache(cache, hit):
+    """Count a lookup in `cache` ('response' or 'total_count')."""
+    CACHE_REQUESTS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool recording how long each checkout waits for a free (or new) connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._wait = POOL_WAIT.labels('default')
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self._wait.observe(time.perf_counter() - start)
+
+    def recreate(self):
+        # Keep the bind label when the engine is disposed (e.g. before forking workers)
+        pool = super().recreate()
+        pool._wait = self._wait
+        return pool
+
+
+def _uses_queue_pool(uri):
+    """Return True if SQLAlchemy would give an engine for `uri` a QueuePool."""
+    url = make_url(uri)
+    if url.get_backend_name() == 'sqlite':
+        return url.database not in (None, '', ':memory:') and url.query.get('mode') != 'memory'
+    return True
+
+
+def configure_pool_metrics(app):
+    """
+    Give the default engine a TimedQueuePool, so that checkout waits are measured.
+
+    Must run before db.init_app(). Engines that would not use a QueuePool, or with a configured
+    pool class, are left untouched and, like the binds, only report connections in use.
+    """
+    config = app.config
+    options = config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+    if ('poolclass' not in options and 'creator' not in options
+            and _uses_queue_pool(config['SQLALCHEMY_DATABASE_URI'])):
+        config['SQLALCHEMY_ENGINE_OPTIONS'] = dict(options, poolclass=TimedQueuePool)
+
+
+def watch_pool(bind, engine):
+    """Track the connections in use of one (synchronous) engine, e.g. the sync_engine of an async one."""
+    if isinstance(engine.pool, TimedQueuePool):
+        engine.pool._wait = POOL_WAIT.labels(bind)
+    in_use = POOL_IN_USE.labels(bind)
+
+    @event.listens_for(engine, 'checkout')
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        in_use.inc()
+
+    @event.listens_for(engine, 'checkin')
+    def checkin(dbapi_connection, connection_record):
+        in_use.dec()
+
+
+def metrics_registry():
+    """
+    Registry rendered by /metrics.
+
+    With PROMETHEUS_MULTIPROC_DIR set, every worker process writes its samples to memory-mapped
+    files in that directory and the registry aggregates all of them, so any worker can answer
+    a scrape with totals for the whole server.
+    """
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def metrics_view():
+    """Render every metric in the Prometheus text exposition format."""
+    return Response(generate_latest(metrics_registry()), mimetype=CONTENT_TYPE_LATEST)
+
+
+def observe_request(method, route, status, content_length, elapsed):
+    """
+    Record one handled request.
+
+    Parameters:
+        method: HTTP method.
+        route: URL rule that matched, or 'unmatched'; /metrics scrapes are not recorded.
+        status: Response status code.
+        content_length: Body size in bytes, or None if unknown (streamed).
+        elapsed: Seconds spent handling the request.
+    """
+    if route == '/metrics':
+        return
+    LATENCY.labels(method, route).observe(elapsed)
+    REQUESTS.labels(method, route, str(status)).inc()
+    if content_length is not None:
+        RESPONSE_SIZE.labels(method, route).observe(content_length)
+
+
+def init_metrics(app):
+    """
+    Record request, database pool and cache metrics and serve them at /metrics.
+
+    Enabled by METRICS_ENABLED. configure_pool_metrics() must have run before db.init_app().
+    """
+    with app.app_context():
+        for bind, engine in db.engines.items():
+            watch_pool(bind or 'default', engine)
+
+    @app.before_request
+    def start_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        start = g.pop('metrics_start', None)
+        if start is None:
+            return response
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        observe_request(request.method, route, response.status_code, response.content_length,
+                        time.perf_counter() - start)
+        return response
+
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
@@ -0,0 +1,218 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from app import db
+from app.models.article import Article
+from app.models.author import AuthorStats
+
+
+def sort_keys(model, fields):
+    """
+    Resolve sort fields to table columns and append the primary key as a tiebreak.
+
+    Parameters:
+        model: Model class whose table columns are sorted on.
+        fields: Sequence of (field_name, descending) pairs.
+
+    Returns:
+        List of (column, descending) pairs ending with the primary key column.
+    """
+    columns = model.__table__.columns
+    keys = []
+    for name, descending in fields:
+        if name not in columns:
+            raise ValueError(f"Invalid sort field: {name}")
+        keys.append((columns[name], descending))
+        if name == 'id':
+            # Nothing can sort after a unique key, so later fields would never be compared
+            return keys
+
+    # The primary key follows the direction of the last sort key so that it only breaks ties
+    keys.append((columns['id'], keys[-1][1] if keys else False))
+    return keys
+
+
+def _leads_index(table, column):
+    """Return True if `column` is the primary key or the first column of an index of `table`."""
+    if column.primary_key:
+        return True
+    return any(index.expressions and index.expressions[0] is column for index in table.indexes)
+
+
+class SortableFields:
+    """
+    Registry of the fields clients may sort a model's lists by.
+
+    Every registered field must lead an index (ideally ending with the primary key, like
+    (pub_date, id)), so a sorted page is read in index order instead of sorting the whole
+    table. With several sort keys the index orders the first one and the database only sorts
+    rows that tie on it. Registering an unindexed column fails at import time.
+
+    Attributes:
+        model: Model class whose lists are sorted.
+        columns (dict): Public field name -> table column.
+        max_keys (int): Maximum number of sort keys in one request.
+    """
+
+    def __init__(self, model, names, max_keys=3):
+        table = model.__table__
+        self.model = model
+        self.columns = {}
+        for name in names:
+            column = table.c[name]
+            if not _leads_index(table, column):
+                raise ValueError(f"Sort field {name} is not backed by an index")
+            self.columns[name] = column
+        self.max_keys = max_keys
+
+    def parse(self, value):
+        """
+        Parse a sort specification such as '-pub_date,title' ('-' for descending order).
+
+        Returns:
+            List of (field_name, descending) pairs.
+        """
+        fields = []
+        for part in value.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            descending = part.startswith('-')
+            name = part.lstrip('+-')
+            if name in (field for field, _ in fields):
+                raise ValueError(f"Duplicate sort field: {name}")
+            fields.append((name, descending))
+        return fields
+
+    def keys(self, fields):
+        """
+        Validate sort fields and resolve them with sort_keys (which appends the id tiebreak).
+
+        Parameters:
+            fields: Sequence of (field_name, descending) pairs, e.g. from parse().
+        """
+        if not fields:
+            raise ValueError("At least one sort field is required")
+        if len(fields) > self.max_keys:
+            raise ValueError(f"At most {self.max_keys} sort fields are allowed")
+        for name, _ in fields:
+            if name not in self.columns:
+                raise ValueError(f"Invalid sort field: {name} (sortable fields: {', '.join(self.columns)})")
+        return sort_keys(self.model, fields)
+
+
+def order_by_clauses(keys):
+    """
+    Build ORDER BY clauses for the given sort keys.
+
+    NULLs are always ordered as the smallest value (first ascending, last descending),
+    which is what SQLite does by default and what keyset_filter expects.
+    """
+    clauses = []
+    for column, descending in keys:
+        if descending:
+            clause = column.desc().nulls_last() if column.nullable else column.desc()
+        else:
+            clause = column.asc().nulls_first() if column.nullable else column.asc()
+        clauses.append(clause)
+    return clauses
+
+
+def _after(column, descending, value):
+    """Condition selecting rows that sort strictly after `value` on a single column."""
+    if descending:
+        if value is None:
+            return None
+        condition = column < value
+        return db.or_(condition, column.is_(None)) if column.nullable else condition
+    if value is None:
+        return column.isnot(None)
+    return column > value
+
+
+def _equal(column, value):
+    """NULL-safe equality on a single column."""
+    return column.is_(None) if value is None else column == value
+
+
+def keyset_filter(keys, values):
+    """
+    Build the WHERE clause that selects rows following `values` in `keys` order.
+
+    Parameters:
+        keys: List of (column, descending) pairs as returned by sort_keys.
+        values: Values of the last row seen, one per key.
+
+    Returns:
+        SQL expression usable in Query.filter().
+    """
+    branches = []
+    for index, (column, descending) in enumerate(keys):
+        after = _after(column, descending, values[index])
+        if after is None:
+            continue
+        prefix = [_equal(keys[i][0], values[i]) for i in range(index)]
+        branches.append(db.and_(*prefix, after))
+    return db.or_(*branches) if branches else db.false()
+
+
+def _signature(keys):
+    """Short description of the sort order that a cursor belongs to."""
+    return ','.join(f"{'-' if descending else ''}{column.name}" for column, descending in keys)
+
+
+def encode_cursor(keys, row):
+    """
+    Encode the sort key values of `row` into an opaque cursor token.
+
+    Parameters:
+        keys: List of (column, descending) pairs as returned by sort_keys.
+        row: Last model instance of the current page.
+
+    Returns:
+        URL-safe cursor string.
+    """
+    values = []
+    for column, _ in keys:
+        value = getattr(row, column.key)
+        values.append(value.isoformat() if isinstance(value, datetime) else value)
+    payload = json.dumps({'s': _signature(keys), 'v': values}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(keys, token):
+    """
+    Decode a cursor token produced by encode_cursor for the same sort order.
+
+    Parameters:
+        keys: List of (column, descending) pairs as returned by sort_keys.
+        token: Cursor string received from the client.
+
+    Returns:
+        List of values, one per key, converted back to column types.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload['v']
+        if payload['s'] != _signature(keys) or len(values) != len(keys):
+            raise ValueError
+        return [
+            datetime.fromisoformat(value)
+            if value is not None and isinstance(column.type, db.DateTime) else value
+            for (column, _), value in zip(keys, values)
+        ]
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        raise ValueError("Invalid cursor for the requested sort order")
+
+
+# Fields article lists can be sorted by; each one leads an index declared on Article
+article_sort_fields = SortableFields(Article, [
+    'id', 'pub_date', 'created_at', 'updated_at', 'title', 'author', 'comment_count',
+])
+
+# Fields author lists can be sorted by ('author_key' sorts by name)
+author_sort_fields = SortableFields(AuthorStats, [
+    'author_key', 'article_count', 'last_published_at', 'comment_count',
+])
@@ -1,11 +1,47 @@
 from flask import request
 
-def parse_pagination_args():
-    """Parse pagination arguments from request."""
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
+def parse_pagination_args(args=None):
+    """Parse pagination arguments from request (or from the given query arguments)."""
+    args = request.args if args is None else args
+    page = args.get('page', 1, type=int)
+    per_page = args.get('per_page', 10, type=int)
     return page, per_page
 
+def parse_include_args(default_include, args=None):
+    """Parse whether (and how many) comments to embed in article responses."""
+    args = request.args if args is None else args
+    include = args.get('include')
+    include_comments = default_include if include is None else 'comments' in include.split(',')
+    comments_limit = args.get('comments_limit', type=int)
+    if comments_limit is not None:
+        if comments_limit < 0:
+            raise ValueError("comments_limit must not be negative")
+        include_comments = True
+    return include_comments, comments_limit
+
+def parse_sort_args(sortable, default_sort_by, default_sort_order, args=None):
+    """
+    Parse the sort order of a list as validated sort keys.
+
+    Accepts `sort` with several fields (e.g. sort=-pub_date,title) or the single-field
+    `sort_by` and `sort_order` arguments.
+    """
+    args = request.args if args is None else args
+    sort = args.get('sort')
+    if sort is not None:
+        fields = sortable.parse(sort)
+    else:
+        sort_order = args.get('sort_order', default_sort_order)
+        fields = [(args.get('sort_by', default_sort_by), sort_order.lower() == 'desc')]
+    return sortable.keys(fields)
+
+def parse_fields_args(args=None):
+    """Parse the sparse fieldset (fields=id,title) and named view (view=summary) of article lists."""
+    args = request.args if args is None else args
+    fields = args.get('fields')
+    fields = [name.strip() for name in fields.split(',') if name.strip()] if fields else None
+    return fields, args.get('view') or None
+
 def parse_article_args():
     """Parse arguments for creating a new article."""
     title = request.json.get('title', type=str)
@@ -0,0 +1,191 @@
+import threading
+import time
+import weakref
+from functools import wraps
+from flask import current_app, request
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from app import db
+from app.models.article import Article
+from app.models.comment import Comment
+from app.utils.deletions import deletion_marks
+from app.utils.session import READ_ENGINE_KEY
+
+# Bind key of the read replica in SQLALCHEMY_BINDS
+REPLICA_BIND = 'replica'
+
+# Cookie telling which clients must read from the primary, and until when (Unix time)
+PIN_COOKIE = 'read_primary_until'
+
+# Methods whose successful responses pin the client to the primary
+WRITE_METHODS = frozenset({'POST', 'PUT', 'PATCH', 'DELETE'})
+
+# Last health check per replica engine: (checked_at, usable)
+_checks = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+# Lag reported for a replica that misses writes made in the same instant as its latest one
+MIN_LAG = 0.001
+
+
+def read_watermark(connection):
+    """
+    Positions of a database that replication must reach, each read with one index lookup.
+
+    Returns:
+        Row (latest article update, highest comment id, creation time of that comment, deletion
+        generation, time of the latest delete).
+    """
+    comment = Comment.__table__
+    last_comment_id = db.select(db.func.max(comment.c.id)).scalar_subquery()
+    generation, deleted_at = deletion_marks()
+    return connection.execute(
+        db.select(
+            db.select(db.func.max(Article.updated_at)).scalar_subquery(),
+            last_comment_id,
+            db.select(comment.c.created_at).where(comment.c.id == last_comment_id).scalar_subquery(),
+            generation,
+            deleted_at,
+        )
+    ).first()
+
+
+def _trail(primary_time, replica_time):
+    """Seconds between the latest write of the primary and the latest one the replica has."""
+    if replica_time is None or primary_time is None:
+        return float('inf')
+    return max((primary_time - replica_time).total_seconds(), MIN_LAG)
+
+
+def replica_lag(replica, primary):
+    """
+    Estimate how many seconds the replica trails the primary.
+
+    The latest article update, the highest comment id and the deletion generation of both
+    databases are compared, so the lag is 0 when the replica has every write the primary has
+    (including deletes).
+
+    Returns:
+        Lag in seconds (float('inf') if the replica has none of the primary's rows).
+    """
+    with primary.connect() as connection:
+        primary_marks = read_watermark(connection)
+    with replica.connect() as connection:
+        replica_marks = read_watermark(connection)
+    return watermark_lag(primary_marks, replica_marks)
+
+
+def watermark_lag(primary_marks, replica_marks):
+    """Seconds between two read_watermark() rows of the primary and of the replica (see replica_lag)."""
+    updated_at, comment_id, commented_at, generation, deleted_at = primary_marks
+    replica_updated_at, replica_comment_id, replica_commented_at, replica_generation, replica_deleted_at = replica_marks
+
+    lag = 0.0
+    if updated_at is not None:
+        if replica_updated_at is None:
+            return float('inf')
+        lag = max(lag, (updated_at - replica_updated_at).total_seconds())
+    if comment_id is not None and (replica_comment_id is None or comment_id > replica_comment_id):
+        lag = max(lag, _trail(commented_at, replica_commented_at))
+    if generation > replica_generation:
+        lag = max(lag, _trail(deleted_at, replica_deleted_at))
+    return lag
+
+
+def replica_usable(replica):
+    """
+    Return True if reads may be sent to the replica.
+
+    The replica must answer and trail the primary by at most REPLICA_MAX_LAG seconds. The result
+    is cached for REPLICA_CHECK_INTERVAL seconds, also while the primary takes writes (clients
+    that wrote are pinned to the primary instead); replica errors force a new check.
+    """
+    config = current_app.config
+    usable = cached_replica_check(replica, config)
+    if usable is not None:
+        return usable
+
+    try:
+        usable = replica_lag(replica, db.engine) <= config.get('REPLICA_MAX_LAG', 0)
+    except SQLAlchemyError as e:
+        current_app.logger.warning("Read replica unavailable, reading from the primary: %s", e)
+        usable = False
+    record_replica_check(replica, usable)
+    return usable
+
+
+def cached_replica_check(replica, config):
+    """Result of the last check of `replica` if it is younger than REPLICA_CHECK_INTERVAL, else None."""
+    checked = _checks.get(replica)
+    if checked is not None and time.monotonic() - checked[0] < config.get('REPLICA_CHECK_INTERVAL', 5):
+        return checked[1]
+    return None
+
+
+def record_replica_check(replica, usable):
+    """Remember whether `replica` is usable, for REPLICA_CHECK_INTERVAL seconds."""
+    with _lock:
+        _checks[replica] = (time.monotonic(), usable)
+
+
+def reset_replica_checks():
+    """Forget the cached replica checks, so the next read checks the replica again."""
+    with _lock:
+        _checks.clear()
+
+
+def watch_replica(engine):
+    """Mark the replica as unusable as soon as one of its connections fails."""
+    @event.listens_for(engine, 'handle_error')
+    def mark_failed(context):
+        record_replica_check(engine, False)
+
+
+def pinned_to_primary(cookies=None):
+    """Return True if the client wrote recently and must read its own writes from the primary."""
+    cookies = request.cookies if cookies is None else cookies
+    try:
+        return float(cookies.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def read_replica(view):
+    """
+    Decorator sending the reads of a GET view to the read replica.
+
+    Falls back to the primary when no replica is configured, when it is unavailable or lagging,
+    and for clients pinned to the primary after a write.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        replica = db.engines.get(REPLICA_BIND)
+        if replica is not None and not pinned_to_primary() and replica_usable(replica):
+            request.environ[READ_ENGINE_KEY] = replica
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def pin_after_write(response):
+    """
+    after_request handler pinning a client to the primary after a successful write, so that its
+    next reads see its own changes even if the replica has not caught up yet.
+    """
+    return pin_client(request, response, current_app.config, REPLICA_BIND in db.engines)
+
+
+def pin_client(request, response, config, has_replica):
+    """
+    Set the pin cookie on the response to a successful write (Flask or Quart request and response).
+
+    Parameters:
+        request: Request being answered.
+        response: Its response.
+        config: Application configuration (READ_YOUR_WRITES_WINDOW).
+        has_replica: Whether the application reads from a replica; without one nothing is pinned.
+    """
+    window = config.get('READ_YOUR_WRITES_WINDOW', 5)
+    if request.method in WRITE_METHODS and response.status_code < 400 and window and has_replica:
+        response.set_cookie(PIN_COOKIE, str(time.time() + window), max_age=window, httponly=True)
+    return response
@@ -0,0 +1,246 @@
+import json
+import threading
+import weakref
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+from flask import current_app, request, make_response, Response
+from app.utils.cache import TTLCache
+from app.utils.metrics import record_cache
+
+# Response headers stored with each cached body, so cache hits keep their validators
+CACHED_HEADERS = ('ETag', 'Last-Modified')
+
+
+class LocalBackend:
+    """
+    In-process cache backend: an LRU with per-entry TTL and a bounded number of entries.
+
+    Generation counters are kept apart from the entries, in an LRU of at most max_generations
+    keys. Every bump hands out the next value of one counter shared by all keys, and keys
+    without a counter are at the highest generation evicted so far. Evicting a counter can
+    therefore only move a key to a newer generation (a cache miss), never make an older, still
+    cached generation valid again.
+    """
+
+    def __init__(self, maxsize, max_generations):
+        self.entries = TTLCache(maxsize=maxsize)
+        self.generations = OrderedDict()
+        self.max_generations = max_generations
+        self._last = 0  # Last generation handed out
+        self._floor = 0  # Generation of keys without a counter
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, value, ttl):
+        self.entries.set(key, value, ttl=ttl)
+
+    def generation(self, key):
+        return self.generations.get(key, self._floor)
+
+    def bump(self, keys):
+        with self._lock:
+            for key in keys:
+                self._last += 1
+                self.generations[key] = self._last
+                self.generations.move_to_end(key)
+            while len(self.generations) > self.max_generations:
+                _, generation = self.generations.popitem(last=False)
+                self._floor = max(self._floor, generation)
+
+    def clear(self):
+        self.entries.clear()
+        with self._lock:
+            self.generations.clear()
+            self._floor = self._last
+
+    def size(self):
+        return len(self.entries)
+
+
+class RedisBackend:
+    """
+    Shared cache backend for several worker processes, stored in Redis.
+
+    Generation counters expire `generation_ttl` seconds after their last bump, once every
+    response cached under an older generation has expired.
+
+    Requires the optional `redis` package; a local server can be started with
+    `docker run -p 6379:6379 redis`.
+    """
+
+    def __init__(self, url, generation_ttl, prefix='article_api:'):
+        import redis  # Optional dependency, only needed for this backend
+        self.client = redis.Redis.from_url(url)
+        self.generation_ttl = max(int(generation_ttl), 1)
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, value, ex=max(int(ttl), 1))
+
+    def generation(self, key):
+        return int(self.client.get(self.prefix + 'gen:' + key) or 0)
+
+    def bump(self, keys):
+        # One round trip for all keys, e.g. the articles of a bulk delete
+        pipeline = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.incr(self.prefix + 'gen:' + key)
+            pipeline.expire(self.prefix + 'gen:' + key, self.generation_ttl)
+        pipeline.execute()
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.prefix + '*'):
+            self.client.delete(key)
+
+    def size(self):
+        return sum(1 for _ in self.client.scan_iter(match=self.prefix + 'v:*'))
+
+
+def create_backend(config):
+    """Create the backend selected by RESPONSE_CACHE_BACKEND, or None if caching is disabled."""
+    kind = config.get('RESPONSE_CACHE_BACKEND', 'local')
+    if kind == 'local':
+        return LocalBackend(config.get('RESPONSE_CACHE_MAXSIZE', 1024),
+                            config.get('RESPONSE_CACHE_MAX_GENERATIONS', 16384))
+    if kind == 'redis':
+        # Responses cached under an older generation may be stored just after a bump
+        return RedisBackend(config['RESPONSE_CACHE_REDIS_URL'], 2 * config.get('RESPONSE_CACHE_TTL', 60))
+    return None
+
+
+class ResponseCache:
+    """
+    Cache of serialized JSON responses for article reads.
+
+    Entries are keyed by article id or by the normalized list-query parameters, plus a
+    generation number. Invalidating an article (or all lists) bumps its generation, so every
+    cached variant of it becomes unreachable at once and simply ages out of the backend.
+
+    Attributes:
+        hits (int): Number of responses served from the cache.
+        misses (int): Number of cacheable requests that had to be computed.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._backends = weakref.WeakSet()  # Backends of every application, for invalidation
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self):
+        """Backend of the current application, created on first use (None if disabled)."""
+        return self.backend_for(current_app)
+
+    def backend_for(self, app):
+        """Backend of `app` (Flask or Quart application), created on first use (None if disabled)."""
+        extensions = app.extensions
+        if 'response_cache' not in extensions:
+            with self._lock:
+                if 'response_cache' not in extensions:
+                    backend = create_backend(app.config)
+                    if backend is not None:
+                        self._backends.add(backend)
+                    extensions['response_cache'] = backend
+        return extensions['response_cache']
+
+    def key(self, backend, scope, ident, args):
+        """Cache key of a request within `scope` ('article' or 'list'), given its query arguments."""
+        generation_key = f'{scope}:{ident}' if ident is not None else scope
+        params = urlencode(sorted(args.items(multi=True)))
+        return f'v:{generation_key}:g{backend.generation(generation_key)}:{params}'
+
+    def lookup(self, backend, key):
+        """
+        Return the cached (headers, body) of `key`, or None on a miss; counts the lookup.
+
+        Headers are the CACHED_HEADERS of the cached response, as a dict.
+        """
+        entry = backend.get(key)
+        self._count(hit=entry is not None)
+        if entry is None:
+            return None
+        headers, body = entry.split(b'\n', 1)
+        return json.loads(headers), body
+
+    def store(self, backend, key, headers, body, ttl):
+        """Cache a successful response body with its CACHED_HEADERS for `ttl` seconds."""
+        headers = {name: headers[name] for name in CACHED_HEADERS if name in headers}
+        backend.set(key, json.dumps(headers).encode() + b'\n' + body, ttl)
+
+    def _count(self, hit):
+        record_cache('response', hit)
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def cached(self, scope, ident_arg=None):
+        """
+        Decorator caching successful JSON responses of a GET view.
+
+        Parameters:
+            scope: 'article' for single-article views or 'list' for list views.
+            ident_arg (optional): Name of the view argument identifying the article.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                backend = self.backend
+                if backend is None:
+                    return view(*args, **kwargs)
+
+                key = self.key(backend, scope, kwargs.get(ident_arg) if ident_arg else None, request.args)
+                entry = self.lookup(backend, key)
+                if entry is not None:
+                    headers, body = entry
+                    response = Response(body, status=200, mimetype='application/json', headers=headers)
+                    response.headers['X-Cache'] = 'HIT'
+                    # Answer conditional requests from the cached validators without touching the database
+                    return response.make_conditional(request)
+
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    self.store(backend, key, response.headers, response.get_data(),
+                               current_app.config.get('RESPONSE_CACHE_TTL', 60))
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
+
+    def clear(self):
+        """Remove every cached response."""
+        for backend in list(self._backends):
+            backend.clear()
+
+    def invalidate_articles(self, article_ids):
+        """Make every cached response of the given articles stale."""
+        # Commits may come from another application sharing the database (e.g. the async one);
+        # nothing is cached by an application before its backend has been created
+        keys = [f'article:{article_id}' for article_id in article_ids]
+        if keys:
+            for backend in list(self._backends):
+                backend.bump(keys)
+
+    def invalidate_lists(self):
+        """Make every cached list response stale."""
+        for backend in list(self._backends):
+            backend.bump(['list'])
+
+    def stats(self, app=None):
+        """Return the hit/miss counters and the number of entries cached by `app` (default: the current one)."""
+        backend = self.backend if app is None else self.backend_for(app)
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "entries": backend.size() if backend is not None else 0,
+        }
@@ -0,0 +1,231 @@
+import html
+import weakref
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from app import db
+from app.models.article import Article
+
+# Name of the SQLite FTS5 virtual table indexing article titles and content
+FTS_TABLE = 'article_fts'
+
+# Markers wrapped around matched terms in highlighted titles and content snippets
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_END = '</mark>'
+
+# Control characters marking matched terms in the output of highlight() and snippet(); the text
+# is HTML-escaped before they are replaced by HIGHLIGHT_START and HIGHLIGHT_END
+_MATCH_START = '\x02'
+_MATCH_END = '\x03'
+
+# Column weights used by bm25(): a title match counts more than a content match
+TITLE_WEIGHT = 10.0
+CONTENT_WEIGHT = 1.0
+
+# External-content FTS5 table plus the triggers that keep it in sync with the article table
+_CREATE_STATEMENTS = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, content, content='article', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON article BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON article BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, content ON article BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+]
+
+# Whether each engine has a usable full-text index, so the check runs once per engine
+_fts_engines = weakref.WeakKeyDictionary()
+
+_fts = db.table(FTS_TABLE, db.column('rowid'), db.column('title'), db.column('content'))
+_fts_ref = db.literal_column(FTS_TABLE)
+
+
+def _create_index(connection):
+    """Create the FTS5 table and triggers, returning False when FTS5 is unavailable."""
+    if connection.dialect.name != 'sqlite':
+        return False
+    try:
+        with connection.begin_nested():
+            for statement in _CREATE_STATEMENTS:
+                connection.exec_driver_sql(statement)
+    except OperationalError:
+        # SQLite was compiled without the FTS5 extension
+        return False
+    return True
+
+
+@event.listens_for(Article.__table__, 'after_create')
+def create_search_index(target, connection, **kw):
+    """Create the full-text index together with the article table."""
+    _fts_engines[connection.engine] = _create_index(connection)
+
+
+@event.listens_for(Article.__table__, 'before_drop')
+def drop_search_index(target, connection, **kw):
+    """Drop the full-text index before the article table it mirrors."""
+    if connection.dialect.name == 'sqlite':
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    _fts_engines.pop(connection.engine, None)
+
+
+def ensure_search_index(connection):
+    """
+    Create and populate the full-text index for a database whose article table already exists.
+
+    Parameters:
+        connection: SQLAlchemy connection inside a transaction.
+
+    Returns:
+        True if the full-text index is available after the call.
+    """
+    existed = _table_exists(connection)
+    available = existed or _create_index(connection)
+    if available and not existed:
+        connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    _fts_engines[connection.engine] = available
+    return available
+
+
+def _table_exists(connection):
+    if connection.dialect.name != 'sqlite':
+        return False
+    return connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).first() is not None
+
+
+def index_available(connection):
+    """Return True if the database behind `connection` has the full-text index (checked once per engine)."""
+    engine = connection.engine
+    if engine not in _fts_engines:
+        _fts_engines[engine] = _table_exists(connection)
+    return _fts_engines[engine]
+
+
+def search_index_usable(connection, config):
+    """
+    Return True if keyword searches on `connection` can use the full-text index.
+
+    Parameters:
+        connection: Connection the search runs on, e.g. session.connection().
+        config: Application configuration; SEARCH_BACKEND='like' turns the index off.
+    """
+    if config.get('SEARCH_BACKEND', 'auto') == 'like':
+        return False
+    return index_available(connection)
+
+
+def normalize_keyword(keyword):
+    """
+    Return the canonical form of a keyword search: lower case, with runs of whitespace collapsed.
+
+    Both kinds of search ignore case and split terms on whitespace, so searches differing only
+    in case or spacing match the same articles (and share a cached total).
+    """
+    if keyword is None:
+        return None
+    return ' '.join(keyword.split()).lower()
+
+
+def match_expression(keyword):
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+
+    Every whitespace-separated term is quoted (so FTS5 operators in user input are treated as
+    text) and used as a prefix, and all terms must match.
+    """
+    terms = ['"{}"*'.format(term.replace('"', '""')) for term in keyword.split()]
+    if not terms:
+        raise ValueError("Search keyword cannot be blank")
+    return ' '.join(terms)
+
+
+def keyword_condition(keyword, use_index):
+    """
+    Build the filter condition for a keyword search on article titles and content.
+
+    Uses the full-text index when available and falls back to case-insensitive substring
+    matching otherwise.
+
+    Parameters:
+        keyword: Free-text search terms.
+        use_index: Whether to use the full-text index, from search_index_usable() on the
+            connection the search runs on.
+    """
+    if use_index:
+        matches = db.select(_fts.c.rowid).where(_fts_ref.op('MATCH')(match_expression(keyword)))
+        return Article.id.in_(matches)
+    return db.or_(
+        Article.title.ilike(f'%{keyword}%'),
+        Article.content.ilike(f'%{keyword}%')
+    )
+
+
+def ranked_search_query(keyword, page, per_page, use_index):
+    """
+    Build the statement of a relevance-ranked keyword search.
+
+    Selects (article, rank, title_highlight, content_snippet) rows, best match first; pass the
+    highlights through render_highlight(). Without a full-text index the rank is NULL, the title
+    and content are returned without highlights and results are ordered by publication date.
+    """
+    offset = (page - 1) * per_page
+    if not use_index:
+        return (db.select(Article, db.null().label('rank'), Article.title, Article.content)
+                .where(keyword_condition(keyword, use_index=False))
+                .order_by(Article.pub_date.desc(), Article.id.desc())
+                .limit(per_page)
+                .offset(offset))
+
+    rank = db.func.bm25(_fts_ref, TITLE_WEIGHT, CONTENT_WEIGHT)
+    return (
+        db.select(
+            Article,
+            rank.label('rank'),
+            db.func.highlight(_fts_ref, 0, _MATCH_START, _MATCH_END),
+            db.func.snippet(_fts_ref, 1, _MATCH_START, _MATCH_END, '…', 16),
+        )
+        .join(_fts, _fts.c.rowid == Article.id)
+        .where(_fts_ref.op('MATCH')(match_expression(keyword)))
+        .order_by(rank, Article.id)
+        .limit(per_page)
+        .offset(offset)
+    )
+
+
+def render_highlight(text):
+    """
+    Return a highlighted title or snippet of ranked_search_query() as safe HTML.
+
+    The article text is escaped, so markup in titles and content is returned as text, and only
+    the matched terms are wrapped in HIGHLIGHT_START and HIGHLIGHT_END.
+    """
+    if text is None:
+        return None
+    return (html.escape(text)
+            .replace(_MATCH_START, HIGHLIGHT_START)
+            .replace(_MATCH_END, HIGHLIGHT_END))
+
+
+def ranked_search(session, config, keyword, page, per_page):
+    """
+    Run a relevance-ranked keyword search.
+
+    Parameters:
+        session: Session to query.
+        config: Application configuration (SEARCH_BACKEND).
+        keyword: Free-text search terms.
+        page: Page number, starting at 1.
+        per_page: Number of results per page.
+
+    Returns:
+        List of (article, rank, title_highlight, content_snippet) tuples, best match first.
+        Without a full-text index the rank is None and results are ordered by publication date.
+    """
+    use_index = search_index_usable(session.connection(), config)
+    return session.execute(ranked_search_query(keyword, page, per_page, use_index)).all()
@@ -0,0 +1,45 @@
+from flask import has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import orm
+
+# WSGI environ key holding the engine selected for the reads of the current request
+READ_ENGINE_KEY = 'article_api.read_engine'
+
+
+def _is_write(clause):
+    """Return True for INSERT, UPDATE and DELETE statements."""
+    return clause is not None and getattr(clause, 'is_dml', False)
+
+
+class RoutingSession(Session):
+    """
+    Session sending the reads of selected requests to a read replica.
+
+    Views decorated with app.utils.replica.read_replica store the replica engine in the request
+    environ; SELECT statements of that request then run on it. Flushes and DML statements always
+    go to the primary, as does everything outside such requests.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not _is_write(clause) and has_request_context():
+            engine = request.environ.get(READ_ENGINE_KEY)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class ReadRoutingSession(orm.Session):
+    """
+    Session sending its reads to the engine stored in `info[READ_ENGINE_KEY]`, if any.
+
+    The async application's counterpart of RoutingSession: its AsyncSessions wrap this class, and
+    async_db.session() stores the replica engine selected by app.aio.bindings.read_replica in
+    their info. Flushes and DML statements always go to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not _is_write(clause):
+            engine = self.info.get(READ_ENGINE_KEY)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
@@ -0,0 +1,62 @@
+import re
+from app import db
+from app.models.article import Article, normalize_author
+
+# Entity tags of article responses start with the article version: "v<version>" or "v<version>.<digest>"
+VERSION_TAG = re.compile(r'^v(\d+)(?:\.|$)')
+
+
+def version_etag(version, digest=None):
+    """Build the entity tag of an article from its version and an optional representation digest."""
+    return f'v{version}.{digest}' if digest else f'v{version}'
+
+
+def if_match_versions(if_match):
+    """
+    Read the article versions a client is willing to overwrite from its If-Match header.
+
+    Parameters:
+        if_match: werkzeug ETags object (request.if_match).
+
+    Returns:
+        None if the header is absent or "*" (no precondition on the version), otherwise the set of
+        versions named by the tags; tags that do not carry a version match nothing, so the
+        request fails its precondition.
+    """
+    if not if_match or if_match.star_tag:
+        return None
+    versions = set()
+    for tag in if_match.as_set(include_weak=True):
+        match = VERSION_TAG.match(tag)
+        if match:
+            versions.add(int(match.group(1)))
+    return versions
+
+
+def article_update_statement(article_id, values, versions=None, returning=()):
+    """
+    Statement updating an article's fields in place and incrementing its version.
+
+    The version check and the write are one conditional UPDATE, so a concurrent edit that got
+    there first makes the statement match no row instead of being overwritten. updated_at is
+    set by the column's onupdate default, and author_key follows a new author.
+
+    Parameters:
+        article_id: ID of the article to update.
+        values (dict): Column values to write; only these columns are updated.
+        versions (optional): Only update the article if its current version is one of these.
+        returning (optional): Columns returned for the updated row.
+
+    Returns:
+        The UPDATE ... RETURNING statement; it returns no row if the article does not exist or
+        its version did not match.
+    """
+    article = Article.__table__
+    if 'author' in values:
+        values = {**values, 'author_key': normalize_author(values['author'])}
+    statement = (db.update(article)
+                 .where(article.c.id == article_id)
+                 .values(**values, version=article.c.version + 1))
+    if versions is not None:
+        statement = statement.where(article.c.version.in_(versions))
+    return statement.returning(*returning)
@@ -0,0 +1,6 @@
+from app.aio import create_async_app
+
+# Async (ASGI) variant of the API for the environment selected by APP_ENV; serve it with an
+# ASGI server, e.g. `hypercorn -w 2 asgi:app`. Run `python main.py` once first to create the
+# database tables and apply the migrations.
+app = create_async_app()
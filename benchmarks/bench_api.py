@@ -0,0 +1,308 @@
+"""
+Latency and throughput benchmark of every API endpoint, with regression checks between commits.
+
+Seeds a database with generated articles (skewed authors) and comments through the bulk
+endpoints, then times each scenario (list pages with filters, sorting, deep offsets and
+cursors, single reads, search, creates, bulk inserts and deletes) and reports p50/p95/p99
+latency and throughput. Results can be saved as JSON and compared with an earlier run.
+
+By default the application runs in-process on a throwaway SQLite file with the production
+settings; pass --url to benchmark a live server instead (it must use a throwaway database,
+since the benchmark inserts and deletes data). Read requests carry a unique dummy parameter so
+they miss the response cache; pass --cache to measure cached reads instead.
+
+Usage:
+    python -m benchmarks.bench_api [--articles 1000] [--comments 5] [--requests 200] [--concurrency 1]
+        [--url http://127.0.0.1:5000] [--scenarios list_first_page,get_article]
+        [--output results.json] [--compare baseline.json] [--threshold 0.2]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from benchmarks.data import DataGenerator, WORDS, author_name, seed_through_api
+from benchmarks.load import ClientTarget, HTTPTarget, run_requests
+
+# Metrics checked by --compare: (name, True if higher is better). p99 is reported but not
+# compared, since with a few hundred requests it is too close to the single slowest one.
+COMPARED_METRICS = [('p50_ms', False), ('p95_ms', False), ('throughput', True)]
+
+
+class Context:
+    """State shared by the scenarios: the target, the seeded article ids and a random source."""
+
+    def __init__(self, target, generator, article_ids, cache, seed=7):
+        self.target = target
+        self.generator = generator
+        self.article_ids = article_ids
+        self.cache = cache
+        self.rng = random.Random(seed)
+        self._sequence = 0
+
+    def read(self, path):
+        """GET request, made unique unless cached reads are measured."""
+        if not self.cache:
+            self._sequence += 1
+            path += ('&' if '?' in path else '?') + f'_bench={self._sequence}'
+        return ('GET', path, None)
+
+    def article_id(self):
+        return self.rng.choice(self.article_ids)
+
+    def deep_cursor(self, depth=0.8, per_page=100):
+        """Walk the default ordering with cursors and return the cursor at `depth` of the list."""
+        cursor, seen = '', 0
+        while seen < len(self.article_ids) * depth:
+            _, body = self.target.request('GET', f'/api/articles?per_page={per_page}&include_total=false&cursor={cursor}')
+            cursor = body.get('next_cursor')
+            seen += len(body['data'])
+            if not cursor:
+                return ''
+        return cursor
+
+
+def list_first_page(ctx, n):
+    return [ctx.read('/api/articles?per_page=20') for _ in range(n)]
+
+
+def list_summary(ctx, n):
+    return [ctx.read(f'/api/articles?per_page=20&view=summary&page={ctx.rng.randint(1, 5)}') for _ in range(n)]
+
+
+def latest_feed(ctx, n):
+    return [ctx.read('/api/articles/latest?per_page=20') for _ in range(n)]
+
+
+def list_deep_page(ctx, n):
+    pages = max(len(ctx.article_ids) // 20, 1)
+    return [ctx.read(f'/api/articles?per_page=20&page={ctx.rng.randint(max(pages * 9 // 10, 1), pages)}')
+            for _ in range(n)]
+
+
+def list_deep_cursor(ctx, n):
+    cursor = ctx.deep_cursor()
+    return [ctx.read(f'/api/articles?per_page=20&cursor={cursor}') for _ in range(n)]
+
+
+def list_sorted(ctx, n):
+    return [ctx.read(f"/api/articles?per_page=20&sort_by={ctx.rng.choice(['title', 'author', 'updated_at'])}"
+                     f"&sort_order=desc&page={ctx.rng.randint(1, 5)}")
+            for _ in range(n)]
+
+
+def list_most_discussed(ctx, n):
+    return [ctx.read(f'/api/articles?per_page=20&sort_by=comment_count&sort_order=desc&page={ctx.rng.randint(1, 5)}')
+            for _ in range(n)]
+
+
+def list_author_popular(ctx, n):
+    return [ctx.read(f'/api/articles?per_page=20&author={author_name(0)}') for _ in range(n)]
+
+
+def list_author_rare(ctx, n):
+    authors = ctx.generator.authors
+    return [ctx.read(f'/api/articles?per_page=20&author={author_name(ctx.rng.randint(authors // 2, authors - 1))}')
+            for _ in range(n)]
+
+
+def list_keyword(ctx, n):
+    return [ctx.read(f'/api/articles?per_page=20&keyword={ctx.rng.choice(WORDS)}') for _ in range(n)]
+
+
+def list_with_comments(ctx, n):
+    return [ctx.read(f'/api/articles?per_page=20&page={ctx.rng.randint(1, 5)}&include=comments&comments_limit=3')
+            for _ in range(n)]
+
+
+def search(ctx, n):
+    return [ctx.read(f'/api/articles/search?q={ctx.rng.choice(WORDS)}+{ctx.rng.choice(WORDS)}') for _ in range(n)]
+
+
+def get_article(ctx, n):
+    return [ctx.read(f'/api/article/{ctx.article_id()}') for _ in range(n)]
+
+
+def get_comments(ctx, n):
+    return [ctx.read(f'/api/articles/{ctx.article_id()}/comments?per_page=20') for _ in range(n)]
+
+
+def create_article(ctx, n):
+    return [('POST', '/api/articles', ctx.generator.article()) for _ in range(n)]
+
+
+def create_comment(ctx, n):
+    return [('POST', f'/api/articles/{ctx.article_id()}/comments', ctx.generator.comment()) for _ in range(n)]
+
+
+def bulk_articles(ctx, n):
+    return [('POST', '/api/articles/bulk', [ctx.generator.article() for _ in range(100)])
+            for _ in range(max(n // 10, 1))]
+
+
+def delete_article(ctx, n):
+    # Delete freshly created articles, so the seeded data stays intact for other scenarios
+    _, body = ctx.target.request('POST', '/api/articles/bulk', [ctx.generator.article() for _ in range(n)])
+    return [('DELETE', f'/api/articles/{article_id}', None) for article_id in body['ids']]
+
+
+# Scenarios in run order (reads before writes): name -> (request builder, expected statuses)
+SCENARIOS = {
+    'list_first_page': (list_first_page, (200,)),
+    'list_summary': (list_summary, (200,)),
+    'latest_feed': (latest_feed, (200,)),
+    'list_deep_page': (list_deep_page, (200,)),
+    'list_deep_cursor': (list_deep_cursor, (200,)),
+    'list_sorted': (list_sorted, (200,)),
+    'list_most_discussed': (list_most_discussed, (200,)),
+    'list_author_popular': (list_author_popular, (200,)),
+    'list_author_rare': (list_author_rare, (200,)),
+    'list_keyword': (list_keyword, (200,)),
+    'list_with_comments': (list_with_comments, (200,)),
+    'search': (search, (200,)),
+    'get_article': (get_article, (200,)),
+    'get_comments': (get_comments, (200,)),
+    'create_article': (create_article, (201,)),
+    'create_comment': (create_comment, (201,)),
+    'bulk_articles': (bulk_articles, (201,)),
+    'delete_article': (delete_article, (200,)),
+}
+
+
+def in_process_target(directory):
+    """Flask application with the production settings on a throwaway SQLite file."""
+    from app import create_app, db
+    from app.migrations import upgrade
+    from config import ProductionConfig
+
+    class BenchmarkConfig(ProductionConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(directory, 'benchmark.db')}"
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        upgrade(db.engine)
+    return ClientTarget(app)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(target, args):
+    """Seed the target and run the selected scenarios; return the results document."""
+    generator = DataGenerator(args.articles, args.comments, args.authors, args.skew, seed=args.seed)
+    article_ids = seed_through_api(target, generator)
+    ctx = Context(target, generator, article_ids, args.cache, seed=args.seed)
+
+    selected = args.scenarios.split(',') if args.scenarios else list(SCENARIOS)
+    results = {}
+    for name in selected:
+        build, expected = SCENARIOS[name]
+        requests = build(ctx, args.requests)
+        if all(method == 'GET' for method, _, _ in requests):
+            # Warm up connections and database pages; writes are not replayed (deletes would fail)
+            run_requests(target, requests[:max(len(requests) // 10, 1)], args.concurrency, expected)
+        results[name] = run_requests(target, requests, args.concurrency, expected)
+        print_result(name, results[name])
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'target': args.url or 'in-process',
+            'articles': args.articles,
+            'comments': args.comments,
+            'authors': args.authors,
+            'skew': args.skew,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'cache': args.cache,
+        },
+        'results': results,
+    }
+
+
+def print_result(name, result):
+    print(f"  {name:22} {result['throughput']:8.0f} req/s   p50 {result['p50_ms']:7.2f} ms   "
+          f"p95 {result['p95_ms']:7.2f} ms   p99 {result['p99_ms']:7.2f} ms   errors {result['errors']}")
+
+
+def compare(baseline, current, threshold):
+    """
+    Compare two results documents.
+
+    Returns:
+        List of (scenario, metric, baseline value, current value) for every metric that got
+        worse by more than `threshold` (a fraction, e.g. 0.2 for 20%), plus scenarios that had
+        no errors in the baseline but have errors now.
+    """
+    regressions = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS:
+            old, new = base[metric], result[metric]
+            if higher_is_better and new < old * (1 - threshold):
+                regressions.append((name, metric, old, new))
+            elif not higher_is_better and new > old * (1 + threshold):
+                regressions.append((name, metric, old, new))
+        if result['errors'] and not base['errors']:
+            regressions.append((name, 'errors', base['errors'], result['errors']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=1000, help='Number of seeded articles')
+    parser.add_argument('--comments', type=int, default=5, help='Comments per seeded article')
+    parser.add_argument('--authors', type=int, default=50, help='Number of distinct authors')
+    parser.add_argument('--skew', type=float, default=1.1, help='Zipf exponent of the author distribution')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed of the data and requests')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=1, help='Requests in flight')
+    parser.add_argument('--scenarios', help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument('--url', help='Base URL of a live server (default: in-process test client)')
+    parser.add_argument('--cache', action='store_true', help='Let repeated reads hit the response cache')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    parser.add_argument('--compare', help='Baseline results JSON file to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed relative regression (default 0.2)')
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios.split(',')) - set(SCENARIOS) if args.scenarios else set()
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    print(f"{args.articles} articles, {args.comments} comments each, {args.requests} requests per scenario, "
+          f"concurrency {args.concurrency}, target {args.url or 'in-process'}")
+    with tempfile.TemporaryDirectory() as directory:
+        target = HTTPTarget(args.url) if args.url else in_process_target(directory)
+        document = run_benchmarks(target, args)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(document, file, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(baseline, document, args.threshold)
+        print(f"Compared with {args.compare} (commit {baseline['meta'].get('commit')}), threshold {args.threshold:.0%}")
+        for name, metric, old, new in regressions:
+            print(f"  REGRESSION {name} {metric}: {old:.2f} -> {new:.2f}")
+        if regressions:
+            sys.exit(1)
+        print("  No regressions")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Load benchmark comparing the sync Flask application (main.py) with the async ASGI variant (asgi.py).
+
+Both applications are started as separate server processes on the same seeded SQLite database,
+with the production configuration: the Flask app on Werkzeug's threaded server, the async app on
+Hypercorn. A pool of client threads then keeps `--concurrency` requests in flight against each
+server and reports throughput and latency percentiles. Both applications share the request
+handling of app.api.handlers and answer repeated reads from the response cache, so the
+comparison measures the server and database access model rather than different features.
+
+Usage:
+    python -m benchmarks.bench_async [--articles 2000] [--comments 5] [--requests 2000] [--concurrency 64]
+"""
+import argparse
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.data import DataGenerator, seed_through_api
+from benchmarks.load import ClientTarget, HTTPTarget, run_requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Endpoints requested in turn by the load generator
+PATHS = [
+    '/api/articles?per_page=20',
+    '/api/articles?per_page=20&page={page}&sort_by=title',
+    '/api/articles?author=Author {author}&include=comments',
+    '/api/article/{article_id}',
+    '/api/articles/{article_id}/comments',
+]
+
+SERVERS = {
+    'sync (main.py, werkzeug threaded)': [
+        sys.executable, '-c',
+        "from werkzeug.serving import run_simple; from main import app; "
+        "run_simple('127.0.0.1', {port}, app, threaded=True)",
+    ],
+    'async (asgi.py, hypercorn)': [
+        sys.executable, '-m', 'hypercorn', 'asgi:app', '--bind', '127.0.0.1:{port}',
+    ],
+}
+
+
+def seed(path, articles, comments):
+    """Create the schema and insert `articles` generated articles with `comments` comments each."""
+    from app import create_app, db
+    from app.migrations import upgrade
+    from config import ProductionConfig
+
+    class BenchmarkConfig(ProductionConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        upgrade(db.engine)
+    seed_through_api(ClientTarget(app), DataGenerator(articles, comments))
+    with app.app_context():
+        db.engine.dispose()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(command, port, env):
+    """Start a server process and wait until it accepts connections."""
+    command = [part.format(port=port) for part in command]
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"Server did not start: {' '.join(command)}")
+
+
+def load_requests(requests, articles, authors=50):
+    """Build the GET requests sent by the load generator."""
+    rng = random.Random(42)
+    return [('GET', rng.choice(PATHS).format(page=rng.randint(1, max(articles // 20, 1)), author=rng.randint(0, authors - 1),
+                                             article_id=rng.randint(1, articles)), None)
+            for _ in range(requests)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=2000)
+    parser.add_argument('--comments', type=int, default=5)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.db')
+        seed(path, args.articles, args.comments)
+        env = dict(os.environ, APP_ENV='production', DATABASE_URL=f'sqlite:///{path}')
+
+        print(f"{args.articles} articles, {args.comments} comments each, "
+              f"{args.requests} requests, concurrency {args.concurrency}")
+        for name, command in SERVERS.items():
+            port = free_port()
+            process = start_server(command, port, env)
+            target = HTTPTarget(f'http://127.0.0.1:{port}')
+            try:
+                run_requests(target, load_requests(min(args.requests, 200), args.articles), args.concurrency)  # Warm-up
+                result = run_requests(target, load_requests(args.requests, args.articles), args.concurrency)
+            finally:
+                process.terminate()
+                process.wait()
+            print(f"  {name:36} {result['throughput']:8.0f} req/s   p50 {result['p50_ms']:7.1f} ms   "
+                  f"p95 {result['p95_ms']:7.1f} ms   p99 {result['p99_ms']:7.1f} ms   errors {result['errors']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark the CPU cost and bytes saved by compressing realistic article payloads.
+
+Builds JSON bodies shaped like the API responses (list pages with and without comments, the
+summary view and a single article with many comments) and compresses each one with every
+installed coding (gzip, plus brotli and zstd when installed) at several levels. Reports the
+compressed size, the ratio, the time per response and the throughput, so that
+COMPRESSION_LEVELS and COMPRESSION_MIN_SIZE can be chosen from measurements.
+
+Text is built from random syllables rather than a small vocabulary, so that ratios are close
+to those of real prose instead of flattering repetitive data.
+
+Usage:
+    python -m benchmarks.bench_compression [--repeat 20] [--output results.json]
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from app.utils.compression import ENCODINGS
+from app.utils.serializer import dumps, EXCERPT_LENGTH
+
+# Levels measured per coding: fastest, the default of COMPRESSION_LEVELS and higher ones
+LEVELS = {'gzip': (1, 4, 6, 9), 'br': (1, 4, 11), 'zstd': (1, 3, 10)}
+
+SYLLABLES = ['ka', 'lo', 'mi', 'ne', 'ru', 'sa', 'ti', 'vo', 'an', 'er', 'in', 'on', 'ul', 'st',
+             'pre', 'con', 'tion', 'ment', 'ing', 'ed', 'ly', 'pro', 'de', 're', 'ex', 'com']
+
+
+class PayloadBuilder:
+    """Deterministic builder of API-shaped response bodies."""
+
+    def __init__(self, seed=42):
+        self.rng = random.Random(seed)
+        self.vocabulary = [''.join(self.rng.choices(SYLLABLES, k=self.rng.randint(1, 4))) for _ in range(3000)]
+        self.now = datetime(2024, 1, 1, 12, 0, 0, 123456)
+
+    def text(self, words):
+        sentences, remaining = [], words
+        while remaining > 0:
+            length = min(self.rng.randint(6, 18), remaining)
+            sentences.append(' '.join(self.rng.choices(self.vocabulary, k=length)).capitalize() + '.')
+            remaining -= length
+        return ' '.join(sentences)
+
+    def comment(self, i):
+        return {'id': i, 'author': f'Reader {self.rng.randrange(1000)}', 'content': self.text(self.rng.randint(10, 60)),
+                'created_at': (self.now + timedelta(minutes=i)).isoformat()}
+
+    def article(self, i, comments=0, words=600):
+        stamp = (self.now + timedelta(hours=i)).isoformat()
+        item = {'id': i, 'title': self.text(8), 'content': self.text(words), 'author': f'Author {i % 50}',
+                'is_published': True, 'pub_date': stamp, 'created_at': stamp, 'updated_at': stamp,
+                'comment_count': comments}
+        if comments:
+            item['comments'] = [self.comment(i * 1000 + j) for j in range(comments)]
+        return item
+
+    def summary(self, i):
+        article = self.article(i)
+        fields = ('id', 'title', 'author', 'pub_date', 'comment_count')
+        return {**{key: article[key] for key in fields}, 'excerpt': article['content'][:EXCERPT_LENGTH]}
+
+    def payloads(self):
+        """Named response bodies, from a few KB to several hundred KB."""
+        message = {'message': 'Data retrieved successfully'}
+        return {
+            'list page (10)': dumps({'data': [self.article(i) for i in range(10)], 'total_article': 1000, **message}),
+            'list page (100)': dumps({'data': [self.article(i) for i in range(100)], 'total_article': 1000, **message}),
+            'summary page (20)': dumps({'data': [self.summary(i) for i in range(20)], **message}),
+            'list + comments (20x10)': dumps({'data': [self.article(i, comments=10) for i in range(20)], **message}),
+            'article + 500 comments': dumps({'data': self.article(1, comments=500), **message}),
+        }
+
+
+def best_of(repeat, func):
+    """Return the fastest wall-clock time of `repeat` runs of `func`."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(repeat):
+    """Compress every payload with every installed coding and level; return the result rows."""
+    results = []
+    for name, body in PayloadBuilder().payloads().items():
+        print(f"{name}: {len(body) / 1024:.1f} KiB")
+        for encoding, (compress, _) in ENCODINGS.items():
+            for level in LEVELS[encoding]:
+                size = len(compress(body, level))
+                seconds = best_of(repeat, lambda: compress(body, level))
+                row = {
+                    'payload': name,
+                    'bytes': len(body),
+                    'encoding': encoding,
+                    'level': level,
+                    'compressed_bytes': size,
+                    'ratio': round(len(body) / size, 2),
+                    'saved_pct': round(100 * (1 - size / len(body)), 1),
+                    'ms': round(seconds * 1000, 3),
+                    'mb_per_s': round(len(body) / seconds / 1e6, 1),
+                }
+                results.append(row)
+                print(f"  {encoding:5} level {level:2}  {size / 1024:8.1f} KiB  ratio {row['ratio']:5.2f}  "
+                      f"saved {row['saved_pct']:5.1f}%  {row['ms']:8.3f} ms  {row['mb_per_s']:7.1f} MB/s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20, help='runs per measurement (best is reported)')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    args = parser.parse_args()
+
+    missing = [encoding for encoding in ('br', 'zstd') if encoding not in ENCODINGS]
+    if missing:
+        print(f"Not installed (skipped): {', '.join(missing)}")
+    results = run(args.repeat)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark the per-row cost of serializing articles for list responses.
+
+Compares the marshmallow path (ArticleSchema.dump + Flask's JSON encoder, as used by jsonify)
+with the precompiled column-tuple serializer and the fast JSON encoder. Rows are built in memory,
+so only serialization and encoding are measured, not database access.
+
+Usage:
+    python -m benchmarks.bench_serialization [--rows 1000] [--comments 3] [--repeat 5]
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from app import create_app
+from app.models.article import Article
+from app.models.comment import Comment
+from app.schemas.article_schema import ArticleSchema
+from app.utils import serializer
+from app.utils.serializer import article_serializer, comment_serializer
+
+
+def build_rows(rows, comments):
+    """Build equivalent ORM objects and column tuples for `rows` articles."""
+    now = datetime(2024, 1, 1, 12, 0, 0, 123456)
+    articles, article_tuples, comment_tuples = [], [], {}
+    for i in range(rows):
+        values = (i, f'Title {i}', 'Lorem ipsum dolor sit amet. ' * 40, f'Author {i % 50}', True,
+                  now, now, now + timedelta(minutes=i))
+        article = Article(**{column.key: value for column, value in zip(article_serializer.columns, values)})
+        article.comments = [
+            Comment(id=i * comments + j, author=f'Commenter {j}', content='Great article! ' * 5, created_at=now)
+            for j in range(comments)
+        ]
+        articles.append(article)
+        article_tuples.append(values)
+        comment_tuples[i] = [(c.id, c.author, c.content, c.created_at) for c in article.comments]
+    return articles, article_tuples, comment_tuples
+
+
+def best_of(repeat, func):
+    """Return the fastest wall-clock time of `repeat` runs of `func`."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000, help='articles per run')
+    parser.add_argument('--comments', type=int, default=3, help='comments embedded per article')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per measurement (best is reported)')
+    args = parser.parse_args()
+    app = create_app('testing')
+
+    articles, article_tuples, comment_tuples = build_rows(args.rows, args.comments)
+    schema_with_comments = ArticleSchema()
+    schema_without_comments = ArticleSchema(exclude=('comments',))
+
+    def fast(include_comments):
+        result = article_serializer.to_dicts(article_tuples)
+        if include_comments:
+            for item in result:
+                item['comments'] = comment_serializer.to_dicts(comment_tuples[item['id']])
+        return serializer.dumps({'data': result})
+
+    cases = [
+        ('marshmallow, no comments', lambda: app.json.dumps({'data': schema_without_comments.dump(articles, many=True)})),
+        ('fast, no comments', lambda: fast(False)),
+        ('marshmallow, with comments', lambda: app.json.dumps({'data': schema_with_comments.dump(articles, many=True)})),
+        ('fast, with comments', lambda: fast(True)),
+    ]
+
+    encoder = 'orjson' if serializer.orjson is not None else 'stdlib json'
+    print(f"{args.rows} rows, {args.comments} comments per article, fast encoder: {encoder}")
+    with app.app_context():
+        baseline = {}
+        for name, func in cases:
+            per_row = best_of(args.repeat, func) / args.rows * 1e6
+            kind = name.split(', ')[1]
+            baseline.setdefault(kind, per_row)
+            speedup = baseline[kind] / per_row
+            print(f"  {name:<28} {per_row:8.2f} us/row  ({speedup:4.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Synthetic data for the benchmarks: articles with a skewed author distribution and comments.
+
+A few authors write most articles (Zipf-like weights 1 / rank ** skew), like real publications,
+so author filters cover both very large and very small result sets.
+"""
+import random
+
+# Words used to build titles and content; keyword benchmarks search for them
+WORDS = [
+    'python', 'flask', 'database', 'index', 'cache', 'query', 'latency', 'server', 'async',
+    'release', 'security', 'testing', 'cloud', 'storage', 'network', 'design', 'review', 'data',
+]
+
+
+def author_name(rank):
+    """Name of the author with the given popularity rank (0 is the most prolific)."""
+    return f'Author {rank}'
+
+
+def author_weights(authors, skew):
+    """Relative number of articles written by each author rank."""
+    return [1 / (rank + 1) ** skew for rank in range(authors)]
+
+
+class DataGenerator:
+    """
+    Deterministic generator of article and comment payloads, as accepted by the bulk endpoints.
+
+    Attributes:
+        articles (int): Number of articles to generate.
+        comments (int): Number of comments per article.
+        authors (int): Number of distinct authors.
+        skew (float): Zipf exponent of the author distribution (0 spreads articles evenly).
+    """
+
+    def __init__(self, articles=1000, comments=5, authors=50, skew=1.1, seed=42):
+        self.articles = articles
+        self.comments = comments
+        self.authors = authors
+        self.skew = skew
+        self.rng = random.Random(seed)
+        self._weights = author_weights(authors, skew)
+
+    def author(self):
+        """Pick an author following the skewed distribution."""
+        return author_name(self.rng.choices(range(self.authors), weights=self._weights)[0])
+
+    def text(self, words):
+        return ' '.join(self.rng.choice(WORDS) for _ in range(words))
+
+    def article(self):
+        """One article payload."""
+        return {
+            'title': self.text(6).capitalize(),
+            'content': self.text(120),
+            'author': self.author(),
+        }
+
+    def comment(self):
+        """One comment payload."""
+        return {'author': f'Reader {self.rng.randrange(1000)}', 'content': self.text(20)}
+
+    def article_batches(self, batch_size):
+        """Yield lists of at most `batch_size` article payloads, `articles` in total."""
+        for start in range(0, self.articles, batch_size):
+            yield [self.article() for _ in range(min(batch_size, self.articles - start))]
+
+    def comments_for_article(self):
+        """Comment payloads of one article."""
+        return [self.comment() for _ in range(self.comments)]
+
+
+def seed_through_api(target, generator, batch_size=1000):
+    """
+    Load the generated data through the bulk endpoints of a benchmark target.
+
+    Works the same in-process and against a live server, so both run on identical data.
+
+    Returns:
+        List of the ids of the inserted articles.
+    """
+    article_ids = []
+    for batch in generator.article_batches(batch_size):
+        status, body = target.request('POST', f'/api/articles/bulk?batch_size={batch_size}', batch)
+        if status != 201:
+            raise RuntimeError(f"Seeding articles failed with status {status}")
+        article_ids.extend(body['ids'])
+    if generator.comments:
+        for article_id in article_ids:
+            status, _ = target.request('POST', f'/api/articles/{article_id}/comments/bulk',
+                                       generator.comments_for_article())
+            if status != 201:
+                raise RuntimeError(f"Seeding comments failed with status {status}")
+    return article_ids
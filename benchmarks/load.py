@@ -0,0 +1,111 @@
+"""
+Load generation helpers shared by the API benchmarks: request targets and latency statistics.
+"""
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+
+class ClientTarget:
+    """Send requests to a Flask application in-process, through its test client."""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def request(self, method, path, payload=None):
+        """Send one request and return (status, decoded JSON body or None)."""
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, json=payload)
+        body = response.get_json(silent=True)
+        response.close()
+        return response.status_code, body
+
+
+class HTTPTarget:
+    """Send requests to a live server over HTTP, with one persistent connection per thread."""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+        self._local = threading.local()
+
+    def request(self, method, path, payload=None):
+        """Send one request and return (status, decoded JSON body or None)."""
+        body = json.dumps(payload).encode() if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        for attempt in range(2):
+            connection = getattr(self._local, 'connection', None)
+            if connection is None:
+                connection = self._local.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            try:
+                connection.request(method, self.prefix + path.replace(' ', '%20'), body=body, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+                break
+            except (OSError, http.client.HTTPException):
+                # The server closed the kept-alive connection; reconnect once
+                connection.close()
+                self._local.connection = None
+                if attempt:
+                    raise
+        try:
+            return response.status, json.loads(data) if data else None
+        except ValueError:
+            return response.status, None
+
+
+def percentile(sorted_values, fraction):
+    """Value below which `fraction` of the sorted values fall (nearest rank)."""
+    if not sorted_values:
+        return 0.0
+    index = min(int(len(sorted_values) * fraction), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def run_requests(target, requests, concurrency=1, expected=(200,)):
+    """
+    Send (method, path, payload) requests with `concurrency` of them in flight.
+
+    Returns:
+        Dict with the request count, error count, throughput (req/s) and mean/p50/p95/p99
+        latencies in milliseconds.
+    """
+    errors = []
+
+    def send(request):
+        method, path, payload = request
+        start = time.perf_counter()
+        try:
+            status, _ = target.request(method, path, payload)
+            if status not in expected:
+                errors.append(status)
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(send, requests))
+    else:
+        latencies = [send(request) for request in requests]
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'throughput': len(latencies) / elapsed if elapsed else 0.0,
+        'mean_ms': sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+    }
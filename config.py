@@ -1,3 +1,5 @@
+import os
+
 # class Config:
 #     SQLALCHEMY_DATABASE_URI = 'sqlite:///article.db'
 #     SQLALCHEMY_TRACK_MODIFICATIONS = False
@@ -12,6 +14,60 @@ class Config:
     # Disable SQLAlchemy modification tracking to suppress a warning
     SQLALCHEMY_TRACK_MODIFICATIONS = False # Disables modification tracking for SQLAlchemy to suppress a warning about significant overhead.
 
+    # Seconds a total article count is cached per filter set (0 disables the cache)
+    TOTAL_COUNT_CACHE_TTL = 30
+
+    # In-memory feed of the newest published article summaries served by /api/articles/latest
+    FEED_SIZE = 500  # Number of articles kept; the feed ends after them
+    FEED_MAX_AGE = 30  # Seconds before the feed is rebuilt, picking up writes of other processes
+
+    # Keyword search backend: 'auto' uses the SQLite FTS5 index when present, 'like' forces substring matching
+    SEARCH_BACKEND = 'auto'
+
+    # Default number of rows inserted per statement and transaction by the bulk endpoints
+    BULK_BATCH_SIZE = 1000
+    BULK_DELETE_PAUSE = 0  # Seconds between bulk delete batches, letting other writers take the lock
+
+    # Asynchronous comment ingestion: comment submissions are validated, queued and answered with
+    # 202 and a tracking id; a writer thread per process inserts them in group-committed batches
+    COMMENT_INGEST_ENABLED = False
+    COMMENT_INGEST_QUEUE_SIZE = 10000  # Comments waiting to be written; further ones get 429
+    COMMENT_INGEST_BATCH_SIZE = 500  # Maximum number of comments written per transaction
+    COMMENT_INGEST_MAX_DELAY = 0.05  # Seconds the writer waits for a batch to fill before writing it
+    COMMENT_INGEST_SPILL_DIR = None  # Where comments still queued at exit are saved (default: instance folder)
+    COMMENT_INGEST_STATUS_TTL = 600  # Seconds the status of a submitted comment can be looked up
+
+    # Response cache for article reads: 'local' (per-process LRU), 'redis' (shared) or 'none'
+    RESPONSE_CACHE_BACKEND = 'local'
+    RESPONSE_CACHE_TTL = 60  # Seconds a cached response stays valid
+    RESPONSE_CACHE_MAXSIZE = 1024  # Maximum number of responses kept by the local backend
+    RESPONSE_CACHE_MAX_GENERATIONS = 16384  # Invalidated articles whose generation the local backend keeps
+    RESPONSE_CACHE_REDIS_URL = 'redis://localhost:6379/0'
+
+    # PRAGMA statements run on every new SQLite connection, e.g. {'journal_mode': 'WAL'}
+    SQLITE_PRAGMAS = {}
+
+    # Read replica: list, detail, search and comment reads go to SQLALCHEMY_BINDS['replica'] when set
+    REPLICA_MAX_LAG = 0  # Seconds the replica may trail the primary before reads fall back to the primary
+    REPLICA_CHECK_INTERVAL = 5  # Seconds a replica health/lag check is reused
+    READ_YOUR_WRITES_WINDOW = 5  # Seconds a client reads from the primary after one of its writes
+
+    # Opt-in per-request instrumentation: Server-Timing headers and a structured slow request/query log
+    INSTRUMENTATION_ENABLED = False
+    SLOW_REQUEST_MS = 500  # Requests slower than this are logged
+    SLOW_QUERY_MS = 100  # SQL statements slower than this are logged
+
+    # Prometheus metrics served at /metrics; with several worker processes set the
+    # PROMETHEUS_MULTIPROC_DIR environment variable to an empty directory shared by the workers
+    METRICS_ENABLED = True
+
+    # Response compression negotiated with Accept-Encoding: gzip, plus brotli ('br') and zstd when
+    # the brotli and zstandard packages are installed
+    COMPRESSION_ENABLED = True
+    COMPRESSION_MIN_SIZE = 1024  # Bytes; smaller buffered responses are sent uncompressed
+    COMPRESSION_LEVELS = {'gzip': 4, 'br': 4, 'zstd': 3}  # See benchmarks/bench_compression.py
+    COMPRESSION_MIMETYPES = ('application/json', 'application/x-ndjson', 'text/plain', 'text/html')
+
 # DevelopmentConfig inherits from Config, setting up the SQLite database for development
 class DevelopmentConfig(Config):
     """
@@ -23,6 +79,9 @@ class DevelopmentConfig(Config):
     # SQLite database URI for development
     SQLALCHEMY_DATABASE_URI = 'sqlite:///article.db'
 
+    # Enable the debugger and auto-reloader of the development server
+    DEBUG = True
+
 # TestingConfig inherits from Config, setting up the SQLite database for testing
 class TestingConfig(Config):
     """
@@ -37,3 +96,70 @@ class TestingConfig(Config):
     # Set TESTING to True for testing environment
     TESTING = True  #Sets the TESTING flag to True for the testing environment. This flag is often used to customize behavior when running tests.
 
+# ProductionConfig inherits from Config and reads its settings from environment variables
+class ProductionConfig(Config):
+    """
+    Configuration class for production environment.
+
+    Inherits from Config and reads the database URI, connection pool options and SQLite pragmas
+    from environment variables, so that multi-process (e.g. gunicorn) deployments can be tuned
+    without code changes.
+    """
+
+    # Database URI, e.g. 'sqlite:////var/lib/article_api/article.db' or a PostgreSQL URI
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///article.db')
+
+    # Optional read replica, e.g. a PostgreSQL hot standby or a replicated SQLite file
+    SQLALCHEMY_BINDS = {'replica': os.environ['DATABASE_REPLICA_URL']} if os.environ.get('DATABASE_REPLICA_URL') else {}
+    REPLICA_MAX_LAG = float(os.environ.get('REPLICA_MAX_LAG', 0))
+
+    # Instrumentation, enabled with INSTRUMENTATION_ENABLED=true
+    INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION_ENABLED', 'false').lower() == 'true'
+    SLOW_REQUEST_MS = float(os.environ.get('SLOW_REQUEST_MS', 500))
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 100))
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+
+    # Compression, usually left to a reverse proxy when one is in front of the application
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_LEVELS = {
+        'gzip': int(os.environ.get('GZIP_LEVEL', 4)),
+        'br': int(os.environ.get('BROTLI_LEVEL', 4)),
+        'zstd': int(os.environ.get('ZSTD_LEVEL', 3)),
+    }
+
+    BULK_DELETE_PAUSE = float(os.environ.get('BULK_DELETE_PAUSE', 0.01))
+
+    FEED_SIZE = int(os.environ.get('FEED_SIZE', 500))
+    FEED_MAX_AGE = float(os.environ.get('FEED_MAX_AGE', 30))
+
+    COMMENT_INGEST_ENABLED = os.environ.get('COMMENT_INGEST_ENABLED', 'false').lower() == 'true'
+    COMMENT_INGEST_QUEUE_SIZE = int(os.environ.get('COMMENT_INGEST_QUEUE_SIZE', 10000))
+    COMMENT_INGEST_BATCH_SIZE = int(os.environ.get('COMMENT_INGEST_BATCH_SIZE', 500))
+    COMMENT_INGEST_MAX_DELAY = float(os.environ.get('COMMENT_INGEST_MAX_DELAY', 0.05))
+    COMMENT_INGEST_SPILL_DIR = os.environ.get('COMMENT_INGEST_SPILL_DIR')
+
+    # Connection pool options passed to create_engine() (per worker process)
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true',
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+    }
+
+    # WAL lets readers proceed while a writer commits, and busy_timeout makes writers wait for the
+    # lock instead of failing with "database is locked"
+    SQLITE_PRAGMAS = {
+        'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 268435456)),  # 256 MiB
+        'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -65536)),  # Negative values are KiB: 64 MiB
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),  # Milliseconds
+    }
+
+# Configuration classes by name, selected with the APP_ENV environment variable
+config_by_name = {
+    'development': DevelopmentConfig,
+    'testing': TestingConfig,
+    'production': ProductionConfig,
+}
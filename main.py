@@ -1,10 +1,18 @@
-from app import app,db
+from app import create_app, db
+from app.migrations import upgrade
+
+# Create the application for the environment selected by APP_ENV (development by default)
+app = create_app()
 
 with app.app_context(): # Creates all the database tables defined in the SQLAlchemy models. This is a one-time operation usually done during application initialization.
     db.create_all()
+    upgrade(db.engine) # Applies pending schema migrations (indexes, search index) that create_all() cannot add to existing tables.
+    # Close the connections used above, so that worker processes forked from this one (e.g. gunicorn --preload) open their own
+    for engine in db.engines.values():
+        engine.dispose()
 
 
 
 
 if __name__ == '__main__':
-    app.run(debug=True) #Starts the Flask development server. The debug=True argument enables the development mode, providing more detailed error messages and auto-restarting the server on code changes.
\ No newline at end of file
+    app.run() #Starts the Flask development server. DEBUG is set by the configuration (enabled for development), providing more detailed error messages and auto-restarting the server on code changes.
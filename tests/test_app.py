@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from app import db, create_app
+from config import TestingConfig, ProductionConfig, config_by_name
+
+
+# Test case class for testing the application factory
+class AppFactoryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a configuration pointing at a throwaway SQLite file with the production pragmas.
+        """
+        handle, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+
+        class FileConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{self.path}'
+            SQLITE_PRAGMAS = ProductionConfig.SQLITE_PRAGMAS
+
+        self.config = FileConfig
+
+    def tearDown(self):
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def test_config_by_name(self):
+        """
+        Test case for selecting the configuration by name.
+
+        - Creates an application from the 'testing' configuration name.
+        - Asserts that the testing settings and the API routes are in place.
+        """
+        app = create_app('testing')
+        self.assertTrue(app.config['TESTING'])
+        self.assertEqual(app.config['SQLALCHEMY_DATABASE_URI'], TestingConfig.SQLALCHEMY_DATABASE_URI)
+        self.assertIn('api', app.blueprints)
+        self.assertEqual(set(config_by_name), {'development', 'testing', 'production'})
+
+    def test_sqlite_pragmas(self):
+        """
+        Test case for the SQLite pragmas applied to new connections.
+
+        - Creates an application with the production pragmas on a file database.
+        - Asserts that every new connection uses WAL, synchronous=NORMAL and the busy timeout.
+        """
+        app = create_app(self.config)
+        with app.app_context():
+            with db.engine.connect() as connection:
+                pragma = lambda name: connection.exec_driver_sql(f'PRAGMA {name}').scalar()
+                self.assertEqual(pragma('journal_mode'), 'wal')
+                self.assertEqual(pragma('synchronous'), 1)  # NORMAL
+                self.assertEqual(pragma('busy_timeout'), ProductionConfig.SQLITE_PRAGMAS['busy_timeout'])
+                self.assertEqual(pragma('cache_size'), ProductionConfig.SQLITE_PRAGMAS['cache_size'])
+            db.engine.dispose()
+
+    def test_independent_apps(self):
+        """
+        Test case for several applications created by the factory.
+
+        - Creates two applications bound to different databases.
+        - Asserts that each one uses its own engine.
+        """
+        first = create_app(TestingConfig)
+        second = create_app(self.config)
+        with first.app_context():
+            first_url = str(db.engine.url)
+        with second.app_context():
+            second_url = str(db.engine.url)
+            db.engine.dispose()
+        self.assertNotEqual(first_url, second_url)
+        self.assertTrue(second_url.endswith(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
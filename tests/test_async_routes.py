@@ -0,0 +1,358 @@
+import gzip
+import os
+import sqlite3
+import tempfile
+import unittest
+from flask import json
+from app import db, create_app
+from app.aio import create_async_app
+from app.aio.database import async_db
+from app.api.routes import response_cache
+from app.utils.feed import latest_feed
+from app.utils.replica import PIN_COOKIE, reset_replica_checks
+from config import TestingConfig
+
+
+# Test case class for testing the async (ASGI) variant of the API
+class AsyncAPITestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        """
+        Create a throwaway database shared by the async application and the Flask application.
+
+        - The Flask application is used to compare responses, so both must follow one contract.
+        """
+        handle, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+
+        class FileConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{self.path}'
+
+        self.config = FileConfig
+        self.async_app = create_async_app(FileConfig)
+        self.client = self.async_app.test_client()
+        self.flask_app = create_app(FileConfig)
+        self.flask_client = self.flask_app.test_client()
+        with self.flask_app.app_context():
+            db.create_all()
+            response_cache.clear()
+
+    async def asyncTearDown(self):
+        async with self.async_app.app_context():
+            await async_db.engine.dispose()
+        with self.flask_app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        os.remove(self.path)
+
+    async def create_article(self, title='Python News', content='Latest Python updates', author='Python Author'):
+        response = await self.client.post('/api/articles', json={'title': title, 'content': content, 'author': author})
+        self.assertEqual(response.status_code, 201)
+        return (await response.get_json())['data']
+
+    async def test_create_and_get_article(self):
+        """
+        Test case for creating and retrieving an article.
+
+        - Creates an article and a comment through the async API.
+        - Asserts that the article is returned with its comment and that missing ids give 404.
+        """
+        article = await self.create_article()
+        self.assertEqual(article['comments'], [])
+
+        response = await self.client.post(f"/api/articles/{article['id']}/comments", json={'author': 'Reader', 'content': 'Nice'})
+        self.assertEqual(response.status_code, 201)
+
+        response = await self.client.get(f"/api/article/{article['id']}")
+        data = await response.get_json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data['data']['title'], 'Python News')
+        self.assertEqual([comment['content'] for comment in data['data']['comments']], ['Nice'])
+
+        response = await self.client.get('/api/article/999')
+        self.assertEqual(response.status_code, 404)
+
+        response = await self.client.post('/api/articles/999/comments', json={'author': 'Reader', 'content': 'Nice'})
+        self.assertEqual(response.status_code, 404)
+
+    async def test_same_contract_as_flask(self):
+        """
+        Test case for the async API returning the same JSON as the Flask API.
+
+        - Creates articles and comments.
+        - Asserts that list, detail, search and comment reads are identical in both applications.
+        """
+        for i in range(5):
+            article = await self.create_article(title=f'Title {i}', content=f'Python content {i}', author=f'Author {i % 2}')
+            for j in range(i):
+                await self.client.post(f"/api/articles/{article['id']}/comments", json={'author': 'Reader', 'content': f'Comment {j}'})
+
+        urls = [
+            '/api/articles?per_page=2&page=2',
+            '/api/articles?per_page=2&cursor=',
+            '/api/articles?sort_by=title&sort_order=desc&include=comments',
+            '/api/articles?author=author 1&comments_limit=1',
+            '/api/articles?keyword=python&per_page=3&comments_limit=0',
+            '/api/articles?view=summary&per_page=2&sort_by=updated_at&cursor=',
+            '/api/articles?fields=title,author&include=comments',
+            '/api/articles?sort=-author,title&per_page=3&cursor=',
+            '/api/articles?sort_by=content',
+            '/api/articles/search?q=content',
+            '/api/article/4',
+            '/api/article/5?comments_limit=2',
+            '/api/articles/5/comments?per_page=2&sort_order=desc',
+            '/api/articles/5/comments?format=ndjson',
+        ]
+        for url in urls:
+            response = await self.client.get(url)
+            expected = self.flask_client.get(url)
+            self.assertEqual(response.status_code, expected.status_code, url)
+            self.assertEqual(response.mimetype, expected.mimetype, url)
+            body = await response.get_data()
+            if response.mimetype == 'application/x-ndjson':
+                self.assertEqual(body, expected.data, url)
+            else:
+                self.assertEqual(json.loads(body), json.loads(expected.data), url)
+
+    async def test_cursor_pagination(self):
+        """
+        Test case for following next_cursor through every page.
+
+        - Creates five articles and pages through them two at a time.
+        - Asserts that each article is returned once and the last page has no cursor.
+        """
+        for i in range(5):
+            await self.create_article(title=f'Title {i}')
+
+        titles, cursor = [], ''
+        while cursor is not None:
+            response = await self.client.get(f'/api/articles?per_page=2&sort_by=title&cursor={cursor}')
+            data = await response.get_json()
+            titles += [item['title'] for item in data['data']]
+            cursor = data['next_cursor']
+        self.assertEqual(titles, [f'Title {i}' for i in range(5)])
+
+    async def test_update_and_delete_article(self):
+        """
+        Test case for updating and deleting an article.
+
+        - Updates an article with a comment, patches it with its ETag, then deletes it.
+        - Asserts the updated data (with its comments), that the update's ETag validates a GET, that
+          a stale If-Match is refused and that the article is gone.
+        """
+        article = await self.create_article()
+        await self.client.post(f"/api/articles/{article['id']}/comments", json={'author': 'Reader', 'content': 'Nice'})
+
+        response = await self.client.put(f"/api/articles/{article['id']}", json={'title': 'Updated'})
+        data = await response.get_json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data['data']['title'], 'Updated')
+        self.assertEqual(len(data['data']['comments']), 1)
+        cached = await self.client.get(f"/api/article/{article['id']}", headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(cached.status_code, 304)
+
+        response = await self.client.patch(f"/api/articles/{article['id']}", json={'author': 'Editor'},
+                                           headers={'If-Match': response.headers['ETag']})
+        data = await response.get_json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((data['data']['title'], data['data']['author'], data['data']['version']),
+                         ('Updated', 'Editor', 3))
+        response = await self.client.patch(f"/api/articles/{article['id']}", json={'author': 'Late'},
+                                           headers={'If-Match': '"v2"'})
+        self.assertEqual(response.status_code, 412)
+
+        response = await self.client.delete(f"/api/articles/{article['id']}")
+        self.assertEqual(response.status_code, 200)
+        response = await self.client.get(f"/api/article/{article['id']}")
+        self.assertEqual(response.status_code, 404)
+        response = await self.client.delete(f"/api/articles/{article['id']}")
+        self.assertEqual(response.status_code, 404)
+
+    async def test_authors(self):
+        """
+        Test case for the author aggregates.
+
+        - Creates, renames and deletes articles through the async API.
+        - Asserts that the author list and single-author responses follow each change and match
+          the Flask application.
+        """
+        first = await self.create_article(author='Ada Lovelace')
+        await self.create_article(author='ada  lovelace')
+        await self.client.post(f"/api/articles/{first['id']}/comments", json={'author': 'Reader', 'content': 'Nice'})
+        second = await self.create_article(author='Grace Hopper')
+
+        response = await self.client.get('/api/authors')
+        data = await response.get_json()
+        self.assertEqual([(item['author_key'], item['article_count'], item['comment_count']) for item in data['data']],
+                         [('ada lovelace', 2, 1), ('grace hopper', 1, 0)])
+        self.assertEqual(data, json.loads(self.flask_client.get('/api/authors').data))
+
+        await self.client.patch(f"/api/articles/{first['id']}", json={'author': 'Grace Hopper'})
+        await self.client.delete(f"/api/articles/{second['id']}")
+        response = await self.client.get('/api/authors/GRACE HOPPER')
+        data = (await response.get_json())['data']
+        self.assertEqual((data['article_count'], data['comment_count']), (1, 1))
+        response = await self.client.get('/api/authors/Nobody')
+        self.assertEqual(response.status_code, 404)
+
+    async def test_invalid_input(self):
+        """
+        Test case for invalid requests.
+
+        - Sends a blank article and an invalid cursor.
+        - Asserts that both are rejected with 400.
+        """
+        response = await self.client.post('/api/articles', json={'title': '', 'content': 'Content', 'author': 'Author'})
+        self.assertEqual(response.status_code, 400)
+        response = await self.client.get('/api/articles?cursor=invalid')
+        self.assertEqual(response.status_code, 400)
+
+    async def test_conditional_and_cached_reads(self):
+        """
+        Test case for ETags, 304 responses and the response cache.
+
+        - Reads an article twice, then with its ETag, then after patching it.
+        - Asserts a cache miss then a hit, a 304 for the current ETag (cached or not) and a new
+          ETag after the change.
+        """
+        article = await self.create_article()
+        url = f"/api/article/{article['id']}"
+
+        response = await self.client.get(url)
+        self.assertEqual(response.headers['X-Cache'], 'MISS')
+        etag = response.headers['ETag']
+        response = await self.client.get(url)
+        self.assertEqual((response.headers['X-Cache'], response.headers['ETag']), ('HIT', etag))
+
+        response = await self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(await response.get_data(), b'')
+        response_cache.clear()
+        response = await self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+        await self.client.patch(f"/api/articles/{article['id']}", json={'title': 'Changed'})
+        response = await self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual((await response.get_json())['data']['title'], 'Changed')
+
+        data = await (await self.client.get('/api/cache/stats')).get_json()
+        self.assertGreaterEqual(data['data']['hits'], 1)
+
+    async def test_bulk_and_latest(self):
+        """
+        Test case for the bulk endpoints and the latest articles feed.
+
+        - Creates articles from a JSON array and from NDJSON, comments in bulk, then deletes by author.
+        - Asserts the inserted and rejected items, the feed contents (identical to the Flask
+          application's) and the deleted articles and comments.
+        """
+        latest_feed.clear()
+        self.addCleanup(latest_feed.clear)
+        items = [{'title': f'Title {i}', 'content': 'Content', 'author': 'Bulk Author'} for i in range(3)]
+        response = await self.client.post('/api/articles/bulk?batch_size=2', json=items + [{'title': ''}])
+        data = await response.get_json()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((data['inserted'], [error['index'] for error in data['errors']]), (3, [3]))
+
+        lines = [json.dumps({'title': 'Other', 'content': 'Content', 'author': 'Other'})] * 2 + ['not json']
+        response = await self.client.post('/api/articles/bulk', data='\n'.join(lines),
+                                          headers={'Content-Type': 'application/x-ndjson'})
+        data = await response.get_json()
+        self.assertEqual((data['inserted'], [error['index'] for error in data['errors']]), (2, [2]))
+
+        response = await self.client.post(f"/api/articles/{data['ids'][0]}/comments/bulk",
+                                          json=[{'author': 'Reader', 'content': f'Comment {i}'} for i in range(3)])
+        self.assertEqual((await response.get_json())['inserted'], 3)
+
+        response = await self.client.get('/api/articles/latest?per_page=10')
+        self.assertEqual(len((await response.get_json())['data']), 5)
+        self.assertEqual(await response.get_data(), self.flask_client.get('/api/articles/latest?per_page=10').data)
+
+        response = await self.client.delete('/api/articles/bulk', json={'author': 'other'})
+        data = await response.get_json()
+        self.assertEqual((data['deleted'], data['comments_deleted']), (2, 3))
+        response = await self.client.get('/api/articles/latest?per_page=10')
+        self.assertEqual([item['author'] for item in (await response.get_json())['data']], ['Bulk Author'] * 3)
+
+    async def test_compression_and_metrics(self):
+        """
+        Test case for response compression and request metrics.
+
+        - Reads a long article and streams its comments with gzip accepted, then scrapes /metrics.
+        - Asserts that the bodies decode to the identity ones and that the requests were counted.
+        """
+        article = await self.create_article(content='Latest Python updates. ' * 200)
+        for i in range(20):
+            await self.client.post(f"/api/articles/{article['id']}/comments", json={'author': 'Reader', 'content': f'Comment {i}'})
+
+        url = f"/api/article/{article['id']}"
+        identity = await (await self.client.get(url)).get_data()
+        response = await self.client.get(url, headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertTrue(response.headers['ETag'].startswith('W/'))
+        self.assertEqual(gzip.decompress(await response.get_data()), identity)
+
+        url = f"/api/articles/{article['id']}/comments?format=ndjson"
+        identity = await (await self.client.get(url)).get_data()
+        response = await self.client.get(url, headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(await response.get_data()), identity)
+
+        metrics = (await (await self.client.get('/metrics')).get_data()).decode()
+        self.assertIn('http_requests_total{method="GET",route="/api/article/<int:article_id>",status="200"}', metrics)
+        self.assertIn('db_pool_connections_in_use', metrics)
+
+    async def test_read_replica(self):
+        """
+        Test case for reads from a read replica.
+
+        - Serves the async API with a replica whose copy of the article has another title, then
+          patches the article.
+        - Asserts that reads use the replica, that the write reaches the primary and pins the
+          writer, whose reads then go to the primary.
+        """
+        article = await self.create_article()
+        handle, replica_path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.addCleanup(os.remove, replica_path)
+        source, target = sqlite3.connect(self.path), sqlite3.connect(replica_path)
+        source.backup(target)
+        target.execute("UPDATE article SET title = 'Replica copy'")
+        target.commit()
+        source.close()
+        target.close()
+
+        class ReplicaConfig(self.config):
+            SQLALCHEMY_BINDS = {'replica': f'sqlite:///{replica_path}'}
+            REPLICA_CHECK_INTERVAL = 0
+            REPLICA_MAX_LAG = 3600
+
+        reset_replica_checks()
+        self.addCleanup(reset_replica_checks)
+        app = create_async_app(ReplicaConfig)
+        writer, reader = app.test_client(), app.test_client()
+
+        async def title(client):
+            response_cache.clear()
+            response = await client.get(f"/api/article/{article['id']}")
+            return (await response.get_json())['data']['title']
+
+        try:
+            self.assertEqual(await title(writer), 'Replica copy')
+            response = await writer.patch(f"/api/articles/{article['id']}", json={'title': 'Patched'})
+            self.assertIn(PIN_COOKIE, response.headers['Set-Cookie'])
+            self.assertEqual(await title(writer), 'Patched')
+            self.assertEqual(await title(reader), 'Replica copy')
+            self.assertEqual(json.loads(self.flask_client.get(f"/api/article/{article['id']}").data)['data']['title'],
+                             'Patched')
+        finally:
+            async with app.app_context():
+                await async_db.engine.dispose()
+                await async_db.replica.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import argparse
+import contextlib
+import io
+import tempfile
+import unittest
+from app import db
+from benchmarks.bench_api import SCENARIOS, in_process_target, run_benchmarks, compare
+from benchmarks import bench_compression
+from benchmarks.data import DataGenerator, author_name
+
+
+# Test case class for testing the benchmark suite itself
+class BenchmarkSuiteTestCase(unittest.TestCase):
+
+    def test_skewed_authors(self):
+        """
+        Test case for the data generator.
+
+        - Generates articles with a skewed author distribution.
+        - Asserts that the most popular author writes far more articles than the least popular one.
+        """
+        generator = DataGenerator(articles=2000, authors=20, skew=1.2)
+        authors = [article['author'] for batch in generator.article_batches(500) for article in batch]
+        self.assertEqual(len(authors), 2000)
+        self.assertGreater(authors.count(author_name(0)), 10 * authors.count(author_name(19)))
+
+    def test_run_and_compare(self):
+        """
+        Test case for a small in-process benchmark run.
+
+        - Runs every scenario against a throwaway database.
+        - Asserts that all scenarios report latencies without errors and that comparing a run
+          with a slower copy of itself reports regressions.
+        """
+        args = argparse.Namespace(articles=40, comments=2, authors=5, skew=1.1, seed=1, requests=10,
+                                  concurrency=2, scenarios=None, url=None, cache=False)
+        with tempfile.TemporaryDirectory() as directory:
+            target = in_process_target(directory)
+            with contextlib.redirect_stdout(io.StringIO()):
+                document = run_benchmarks(target, args)
+            with target.app.app_context():
+                db.session.remove()
+                db.engine.dispose()
+
+        self.assertEqual(set(document['results']), set(SCENARIOS))
+        for name, result in document['results'].items():
+            self.assertEqual(result['errors'], 0, name)
+            self.assertGreater(result['requests'], 0, name)
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'], name)
+
+        self.assertEqual(compare(document, document, 0.2), [])
+        slower = {'results': {name: dict(result, p95_ms=result['p95_ms'] * 2)
+                              for name, result in document['results'].items()}}
+        regressions = compare(document, slower, 0.2)
+        self.assertEqual({(name, metric) for name, metric, _, _ in regressions},
+                         {(name, 'p95_ms') for name in SCENARIOS})
+
+
+    def test_compression_benchmark(self):
+        """
+        Test case for the compression benchmark.
+
+        - Runs it once per measurement.
+        - Asserts that every payload is measured with gzip and that higher levels never produce
+          larger bodies on these payloads.
+        """
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = bench_compression.run(repeat=1)
+        gzip_rows = [row for row in results if row['encoding'] == 'gzip']
+        self.assertEqual({row['payload'] for row in gzip_rows}, set(bench_compression.PayloadBuilder().payloads()))
+        for payload in {row['payload'] for row in gzip_rows}:
+            sizes = [row['compressed_bytes'] for row in gzip_rows if row['payload'] == payload]
+            self.assertEqual(sizes, sorted(sizes, reverse=True))
+        self.assertTrue(all(row['ratio'] > 1.5 for row in gzip_rows))
+
+if __name__ == '__main__':
+    unittest.main()
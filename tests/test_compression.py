@@ -0,0 +1,124 @@
+import gzip
+import unittest
+from flask import json
+from werkzeug.http import parse_accept_header
+from app import db, create_app
+from app.models.article import Article
+from app.models.comment import Comment
+from app.api.routes import response_cache
+from app.utils.compression import negotiate
+from config import TestingConfig
+
+app = create_app(TestingConfig)
+
+
+# Test case class for testing response compression
+class CompressionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create the test database with one long article and many comments.
+        """
+        self.client = app.test_client()
+        with app.app_context():
+            db.create_all()
+            article = Article(title='Python News', content='Latest Python updates. ' * 200, author='Python Author')
+            db.session.add(article)
+            db.session.add_all([Comment(author=f'Reader {i}', content='Great article! ' * 5, article=article)
+                                for i in range(50)])
+            db.session.commit()
+            response_cache.clear()
+
+    def tearDown(self):
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_gzip_negotiation(self):
+        """
+        Test case for compressing a large JSON response.
+
+        - Requests an article with and without gzip in Accept-Encoding.
+        - Asserts that the gzip body decodes to the identity body and that both vary on Accept-Encoding.
+        """
+        identity = self.client.get('/api/article/1')
+        self.assertNotIn('Content-Encoding', identity.headers)
+        self.assertIn('Accept-Encoding', identity.headers['Vary'])
+
+        response = self.client.get('/api/article/1', headers={'Accept-Encoding': 'gzip, deflate'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(int(response.headers['Content-Length']), len(response.data))
+        self.assertLess(len(response.data), len(identity.data) / 3)
+        self.assertEqual(gzip.decompress(response.data), identity.data)
+
+        # Refused codings are not used
+        response = self.client.get('/api/article/1', headers={'Accept-Encoding': 'gzip;q=0, identity'})
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_minimum_size(self):
+        """
+        Test case for the minimum-size threshold.
+
+        - Asserts that a response smaller than COMPRESSION_MIN_SIZE is sent uncompressed.
+        """
+        response = self.client.get('/api/articles?fields=title', headers={'Accept-Encoding': 'gzip'})
+        self.assertLess(len(response.data), app.config['COMPRESSION_MIN_SIZE'])
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(json.loads(response.data)['data'][0]['title'], 'Python News')
+
+    def test_streamed_response(self):
+        """
+        Test case for compressing a streamed NDJSON response.
+
+        - Asserts that the stream is sent without Content-Length and decodes to the identity stream.
+        """
+        url = '/api/articles/1/comments?format=ndjson'
+        identity = self.client.get(url).data
+        response = self.client.get(url, headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertNotIn('Content-Length', response.headers)
+        self.assertEqual(gzip.decompress(response.data), identity)
+        self.assertEqual(len(identity.splitlines()), 50)
+
+    def test_conditional_requests(self):
+        """
+        Test case for validators of compressed responses.
+
+        - Asserts that the ETag of a compressed response is weak and still gives 304 responses,
+          which are not compressed.
+        """
+        headers = {'Accept-Encoding': 'gzip'}
+        etag = self.client.get('/api/article/1', headers=headers).headers['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        response = self.client.get('/api/article/1', headers={**headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_negotiate(self):
+        """
+        Test case for choosing a coding from an Accept-Encoding header.
+        """
+        available = {'gzip': None, 'br': None}
+        self.assertEqual(negotiate(parse_accept_header('gzip, br'), available), 'br')
+        self.assertEqual(negotiate(parse_accept_header('gzip;q=1, br;q=0.5'), available), 'gzip')
+        self.assertEqual(negotiate(parse_accept_header('zstd'), available), None)
+        self.assertEqual(negotiate(parse_accept_header('*'), {'gzip': None}), 'gzip')
+        self.assertEqual(negotiate(parse_accept_header('br;q=0, *'), available), 'gzip')
+        self.assertEqual(negotiate(parse_accept_header(''), available), None)
+
+    def test_disabled(self):
+        """
+        Test case for turning compression off.
+        """
+        class UncompressedConfig(TestingConfig):
+            COMPRESSION_ENABLED = False
+
+        response = create_app(UncompressedConfig).test_client().get(
+            '/api/article/1', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Content-Encoding', response.headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import glob
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from flask import json
+from app import db, create_app
+from app.models.article import Article
+from app.models.comment import Comment
+from app.utils.ingest import CommentIngest, SPILL_PATTERN
+from config import TestingConfig
+
+
+class IngestConfig(TestingConfig):
+    COMMENT_INGEST_ENABLED = True
+    COMMENT_INGEST_QUEUE_SIZE = 50
+    COMMENT_INGEST_BATCH_SIZE = 20
+    COMMENT_INGEST_MAX_DELAY = 1.0
+
+
+# Test case class for testing queued comment ingestion
+class CommentIngestTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create an application with comment ingestion enabled, a spill directory and one article.
+        """
+        self.spill_dir = tempfile.mkdtemp()
+
+        class Config(IngestConfig):
+            COMMENT_INGEST_SPILL_DIR = self.spill_dir
+
+        self.app = create_app(Config)
+        self.ingest = self.app.extensions['comment_ingest']
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            article = Article(title='Live Event', content='Live coverage', author='Reporter')
+            db.session.add(article)
+            db.session.commit()
+            self.article_id = article.id
+
+    def tearDown(self):
+        self.ingest.shutdown()
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+        shutil.rmtree(self.spill_dir)
+
+    def post_comment(self, article_id=None, **data):
+        payload = {'author': 'Reader', 'content': 'First!', **data}
+        return self.client.post(f'/api/articles/{article_id or self.article_id}/comments', json=payload)
+
+    def test_group_commit(self):
+        """
+        Test case for accepting a burst of comments.
+
+        - Submits 20 comments, each answered with 202 and a tracking id.
+        - Asserts that they are stored in one or two batches, in submission order, with the article's
+          comment count updated, and that their status reports the stored comment ids.
+        """
+        tracking_ids = []
+        for i in range(20):
+            response = self.post_comment(content=f'Comment {i}')
+            data = json.loads(response.data)
+            self.assertEqual(response.status_code, 202)
+            self.assertEqual(response.headers['Location'], data['data']['status_url'])
+            tracking_ids.append(data['data']['tracking_id'])
+        self.assertTrue(self.ingest.wait_idle(timeout=10))
+
+        stats = json.loads(self.client.get('/api/comments/ingest').data)['data']
+        self.assertEqual((stats['accepted'], stats['stored'], stats['queued']), (20, 20, 0))
+        self.assertLessEqual(stats['batches'], 2)
+
+        with self.app.app_context():
+            comments = db.session.scalars(db.select(Comment).order_by(Comment.created_at, Comment.id)).all()
+            self.assertEqual([comment.content for comment in comments], [f'Comment {i}' for i in range(20)])
+            self.assertEqual(db.session.get(Article, self.article_id).comment_count, 20)
+
+            status = json.loads(self.client.get(f'/api/comments/ingest/{tracking_ids[0]}').data)['data']
+            self.assertEqual(status['status'], 'stored')
+            self.assertEqual(status['comment_id'], comments[0].id)
+
+    def test_invalid_and_unknown(self):
+        """
+        Test case for comments that cannot be stored.
+
+        - Asserts that invalid comments are rejected with 400 without being queued.
+        - Asserts that a comment on a missing article is accepted, then reported as rejected.
+        - Asserts that unknown tracking ids give 404.
+        """
+        self.assertEqual(self.post_comment(content='').status_code, 400)
+        response = self.post_comment(author='Reader', content='Hello', extra=1)
+        self.assertEqual(response.status_code, 400)
+
+        response = self.post_comment(article_id=6463)
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(self.ingest.wait_idle(timeout=10))
+        status = json.loads(self.client.get(json.loads(response.data)['data']['status_url']).data)['data']
+        self.assertEqual(status['status'], 'rejected')
+        self.assertEqual(self.client.get('/api/comments/ingest/unknown').status_code, 404)
+
+    def test_backpressure(self):
+        """
+        Test case for a full queue.
+
+        - Blocks the writer on its first batch and fills the queue.
+        - Asserts that further comments are refused with 429 and Retry-After, and that the queued
+          ones are stored once the writer resumes.
+        """
+        release = threading.Event()
+        write = self.ingest._write
+        started = threading.Event()
+
+        def blocked_write(batch):
+            started.set()
+            release.wait(10)
+            write(batch)
+
+        with patch.object(self.ingest, '_write', side_effect=blocked_write):
+            self.assertEqual(self.post_comment().status_code, 202)
+            self.assertTrue(started.wait(10))
+            for _ in range(IngestConfig.COMMENT_INGEST_QUEUE_SIZE):
+                self.assertEqual(self.post_comment().status_code, 202)
+            response = self.post_comment()
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response.headers['Retry-After'], '1')
+            release.set()
+            self.assertTrue(self.ingest.wait_idle(timeout=10))
+
+        stats = self.ingest.stats()
+        self.assertEqual((stats['stored'], stats['refused']), (IngestConfig.COMMENT_INGEST_QUEUE_SIZE + 1, 1))
+
+    def test_spill_and_restore(self):
+        """
+        Test case for comments still queued at shutdown.
+
+        - Queues comments on an ingestion queue whose writer never started and shuts it down.
+        - Asserts that they are saved to a spill file, then stored by the next writer, which
+          removes the file.
+        """
+        pending = CommentIngest(self.app)
+        for i in range(3):
+            pending.submit(self.article_id, {'author': 'Reader', 'content': f'Pending {i}'})
+        pending.shutdown()
+        self.assertEqual(pending.stats()['spilled'], 3)
+        self.assertEqual(len(glob.glob(os.path.join(self.spill_dir, SPILL_PATTERN))), 1)
+
+        self.client.get('/api/comments/ingest')  # The first request starts the writer
+        deadline = time.monotonic() + 10
+        while self.ingest.stats()['restored'] < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.ingest.stats()['stored'], 3)
+        self.assertEqual(os.listdir(self.spill_dir), [])
+        with self.app.app_context():
+            self.assertEqual(db.session.get(Article, self.article_id).comment_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import json
+import unittest
+import flask
+from sqlalchemy.exc import OperationalError
+from app import db, create_app
+from app.models.article import Article
+from app.models.comment import Comment
+from app.api.routes import response_cache
+from app.utils.instrumentation import parameter_shape
+from config import TestingConfig
+
+
+class InstrumentedConfig(TestingConfig):
+    INSTRUMENTATION_ENABLED = True
+    SLOW_REQUEST_MS = 0  # Log every request
+    SLOW_QUERY_MS = 0  # Log every statement
+
+
+# Test case class for testing per-request instrumentation
+class InstrumentationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create an instrumented application and a test database with one commented article.
+        """
+        self.app = create_app(InstrumentedConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            article = Article(title='Python News', content='Latest Python updates', author='Python Author')
+            db.session.add(article)
+            db.session.add(Comment(author='Commenter', content='Nice', article=article))
+            db.session.commit()
+            response_cache.clear()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
+
+    def server_timing(self, response):
+        """Parse the Server-Timing header into {name: (duration, description)}."""
+        entries = {}
+        for entry in response.headers['Server-Timing'].split(', '):
+            name, *params = entry.split(';')
+            params = dict(param.split('=', 1) for param in params)
+            entries[name] = (float(params['dur']), params.get('desc', '').strip('"'))
+        return entries
+
+    def test_server_timing_header(self):
+        """
+        Test case for the Server-Timing header.
+
+        - Retrieves an article list with comments and updates an article.
+        - Asserts that SQL, serialization, encoding and total timings are reported, with the
+          number of queries.
+        """
+        with self.assertLogs('app.utils.instrumentation', 'WARNING'):
+            response = self.client.get('/api/articles?include=comments')
+        timing = self.server_timing(response)
+        self.assertEqual(set(timing), {'db', 'serialize', 'encode', 'total'})
+        # ETag validators, page and embedded comments
+        self.assertEqual(timing['db'][1], '3 queries')
+        self.assertLessEqual(timing['db'][0], timing['total'][0])
+
+        # Marshmallow dumps and jsonify() are timed too
+        with self.assertLogs('app.utils.instrumentation', 'WARNING'):
+            response = self.client.put('/api/articles/1', json={'title': 'Updated'})
+        self.assertEqual(set(self.server_timing(response)), {'db', 'serialize', 'encode', 'total'})
+
+    def test_slow_logs(self):
+        """
+        Test case for the structured slow-request and slow-query logs.
+
+        - Retrieves an article with every threshold at 0.
+        - Asserts that each statement is logged with its parameter types only, and that the
+          request is logged with its query count and timings.
+        """
+        with self.assertLogs('app.utils.instrumentation', 'WARNING') as logs:
+            self.client.get('/api/article/1?include=')
+        records = [json.loads(message.split(':', 2)[2]) for message in logs.output]
+
+        queries = [record for record in records if record['event'] == 'slow_query']
+        self.assertEqual(len(queries), 2)
+        self.assertTrue(all(record['endpoint'] == 'api.get_article' for record in queries))
+        self.assertIn('FROM article', queries[1]['statement'])
+        self.assertNotIn('1', json.dumps(queries[1]['parameters']))  # Types, not values
+
+        [slow_request] = [record for record in records if record['event'] == 'slow_request']
+        self.assertEqual(slow_request['path'], '/api/article/1')
+        self.assertEqual(slow_request['status'], 200)
+        self.assertEqual(slow_request['queries'], 2)
+        self.assertIn('encode_ms', slow_request)
+
+    def test_failed_statement(self):
+        """
+        Test case for a statement that raises.
+
+        - Runs a failing statement, then a valid one, on the same connection.
+        - Asserts that the start time of the failed statement is discarded and both are counted.
+        """
+        with self.app.test_request_context():
+            self.app.preprocess_request()
+            with db.engine.connect() as connection:
+                with self.assertRaises(OperationalError):
+                    connection.exec_driver_sql('SELECT * FROM missing_table')
+                connection.exec_driver_sql('SELECT 1')
+                self.assertEqual(connection.info['query_start'], [])
+            self.assertEqual(flask.g.request_metrics.queries, 2)
+
+    def test_parameter_shape(self):
+        """
+        Test case for describing bound parameters without their values.
+        """
+        self.assertEqual(parameter_shape({'id': 1, 'title': 'x'}), {'id': 'int', 'title': 'str'})
+        self.assertEqual(parameter_shape((1, 'x', None)), ['int', 'str', 'NoneType'])
+        self.assertEqual(parameter_shape([{'id': 1}, {'id': 2}]), {'rows': 2, 'row': {'id': 'int'}})
+
+    def test_disabled_by_default(self):
+        """
+        Test case for instrumentation being off by default.
+
+        - Creates an application with the testing configuration.
+        - Asserts that no engine events are registered and no Server-Timing header is sent.
+        """
+        app = create_app(TestingConfig)
+        with app.app_context():
+            self.assertEqual(len(db.engine.dispatch.before_cursor_execute), 0)
+            self.assertEqual(len(db.engine.dispatch.after_cursor_execute), 0)
+        response = app.test_client().get('/api/article/1')
+        self.assertNotIn('Server-Timing', response.headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from prometheus_client import REGISTRY
+from app import db, create_app
+from app.models.article import Article
+from app.api.routes import response_cache
+from app.utils.metrics import TimedQueuePool
+from config import TestingConfig
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Child process recording requests into a multiprocess metrics directory
+WORKER = textwrap.dedent("""
+    import sys
+    from app import db, create_app
+    from config import TestingConfig
+
+    class WorkerConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + sys.argv[1]
+
+    app = create_app(WorkerConfig)
+    client = app.test_client()
+    with app.app_context():
+        db.create_all()
+    for _ in range(int(sys.argv[2])):
+        client.get('/api/articles')
+    if len(sys.argv) > 3:
+        sys.stdout.write(client.get('/metrics').get_data(as_text=True))
+""")
+
+
+def sample(name, **labels):
+    """Current value of a metric sample in this process (0 if not recorded yet)."""
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+# Test case class for testing the Prometheus metrics endpoint
+class MetricsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create the test database with one article and a fresh response cache.
+        """
+        self.app = create_app(TestingConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            db.session.add(Article(title='Python News', content='Latest Python updates', author='Python Author'))
+            db.session.commit()
+            response_cache.clear()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_request_metrics(self):
+        """
+        Test case for per-route request counts, latencies and payload sizes.
+
+        - Sends two requests for an article and one for a missing article.
+        - Asserts that counts are recorded per route template and status, with a latency and a
+          response size observation for each request.
+        """
+        route = '/api/article/<int:article_id>'
+        ok_before = sample('http_requests_total', method='GET', route=route, status='200')
+        missing_before = sample('http_requests_total', method='GET', route=route, status='404')
+        latency_before = sample('http_request_duration_seconds_count', method='GET', route=route)
+        size_before = sample('http_response_size_bytes_count', method='GET', route=route)
+
+        self.client.get('/api/article/1')
+        self.client.get('/api/article/1')
+        self.client.get('/api/article/999')
+
+        self.assertEqual(sample('http_requests_total', method='GET', route=route, status='200') - ok_before, 2)
+        self.assertEqual(sample('http_requests_total', method='GET', route=route, status='404') - missing_before, 1)
+        self.assertEqual(sample('http_request_duration_seconds_count', method='GET', route=route) - latency_before, 3)
+        self.assertEqual(sample('http_response_size_bytes_count', method='GET', route=route) - size_before, 3)
+
+    def test_cache_and_pool_metrics(self):
+        """
+        Test case for cache lookups and database pool metrics.
+
+        - Requests the same article twice (a cache miss, then a hit).
+        - Asserts the cache counters, the checkout wait observations and that no connection is
+          left checked out.
+        """
+        hits = sample('cache_requests_total', cache='response', result='hit')
+        misses = sample('cache_requests_total', cache='response', result='miss')
+        waits = sample('db_pool_checkout_wait_seconds_count', bind='default')
+
+        self.client.get('/api/article/1')
+        self.client.get('/api/article/1')
+
+        self.assertEqual(sample('cache_requests_total', cache='response', result='hit') - hits, 1)
+        self.assertEqual(sample('cache_requests_total', cache='response', result='miss') - misses, 1)
+        with self.app.app_context():
+            self.assertIsInstance(db.engine.pool, TimedQueuePool)
+        self.assertGreater(sample('db_pool_checkout_wait_seconds_count', bind='default'), waits)
+        self.assertEqual(sample('db_pool_connections_in_use', bind='default'), 0)
+
+    def test_metrics_endpoint(self):
+        """
+        Test case for the /metrics endpoint.
+
+        - Asserts that it answers in the Prometheus text format and does not count itself.
+        """
+        self.client.get('/api/articles')
+        response = self.client.get('/metrics')
+        body = response.get_data(as_text=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        self.assertIn('http_requests_total{method="GET",route="/api/articles",status="200"}', body)
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+        self.assertNotIn('route="/metrics"', body)
+
+    def test_multiprocess_aggregation(self):
+        """
+        Test case for aggregating metrics of several worker processes.
+
+        - Runs two worker processes sharing a PROMETHEUS_MULTIPROC_DIR, sending 3 and 4 requests.
+        - Asserts that /metrics, served by a third process, reports all 7 requests.
+        """
+        # The collector reads every *.db file of the metrics directory, so the database lives elsewhere
+        with tempfile.TemporaryDirectory() as directory, tempfile.TemporaryDirectory() as data:
+            env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=directory)
+            database = os.path.join(data, 'metrics.db')
+            for requests in (3, 4):
+                subprocess.run([sys.executable, '-c', WORKER, database, str(requests)], cwd=ROOT, env=env, check=True)
+            output = subprocess.run([sys.executable, '-c', WORKER, database, '0', 'scrape'], cwd=ROOT, env=env,
+                                    check=True, capture_output=True, text=True).stdout
+
+        self.assertIn('http_requests_total{method="GET",route="/api/articles",status="200"} 7.0', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import tempfile
+import unittest
+from sqlalchemy import create_engine
+from app import db
+from app.migrations import MIGRATIONS, upgrade, current_version
+
+# Schema of a database created by db.create_all() before any migration existed
+BASELINE_SCHEMA = [
+    """CREATE TABLE article (
+        id INTEGER NOT NULL, title VARCHAR(250) NOT NULL, content TEXT NOT NULL,
+        author VARCHAR(100) NOT NULL, is_published BOOLEAN, pub_date DATETIME,
+        created_at DATETIME, updated_at DATETIME, PRIMARY KEY (id)
+    )""",
+    """CREATE TABLE comment (
+        id INTEGER NOT NULL, author VARCHAR(100) NOT NULL, content TEXT NOT NULL,
+        article_id INTEGER NOT NULL, created_at DATETIME, PRIMARY KEY (id),
+        FOREIGN KEY(article_id) REFERENCES article (id)
+    )""",
+    """INSERT INTO article (id, title, content, author, is_published, pub_date, created_at)
+       VALUES (1, 'Python News', 'Latest Python updates', 'Python Author', 1,
+               '2024-01-01 10:00:00', '2024-01-01 10:00:00')""",
+    """INSERT INTO comment (id, author, content, article_id, created_at)
+       VALUES (1, 'Commenter', 'Nice', 1, '2024-01-02 10:00:00')""",
+]
+
+
+# Test case class for testing schema migrations
+class MigrationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a throwaway SQLite database with the baseline (pre-migration) schema.
+        """
+        handle, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.engine = create_engine(f'sqlite:///{self.path}')
+        with self.engine.begin() as connection:
+            for statement in BASELINE_SCHEMA:
+                connection.exec_driver_sql(statement)
+
+    def tearDown(self):
+        """
+        Dispose of the engine and remove the temporary database file.
+        """
+        self.engine.dispose()
+        os.remove(self.path)
+
+    def test_upgrade_baseline_database(self):
+        """
+        Test case for upgrading a database created before the migrations existed.
+
+        - Applies all migrations.
+        - Asserts that every version is recorded and that the hot-column indexes exist.
+        - Asserts that the lower(author) index of earlier releases is dropped.
+        - Asserts that the author filter and comment lookups use the new indexes.
+        """
+        # Created by the second migration of earlier releases
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql("CREATE INDEX ix_article_author_lower ON article (lower(author))")
+
+        applied = upgrade(self.engine)
+        self.assertEqual(applied, [version for version, _, _ in MIGRATIONS])
+        self.assertEqual(current_version(self.engine), MIGRATIONS[-1][0])
+
+        with self.engine.connect() as connection:
+            indexes = {name for name, in connection.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'index'")}
+            self.assertTrue({'ix_article_pub_date_id', 'ix_article_created_at_id', 'ix_article_author_key_pub_date_id',
+                             'ix_comment_article_id_created_at_id'} <= indexes)
+            self.assertNotIn('ix_article_author_lower', indexes)
+
+            plan = connection.exec_driver_sql(
+                "EXPLAIN QUERY PLAN SELECT id FROM article WHERE author_key = 'python author'").all()
+            self.assertIn('ix_article_author_key_pub_date_id', str(plan))
+            plan = connection.exec_driver_sql(
+                "EXPLAIN QUERY PLAN SELECT id FROM comment WHERE article_id = 1 ORDER BY created_at, id").all()
+            self.assertIn('ix_comment_article_id_created_at_id', str(plan))
+
+            # Rows created without updated_at get their creation time
+            self.assertEqual(connection.exec_driver_sql("SELECT updated_at FROM article").scalar(),
+                             '2024-01-01 10:00:00')
+
+            # Comment counts are backfilled from the existing comments
+            self.assertEqual(connection.exec_driver_sql("SELECT comment_count FROM article").scalar(), 1)
+
+            # Authors are keyed by their normalized name and aggregated
+            self.assertEqual(connection.exec_driver_sql("SELECT author_key FROM article").scalar(), 'python author')
+            self.assertEqual(connection.exec_driver_sql(
+                "SELECT author, article_count, last_published_at, comment_count FROM author_stats").all(),
+                [('Python Author', 1, '2024-01-01 10:00:00', 1)])
+
+            # Deletes are counted from the upgrade on
+            self.assertEqual(connection.exec_driver_sql("SELECT id, generation FROM article_deletions").all(), [(1, 0)])
+
+            # Existing articles start at version 1
+            self.assertEqual(connection.exec_driver_sql("SELECT version FROM article").scalar(), 1)
+
+            # Comments are deleted with their article by the database, and keep their indexes
+            foreign_keys = db.inspect(connection).get_foreign_keys('comment')
+            self.assertEqual(foreign_keys[0]['options'].get('ondelete'), 'CASCADE')
+            self.assertEqual(connection.exec_driver_sql("SELECT content FROM comment").scalar(), 'Nice')
+            connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+            connection.exec_driver_sql("DELETE FROM article WHERE id = 1")
+            self.assertEqual(connection.exec_driver_sql("SELECT count(*) FROM comment").scalar(), 0)
+            connection.rollback()
+
+            # The full-text index is built from the existing rows
+            rows = connection.exec_driver_sql("SELECT rowid FROM article_fts WHERE article_fts MATCH 'python'").all()
+            self.assertEqual(rows, [(1,)])
+
+    def test_upgrade_is_idempotent(self):
+        """
+        Test case for running the upgrade twice and on a freshly created schema.
+
+        - Asserts that a second upgrade applies nothing.
+        - Asserts that a database created with create_all() only records the versions.
+        """
+        upgrade(self.engine)
+        self.assertEqual(upgrade(self.engine), [])
+
+        fresh = create_engine('sqlite://')
+        db.metadata.create_all(fresh)
+        self.assertEqual(upgrade(fresh), [version for version, _, _ in MIGRATIONS])
+        fresh.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
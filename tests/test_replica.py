@@ -0,0 +1,238 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+from flask import json
+from app import db, create_app
+from app.models.article import Article
+from app.api.routes import response_cache
+from app.utils.replica import PIN_COOKIE, replica_lag, reset_replica_checks
+from config import TestingConfig
+
+
+# Test case class for testing read-replica routing
+class ReplicaTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a primary and a replica SQLite file and an application reading from the replica.
+
+        - Health checks are not reused between requests, so every read sees the current lag.
+        - The response cache is cleared before each request by self.get().
+        """
+        paths = []
+        for _ in range(2):
+            handle, path = tempfile.mkstemp(suffix='.db')
+            os.close(handle)
+            paths.append(path)
+        self.primary_path, self.replica_path = paths
+
+        class ReplicaConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{self.primary_path}'
+            SQLALCHEMY_BINDS = {'replica': f'sqlite:///{self.replica_path}'}
+            REPLICA_CHECK_INTERVAL = 0
+
+        self.flask_app = create_app(ReplicaConfig)
+        self.client = self.flask_app.test_client()
+        with self.flask_app.app_context():
+            db.create_all()
+            db.session.add(Article(title='Python News', content='Latest Python updates', author='Python Author'))
+            db.session.commit()
+        self.replicate()
+        reset_replica_checks()
+
+    def tearDown(self):
+        with self.flask_app.app_context():
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+        for path in (self.primary_path, self.replica_path):
+            os.remove(path)
+        reset_replica_checks()
+
+    def replicate(self):
+        """Copy the primary database onto the replica, like a replication round would."""
+        source = sqlite3.connect(self.primary_path)
+        target = sqlite3.connect(self.replica_path)
+        try:
+            source.backup(target)
+        finally:
+            source.close()
+            target.close()
+
+    def edit_replica(self, title):
+        """Change the first article's title on the replica only, to tell which database served a read."""
+        with sqlite3.connect(self.replica_path) as connection:
+            connection.execute("UPDATE article SET title = ? WHERE id = 1", (title,))
+        connection.close()
+
+    def get(self, url, client=None):
+        with self.flask_app.app_context():
+            response_cache.clear()
+        return (client or self.client).get(url)
+
+    def test_reads_go_to_replica(self):
+        """
+        Test case for GET endpoints reading from the replica.
+
+        - Changes an article on the replica only.
+        - Asserts that the list, detail, search and comment endpoints read the replica copy.
+        """
+        self.edit_replica('Replica Title')
+
+        response = self.get('/api/article/1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['data']['title'], 'Replica Title')
+
+        response = self.get('/api/articles')
+        self.assertEqual(json.loads(response.data)['data'][0]['title'], 'Replica Title')
+
+        response = self.get('/api/articles/search?q=Replica')
+        self.assertEqual([item['title'] for item in json.loads(response.data)['data']], ['Replica Title'])
+
+        response = self.get('/api/articles/1/comments')
+        self.assertEqual(response.status_code, 200)
+
+        # Outside decorated reads the primary is used
+        with self.flask_app.app_context():
+            self.assertEqual(db.session.get(Article, 1).title, 'Python News')
+
+    def test_writes_go_to_primary_and_pin_client(self):
+        """
+        Test case for writes and read-your-writes.
+
+        - Creates an article through the API.
+        - Asserts that it is stored on the primary and that the writing client gets a pin cookie
+          and reads its own write.
+        """
+        response = self.client.post('/api/articles', json={'title': 'New', 'content': 'Fresh', 'author': 'Writer'})
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(PIN_COOKIE, response.headers['Set-Cookie'])
+
+        with sqlite3.connect(self.replica_path) as connection:
+            self.assertEqual(connection.execute("SELECT count(*) FROM article").fetchone()[0], 1)
+        connection.close()
+
+        # Even with a replica that looks current, the pinned client reads from the primary
+        self.replicate()
+        self.edit_replica('Replica Title')
+        response = self.get('/api/article/1')
+        self.assertEqual(json.loads(response.data)['data']['title'], 'Python News')
+
+        # Another client is not pinned
+        response = self.get('/api/article/1', client=self.flask_app.test_client())
+        self.assertEqual(json.loads(response.data)['data']['title'], 'Replica Title')
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        """
+        Test case for staleness detection.
+
+        - Updates an article on the primary without replicating it.
+        - Asserts that reads use the primary until the replica catches up.
+        """
+        with self.flask_app.app_context():
+            article = db.session.get(Article, 1)
+            article.title = 'Updated Title'
+            db.session.commit()
+
+        response = self.get('/api/article/1')
+        self.assertEqual(json.loads(response.data)['data']['title'], 'Updated Title')
+
+        self.replicate()
+        self.edit_replica('Replica Title')
+        response = self.get('/api/article/1')
+        self.assertEqual(json.loads(response.data)['data']['title'], 'Replica Title')
+
+    def test_lagging_replica_detects_comments_and_deletes(self):
+        """
+        Test case for staleness detection of writes that move no article timestamp.
+
+        - Adds a comment, then deletes an article, on the primary only.
+        - Asserts that reads use the primary after each of them until the replica catches up.
+        """
+        with self.flask_app.app_context():
+            db.session.add(Article(title='Second', content='Content', author='Python Author'))
+            db.session.commit()
+        self.replicate()
+
+        self.client.post('/api/articles/1/comments', json={'author': 'Reader', 'content': 'Nice'})
+        self.edit_replica('Replica Title')
+        response = self.get('/api/article/1', client=self.flask_app.test_client())
+        self.assertEqual(json.loads(response.data)['data']['title'], 'Python News')
+
+        self.replicate()
+        self.client.delete('/api/articles/2')
+        self.edit_replica('Replica Title')
+        response = self.get('/api/articles', client=self.flask_app.test_client())
+        self.assertEqual([item['title'] for item in json.loads(response.data)['data']], ['Python News'])
+
+        self.replicate()
+        self.edit_replica('Replica Title')
+        response = self.get('/api/articles', client=self.flask_app.test_client())
+        self.assertEqual([item['title'] for item in json.loads(response.data)['data']], ['Replica Title'])
+
+    def test_check_interval(self):
+        """
+        Test case for REPLICA_CHECK_INTERVAL.
+
+        - Checks the replica, then writes on the primary only.
+        - Asserts that the check is reused by the following reads despite the write, and redone
+          once it is forgotten.
+        """
+        self.flask_app.config['REPLICA_CHECK_INTERVAL'] = 60
+        self.edit_replica('Replica Title')
+        with patch('app.utils.replica.replica_lag', wraps=replica_lag) as lag:
+            response = self.get('/api/article/1', client=self.flask_app.test_client())
+            self.assertEqual(json.loads(response.data)['data']['title'], 'Replica Title')
+
+            self.client.post('/api/articles/1/comments', json={'author': 'Reader', 'content': 'Nice'})
+            response = self.get('/api/article/1', client=self.flask_app.test_client())
+            self.assertEqual(json.loads(response.data)['data']['title'], 'Replica Title')
+            self.assertEqual(lag.call_count, 1)
+
+            reset_replica_checks()
+            response = self.get('/api/article/1', client=self.flask_app.test_client())
+            self.assertEqual(json.loads(response.data)['data']['title'], 'Python News')
+            self.assertEqual(lag.call_count, 2)
+
+    def test_allowed_lag(self):
+        """
+        Test case for REPLICA_MAX_LAG.
+
+        - Allows a large lag and updates the primary only.
+        - Asserts that the lagging replica keeps serving reads.
+        """
+        self.flask_app.config['REPLICA_MAX_LAG'] = 3600
+        self.edit_replica('Replica Title')
+        with self.flask_app.app_context():
+            article = db.session.get(Article, 1)
+            article.content = 'Changed on the primary'
+            db.session.commit()
+
+        response = self.get('/api/article/1')
+        self.assertEqual(json.loads(response.data)['data']['title'], 'Replica Title')
+
+    def test_unavailable_replica_falls_back_to_primary(self):
+        """
+        Test case for a replica that cannot serve reads.
+
+        - Drops the article table from the replica.
+        - Asserts that reads are still answered from the primary.
+        """
+        with sqlite3.connect(self.replica_path) as connection:
+            connection.execute("DROP TABLE comment")
+            connection.execute("DROP TABLE article")
+        connection.close()
+
+        response = self.get('/api/article/1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['data']['title'], 'Python News')
+
+        response = self.get('/api/articles')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['total_article'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
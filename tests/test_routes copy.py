@@ -1,15 +1,17 @@
 import unittest
 from flask import Flask, json
 from unittest.mock import patch, Mock,MagicMock
-from app import app, db
+from app import db, create_app
 from app.models.article import Article
 from app.models.comment import Comment
 from config import TestingConfig
 
+# Application bound to the testing database
+app = create_app(TestingConfig)
+
 class APITestCase(unittest.TestCase):
 
     def setUp(self):
-        app.config.from_object(TestingConfig)
         self.app = app.test_client()
 
     def tearDown(self):
@@ -52,22 +54,25 @@ class APITestCase(unittest.TestCase):
     #         self.assertEqual(data['data']['content'], 'Job Content')
 
     def test_get_article(self):
-        # Create a mock Article object
-        article = MagicMock()
-        article.id = 1
-        article.title = 'Test Title'
-        article.content = 'Test Content'
-        article.author = 'Test Author'
-
+        # The article is read with column queries (validators, then data), so store a real one
         with app.app_context():
-            with patch('app.models.article.Article.query.get', return_value=article):
-                response = self.app.get('/api/article/1')
+            db.create_all()
+            try:
+                article = Article(title='Test Title', content='Test Content', author='Test Author')
+                db.session.add(article)
+                db.session.commit()
+
+                response = self.app.get(f'/api/article/{article.id}')
                 data = json.loads(response.data)
 
                 self.assertEqual(response.status_code, 200)
                 self.assertIn('data', data)
                 self.assertIn('message', data)
                 self.assertEqual(data['message'], 'Data retrieved successfully')
+                self.assertEqual(data['data']['title'], 'Test Title')
+            finally:
+                db.session.remove()
+                db.drop_all()
 
 
     def test_update_article(self):
@@ -86,7 +91,7 @@ class APITestCase(unittest.TestCase):
         with app.app_context():
             with patch('app.api.routes.db.session', new_callable=self.mock_db_session):
                 # Mock the Article class to return the article_mock
-                with patch('app.api.routes.Article', article_mock):
+                with patch('app.api.handlers.Article', article_mock):
                     response = self.app.put('/api/articles/1', json={'title': 'Updated Title', 'content': 'Updated Content'})
 
                     # Print the raw response content for inspection
@@ -117,15 +122,24 @@ class APITestCase(unittest.TestCase):
 
 
     def test_delete_article(self):
-        article = Article(id=1, title='Test Title', content='Test Content', author='Test Author')
-        with patch('app.api.routes.db.session', new_callable=self.mock_db_session):
-            with patch('app.api.routes.Article', return_value=article):
+        # The article is deleted with one DELETE ... RETURNING statement, which returns its row
+        session = MagicMock()
+        session.execute.return_value.first.return_value = Mock(id=1, author_key='test author', author='Test Author',
+                                                               is_published=True, pub_date=None, comment_count=0)
+        with app.app_context():
+            with patch('app.api.routes.db.session', session), patch('app.api.handlers.notify') as notify:
                 response = self.app.delete('/api/articles/1')
                 data = json.loads(response.data)
 
                 self.assertEqual(response.status_code, 200)
                 self.assertIn('message', data)
                 self.assertEqual(data['message'], 'Article and associated comments deleted successfully')
+                session.commit.assert_called_once()
+                self.assertEqual(notify.call_args.args[0].deleted, {1})
+
+                session.execute.return_value.first.return_value = None
+                response = self.app.delete('/api/articles/1')
+                self.assertEqual(response.status_code, 404)
 
 if __name__ == '__main__':
     unittest.main()
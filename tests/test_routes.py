@@ -1,10 +1,43 @@
+import threading
 import unittest
+from unittest.mock import patch
+from datetime import datetime
+from contextlib import contextmanager
 from flask import Flask, json
-from app import db, app
+from sqlalchemy import event, orm
+from app import db, create_app
 from app.models.article import Article
 from app.models.comment import Comment
+from app.api.routes import response_cache
+from app.utils.response_cache import LocalBackend
+from app.utils.feed import LatestFeed, latest_feed
+from app.utils.changes import ChangeSet
+from app.utils.pagination import SortableFields, article_sort_fields, order_by_clauses
 from config import TestingConfig
 
+# Application bound to the testing database
+app = create_app(TestingConfig)
+
+@contextmanager
+def count_queries():
+    """
+    Collect the SQL statements executed on the database engine while the block runs.
+
+    Yields:
+        List that receives each executed statement string.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
 # Test case class for testing API routes
 class APITestCase(unittest.TestCase):
 
@@ -15,11 +48,12 @@ class APITestCase(unittest.TestCase):
         - Configures the Flask app with the testing configuration.
         - Creates a test client to interact with the app.
         - Creates and initializes the test database.
+        - Empties the response cache, since tables are dropped without deleting articles.
         """
-        app.config.from_object(TestingConfig)  # Use testing configuration
         self.app = app.test_client()
         with app.app_context():
             db.create_all()
+            response_cache.clear()
 
     #Defines a teardown method that runs after each test, cleaning up the testing environment.
     def tearDown(self):
@@ -30,7 +64,6 @@ class APITestCase(unittest.TestCase):
         - Creates a test client to interact with the app.
         - Removes the test database and session.
         """
-        app.config.from_object(TestingConfig)  # Use testing configuration
         self.app = app.test_client()
         with app.app_context():
             db.session.remove()
@@ -400,5 +433,1050 @@ class APITestCase(unittest.TestCase):
             self.assertEqual(len(data['data']), 1)
             self.assertEqual(data['data'][0]['title'], 'Python News')
 
+    def test_get_articles_with_cursor_pagination(self):
+        """
+        Test case for walking the article list with cursor (keyset) pagination.
+
+        - Adds articles sharing sort values so that the id tiebreak is exercised.
+        - Follows next_cursor for every sortable column and both sort orders.
+        - Asserts that every article is returned exactly once and in sort order.
+        """
+        with app.app_context():
+            for i in range(1, 8):
+                article = Article(title=f'Title {i % 3}', content=f'Content {i}', author=f'Author {i % 2}')
+                db.session.add(article)
+            db.session.commit()
+
+            for sort_by in ['id', 'title', 'author', 'pub_date', 'created_at', 'updated_at']:
+                for sort_order in ['asc', 'desc']:
+                    seen = []
+                    url = f'/api/articles?per_page=3&sort_by={sort_by}&sort_order={sort_order}&cursor='
+                    while url:
+                        response = self.app.get(url)
+                        data = json.loads(response.data)
+                        self.assertEqual(response.status_code, 200)
+                        seen.extend(data['data'])
+                        next_cursor = data.get('next_cursor')
+                        url = (f'/api/articles?per_page=3&sort_by={sort_by}&sort_order={sort_order}'
+                               f'&cursor={next_cursor}') if next_cursor else None
+
+                    self.assertEqual(len(seen), 7)
+                    self.assertEqual(len({item['id'] for item in seen}), 7)
+                    expected = sorted(seen, key=lambda item: (item[sort_by] is not None, item[sort_by], item['id']),
+                                      reverse=sort_order == 'desc')
+                    self.assertEqual([item['id'] for item in seen], [item['id'] for item in expected])
+
+    def test_get_articles_cursor_skips_nothing_after_insert(self):
+        """
+        Test case for cursor pagination stability when articles are inserted mid-scroll.
+
+        - Fetches the first cursor page, then inserts an article that sorts before it.
+        - Asserts that the second page continues right after the first one.
+        """
+        with app.app_context():
+            for i in range(1, 5):
+                db.session.add(Article(title=f'Title {i}', content='Content', author='Author'))
+            db.session.commit()
+
+            first = json.loads(self.app.get('/api/articles?per_page=2&sort_by=id&sort_order=desc&cursor=').data)
+            db.session.add(Article(title='Title 5', content='Content', author='Author'))
+            db.session.commit()
+            second = json.loads(self.app.get(
+                f"/api/articles?per_page=2&sort_by=id&sort_order=desc&cursor={first['next_cursor']}").data)
+
+            self.assertEqual([item['id'] for item in first['data']], [4, 3])
+            self.assertEqual([item['id'] for item in second['data']], [2, 1])
+            self.assertIsNone(second['next_cursor'])
+
+    def test_get_articles_invalid_cursor(self):
+        """
+        Test case for rejecting malformed cursors and cursors issued for another sort order.
+
+        - Sends a garbage cursor and a cursor from a different sort_by.
+        - Asserts that both requests fail with a 400 status code.
+        """
+        with app.app_context():
+            for i in range(1, 4):
+                db.session.add(Article(title=f'Title {i}', content='Content', author='Author'))
+            db.session.commit()
+
+            response = self.app.get('/api/articles?cursor=not-a-cursor')
+            self.assertEqual(response.status_code, 400)
+
+            data = json.loads(self.app.get('/api/articles?per_page=1&sort_by=title&cursor=').data)
+            response = self.app.get(f"/api/articles?per_page=1&sort_by=author&cursor={data['next_cursor']}")
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('message', json.loads(response.data))
+
+    def test_get_articles_counts_total_once(self):
+        """
+        Test case for counting the total only once per list request.
+
+        - Adds more articles than fit on one page.
+        - Asserts that a single COUNT query runs, that the total is then served from the cache
+          (also for filters differing only in case or spacing), and that creating an article
+          invalidates the cached total.
+        """
+        with app.app_context():
+            for i in range(1, 13):
+                db.session.add(Article(title=f'Title {i}', content='Content', author='Author'))
+            db.session.commit()
+
+            with count_queries() as statements:
+                data = json.loads(self.app.get('/api/articles?author=author').data)
+            self.assertEqual(data['total_article'], 12)
+            self.assertEqual(sum('count(' in statement.lower() for statement in statements), 1)
+
+            with count_queries() as statements:
+                data = json.loads(self.app.get('/api/articles?author=AUTHOR&page=2').data)
+            self.assertEqual(data['total_article'], 12)
+            self.assertEqual(sum('count(' in statement.lower() for statement in statements), 0)
+
+            with count_queries() as statements:
+                self.app.get('/api/articles?keyword=title&page=2')
+                data = json.loads(self.app.get('/api/articles?keyword=%20TITLE%20&page=2').data)
+            self.assertEqual(data['total_article'], 12)
+            self.assertEqual(sum('count(' in statement.lower() for statement in statements), 1)
+
+            self.app.post('/api/articles', json={'title': 'New', 'content': 'New Content', 'author': 'Author'})
+            data = json.loads(self.app.get('/api/articles?author=author').data)
+            self.assertEqual(data['total_article'], 13)
+
+    def test_get_articles_without_total(self):
+        """
+        Test case for skipping the total count with include_total=false.
+
+        - Adds articles and requests a page without the total.
+        - Asserts that no COUNT query runs and that total_article is omitted.
+        """
+        with app.app_context():
+            for i in range(1, 13):
+                db.session.add(Article(title=f'Title {i}', content='Content', author='Author'))
+            db.session.commit()
+
+            with count_queries() as statements:
+                data = json.loads(self.app.get('/api/articles?include_total=false&keyword=Title').data)
+            self.assertEqual(len(data['data']), 10)
+            self.assertNotIn('total_article', data)
+            self.assertFalse(any('count(' in statement.lower() for statement in statements))
+
+    def test_search_articles_ranked(self):
+        """
+        Test case for the ranked full-text search endpoint.
+
+        - Adds articles matching a term in the title, in the content, and not at all.
+        - Asserts that title matches rank first and that matches are highlighted in escaped text.
+        - Asserts that updates and deletes keep the search index in sync.
+        """
+        with app.app_context():
+            in_content = Article(title='Web frameworks', content='Flask is a Python microframework', author='A')
+            in_title = Article(title='Python <script>alert(1)</script> tips', content='Small tricks for everyday code', author='B')
+            unrelated = Article(title='Gardening', content='Tomatoes need sun', author='C')
+            db.session.add_all([in_content, in_title, unrelated])
+            db.session.commit()
+
+            data = json.loads(self.app.get('/api/articles/search?q=pyth').data)
+            self.assertEqual([item['id'] for item in data['data']], [in_title.id, in_content.id])
+            self.assertEqual(data['data'][0]['highlight']['title'],
+                             '<mark>Python</mark> &lt;script&gt;alert(1)&lt;/script&gt; tips')
+            self.assertIn('<mark>Python</mark>', data['data'][1]['highlight']['content'])
+
+            self.app.put(f'/api/articles/{unrelated.id}', json={'content': 'Python in the garden'})
+            self.app.delete(f'/api/articles/{in_title.id}')
+            data = json.loads(self.app.get('/api/articles/search?q=python').data)
+            self.assertEqual({item['id'] for item in data['data']}, {in_content.id, unrelated.id})
+
+            response = self.app.get('/api/articles/search?q=%20')
+            self.assertEqual(response.status_code, 400)
+
+    def test_get_articles_keyword_filter_fallback(self):
+        """
+        Test case for the substring keyword filter used when full-text search is disabled.
+
+        - Forces the 'like' search backend.
+        - Asserts that keywords still match inside words and that quotes in keywords are harmless.
+        """
+        with app.app_context():
+            db.session.add_all([
+                Article(title='Python News', content='Latest Python updates', author='A'),
+                Article(title='Flask Tutorial', content='Learn Flask step by step', author='B'),
+            ])
+            db.session.commit()
+
+            response = self.app.get('/api/articles?keyword="Python OR')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([item['title'] for item in json.loads(response.data)['data']], [])
+
+            app.config['SEARCH_BACKEND'] = 'like'
+            try:
+                data = json.loads(self.app.get('/api/articles?keyword=ytho').data)
+            finally:
+                app.config['SEARCH_BACKEND'] = 'auto'
+            self.assertEqual([item['title'] for item in data['data']], ['Python News'])
+
+    def test_article_comment_loading_query_counts(self):
+        """
+        Test case for the number of SQL queries used to embed comments.
+
+        - Adds several articles with comments.
+        - Asserts the query count of the list and single-article endpoints for each loading strategy
+          (each count includes the one query that computes the ETag).
+        - Asserts that capped embedding returns the newest comments and the full comment count.
+        """
+        with app.app_context():
+            articles = [Article(title=f'Title {i}', content='Content', author='Author') for i in range(5)]
+            db.session.add_all(articles)
+            db.session.commit()
+            for article in articles:
+                db.session.add_all([Comment(author=f'C{j}', content=f'Comment {j}', article=article) for j in range(4)])
+            db.session.commit()
+            article_id = articles[0].id
+            db.session.remove()
+
+            with count_queries() as statements:
+                data = json.loads(self.app.get('/api/articles?include_total=false').data)
+            self.assertEqual(len(statements), 2)
+            self.assertNotIn('comments', data['data'][0])
+
+            with count_queries() as statements:
+                data = json.loads(self.app.get('/api/articles?include=comments&include_total=false').data)
+            self.assertEqual(len(statements), 3)
+            self.assertEqual([len(item['comments']) for item in data['data']], [4] * 5)
+            self.assertEqual([item['comment_count'] for item in data['data']], [4] * 5)
+
+            with count_queries() as statements:
+                data = json.loads(self.app.get('/api/articles?comments_limit=2&include_total=false').data)
+            self.assertEqual(len(statements), 3)
+            self.assertEqual([comment['content'] for comment in data['data'][0]['comments']],
+                             ['Comment 3', 'Comment 2'])
+            self.assertEqual(data['data'][0]['comment_count'], 4)
+
+            with count_queries() as statements:
+                data = json.loads(self.app.get(f'/api/article/{article_id}').data)
+            self.assertEqual(len(statements), 3)
+            self.assertEqual(len(data['data']['comments']), 4)
+
+            with count_queries() as statements:
+                data = json.loads(self.app.get(f'/api/article/{article_id}?include=').data)
+            self.assertEqual(len(statements), 2)
+            self.assertNotIn('comments', data['data'])
+
+            with count_queries() as statements:
+                data = json.loads(self.app.get(f'/api/article/{article_id}?comments_limit=1').data)
+            self.assertEqual(len(statements), 3)
+            self.assertEqual(len(data['data']['comments']), 1)
+            self.assertEqual(data['data']['comment_count'], 4)
+
+    def test_get_comments_paginated(self):
+        """
+        Test case for listing an article's comments with cursor pagination.
+
+        - Creates an article with comments.
+        - Follows next_cursor until the last page in both sort orders.
+        - Asserts that every comment is returned once and in order, and that unknown articles give 404.
+        """
+        with app.app_context():
+            article = Article(title='Test Title', content='Test Content', author='Test Author')
+            db.session.add(article)
+            db.session.commit()
+            db.session.add_all([Comment(author='Commenter', content=f'Comment {i}', article=article) for i in range(5)])
+            db.session.commit()
+
+            for sort_order, expected in [('asc', [0, 1, 2, 3, 4]), ('desc', [4, 3, 2, 1, 0])]:
+                seen = []
+                url = f'/api/articles/{article.id}/comments?per_page=2&sort_order={sort_order}'
+                while url:
+                    response = self.app.get(url)
+                    data = json.loads(response.data)
+                    self.assertEqual(response.status_code, 200)
+                    seen.extend(comment['content'] for comment in data['data'])
+                    url = (f"/api/articles/{article.id}/comments?per_page=2&sort_order={sort_order}"
+                           f"&cursor={data['next_cursor']}") if data['next_cursor'] else None
+                self.assertEqual(seen, [f'Comment {i}' for i in expected])
+
+            response = self.app.get('/api/articles/999/comments')
+            self.assertEqual(response.status_code, 404)
+
+    def test_get_comments_ndjson_stream(self):
+        """
+        Test case for streaming an article's comments as NDJSON.
+
+        - Creates an article with comments.
+        - Requests the stream with the format argument and with the Accept header.
+        - Asserts that each line is one comment in chronological order.
+        """
+        with app.app_context():
+            article = Article(title='Test Title', content='Test Content', author='Test Author')
+            db.session.add(article)
+            db.session.commit()
+            db.session.add_all([Comment(author='Commenter', content=f'Comment {i}', article=article) for i in range(7)])
+            db.session.commit()
+
+            for url, headers in [(f'/api/articles/{article.id}/comments?format=ndjson', {}),
+                                 (f'/api/articles/{article.id}/comments', {'Accept': 'application/x-ndjson'})]:
+                response = self.app.get(url, headers=headers)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.mimetype, 'application/x-ndjson')
+                lines = response.get_data(as_text=True).splitlines()
+                self.assertEqual([json.loads(line)['content'] for line in lines], [f'Comment {i}' for i in range(7)])
+
+    def test_create_articles_bulk(self):
+        """
+        Test case for bulk article creation from a JSON array.
+
+        - Sends valid and invalid articles with a small batch size.
+        - Asserts that valid articles are inserted with executemany batches and invalid ones are reported.
+        """
+        with app.app_context():
+            items = [{'title': f'Title {i}', 'content': 'Content', 'author': 'Author'} for i in range(5)]
+            items.insert(2, {'title': '', 'content': 'Content', 'author': 'Author'})
+            items.append('not an object')
+
+            with count_queries() as statements:
+                response = self.app.post('/api/articles/bulk?batch_size=2', json=items)
+            data = json.loads(response.data)
+
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(data['inserted'], 5)
+            self.assertEqual([error['index'] for error in data['errors']], [2, 6])
+            self.assertIn('title', data['errors'][0]['errors'])
+            self.assertEqual(sum(statement.startswith('INSERT INTO article ') for statement in statements), 3)
+            self.assertEqual(Article.query.count(), 5)
+
+            response = self.app.post('/api/articles/bulk', json=[{'title': 'Missing content'}])
+            self.assertEqual(response.status_code, 400)
+
+    def test_create_comments_bulk_ndjson(self):
+        """
+        Test case for bulk comment creation from an NDJSON stream.
+
+        - Streams comments, including a malformed line, for an existing article.
+        - Asserts that valid comments are stored for the article and bad lines are reported.
+        - Asserts that an unknown article gives 404.
+        """
+        with app.app_context():
+            article = Article(title='Test Title', content='Test Content', author='Test Author')
+            db.session.add(article)
+            db.session.commit()
+
+            lines = [json.dumps({'author': 'Commenter', 'content': f'Comment {i}'}) for i in range(3)]
+            lines.insert(1, '{not json')
+            response = self.app.post(f'/api/articles/{article.id}/comments/bulk', data='\n'.join(lines),
+                                     content_type='application/x-ndjson')
+            data = json.loads(response.data)
+
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(data['inserted'], 3)
+            self.assertEqual([error['index'] for error in data['errors']], [1])
+            self.assertEqual(Comment.query.filter_by(article_id=article.id).count(), 3)
+
+            response = self.app.post('/api/articles/999/comments/bulk', json=[])
+            self.assertEqual(response.status_code, 404)
+
+    def test_response_cache_hits_and_invalidation(self):
+        """
+        Test case for the response cache of article reads.
+
+        - Reads an article and a list twice and asserts the second read is a cache hit without SQL.
+        - Asserts that updates, comments and new articles invalidate exactly the affected responses.
+        """
+        with app.app_context():
+            first = Article(title='First', content='Content', author='Author')
+            second = Article(title='Second', content='Content', author='Author')
+            db.session.add_all([first, second])
+            db.session.commit()
+            first_id, second_id = first.id, second.id
+
+            self.assertEqual(self.app.get(f'/api/article/{first_id}').headers['X-Cache'], 'MISS')
+            with count_queries() as statements:
+                response = self.app.get(f'/api/article/{first_id}')
+            self.assertEqual(response.headers['X-Cache'], 'HIT')
+            self.assertEqual(statements, [])
+            self.app.get(f'/api/article/{second_id}')
+            self.app.get('/api/articles?sort_by=title')
+            self.assertEqual(self.app.get('/api/articles?sort_by=title').headers['X-Cache'], 'HIT')
+
+            # Updating one article only invalidates that article (and the lists)
+            self.app.put(f'/api/articles/{first_id}', json={'title': 'First updated'})
+            response = self.app.get(f'/api/article/{first_id}')
+            self.assertEqual(response.headers['X-Cache'], 'MISS')
+            self.assertEqual(json.loads(response.data)['data']['title'], 'First updated')
+            self.assertEqual(self.app.get(f'/api/article/{second_id}').headers['X-Cache'], 'HIT')
+            self.assertEqual(self.app.get('/api/articles?sort_by=title').headers['X-Cache'], 'MISS')
+
+            # New comments invalidate the commented article
+            self.app.post(f'/api/articles/{second_id}/comments', json={'author': 'C', 'content': 'Hello'})
+            response = self.app.get(f'/api/article/{second_id}')
+            self.assertEqual(response.headers['X-Cache'], 'MISS')
+            self.assertEqual(len(json.loads(response.data)['data']['comments']), 1)
+
+            # New articles invalidate the lists
+            self.app.post('/api/articles', json={'title': 'Third', 'content': 'Content', 'author': 'Author'})
+            data = json.loads(self.app.get('/api/articles?sort_by=title').data)
+            self.assertEqual(len(data['data']), 3)
+
+            stats = json.loads(self.app.get('/api/cache/stats').data)['data']
+            self.assertGreater(stats['hits'], 0)
+            self.assertGreater(stats['misses'], 0)
+
+    def test_response_cache_generations(self):
+        """
+        Test case for the generation counters of the local response cache.
+
+        - Bumps more keys than the backend keeps counters for.
+        - Asserts that the counters stay bounded and that no key ever returns to a generation it
+          had before a bump.
+        - Asserts that each application gets its own backend and that creating an article does
+          not add a counter.
+        """
+        backend = LocalBackend(maxsize=16, max_generations=4)
+        seen = {}
+        for _ in range(3):
+            for key in [f'article:{i}' for i in range(10)]:
+                seen.setdefault(key, set()).add(backend.generation(key))
+                backend.bump([key])
+                self.assertNotIn(backend.generation(key), seen[key])
+        self.assertEqual(len(backend.generations), 4)
+        self.assertTrue(all(backend.generation(key) not in generations for key, generations in seen.items()))
+
+        other = create_app(TestingConfig)
+        with app.app_context():
+            with other.app_context():
+                self.assertIsNot(response_cache.backend, app.extensions.get('response_cache'))
+            response = self.app.post('/api/articles', json={'title': 'New', 'content': 'Content', 'author': 'Author'})
+            article_id = json.loads(response.data)['data']['id']
+            self.assertNotIn(f'article:{article_id}', response_cache.backend.generations)
+            self.assertIn('list', response_cache.backend.generations)
+
+    def test_get_article_conditional_requests(self):
+        """
+        Test case for ETag and Last-Modified handling of single-article reads.
+
+        - Asserts that new articles get an updated_at value and responses carry validators.
+        - Asserts that If-None-Match and If-Modified-Since give 304 with a single validator query.
+        - Asserts that updates and new comments change the ETag.
+        """
+        with app.app_context():
+            article = Article(title='Test Title', content='Test Content', author='Test Author')
+            db.session.add(article)
+            db.session.commit()
+            self.assertIsNotNone(article.updated_at)
+            url = f'/api/article/{article.id}'
+
+            response = self.app.get(url)
+            etag = response.headers['ETag']
+            last_modified = response.headers['Last-Modified']
+
+            # Cached responses answer from their stored validators without any query
+            with count_queries() as statements:
+                response = self.app.get(url, headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(statements, [])
+
+            # Otherwise only the validator query runs
+            response_cache.clear()
+            with count_queries() as statements:
+                response = self.app.get(url, headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.data, b'')
+            self.assertEqual(len(statements), 1)
+
+            response = self.app.get(url, headers={'If-Modified-Since': last_modified})
+            self.assertEqual(response.status_code, 304)
+
+            # Another representation of the same article has its own ETag
+            self.assertNotEqual(self.app.get(f'{url}?include=').headers['ETag'], etag)
+
+            self.app.post(f'/api/articles/{article.id}/comments', json={'author': 'C', 'content': 'Hello'})
+            response = self.app.get(url, headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 200)
+            commented_etag = response.headers['ETag']
+
+            self.app.put(f'/api/articles/{article.id}', json={'title': 'New Title'})
+            response = self.app.get(url, headers={'If-None-Match': commented_etag})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(json.loads(response.data)['data']['title'], 'New Title')
+
+            self.assertNotIn('ETag', self.app.get('/api/article/999').headers)
+
+    def test_get_articles_conditional_requests(self):
+        """
+        Test case for the aggregate-based validator of article lists.
+
+        - Asserts that an unchanged list gives 304 without counting the articles, and that
+          creates and deletes (through the API or the ORM) change the ETag, while deletes that
+          match no article leave it unchanged.
+        """
+        with app.app_context():
+            article = Article(title='Test Title', content='Test Content', author='Test Author')
+            db.session.add(article)
+            db.session.commit()
+
+            etag = self.app.get('/api/articles').headers['ETag']
+            self.assertTrue(etag.startswith('W/'))
+            self.assertEqual(self.app.get('/api/articles', headers={'If-None-Match': etag}).status_code, 304)
+
+            self.app.post('/api/articles', json={'title': 'New', 'content': 'New Content', 'author': 'Author'})
+            response = self.app.get('/api/articles', headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 200)
+            etag = response.headers['ETag']
+
+            # Validated with index lookups only, without counting the articles
+            response_cache.clear()
+            with count_queries() as statements:
+                self.assertEqual(self.app.get('/api/articles', headers={'If-None-Match': etag}).status_code, 304)
+            self.assertEqual(len(statements), 1)
+            self.assertNotIn('count(', statements[0].lower())
+
+            # Deleting an older article moves no maximum, only the deletion generation
+            article_id = article.id
+            self.app.delete(f'/api/articles/{article_id}')
+            response = self.app.get('/api/articles', headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 200)
+            etag = response.headers['ETag']
+
+            # Deletes that match no article change nothing
+            self.assertEqual(self.app.delete(f'/api/articles/{article_id}').status_code, 404)
+            self.assertEqual(self.app.delete('/api/articles/bulk', json={'ids': [article_id]}).json['deleted'], 0)
+            response_cache.clear()
+            self.assertEqual(self.app.get('/api/articles', headers={'If-None-Match': etag}).status_code, 304)
+
+            db.session.add(Article(title='Newest', content='Content', author='Author'))
+            db.session.commit()
+            etag = self.app.get('/api/articles').headers['ETag']
+            db.session.delete(db.session.scalars(db.select(Article).filter_by(title='New')).one())
+            db.session.commit()
+            self.assertEqual(self.app.get('/api/articles', headers={'If-None-Match': etag}).status_code, 200)
+
+    def test_comment_count_maintained(self):
+        """
+        Test case for the denormalized comment count of articles.
+
+        - Adds comments one by one and in bulk (with a rejected item).
+        - Asserts that comment_count is returned by list and single-article reads without
+          embedding comments, and that adding comments leaves updated_at unchanged.
+        """
+        with app.app_context():
+            article = Article(title='Test Title', content='Test Content', author='Test Author')
+            db.session.add(article)
+            db.session.commit()
+            article_id, updated_at = article.id, article.updated_at
+
+            self.app.post(f'/api/articles/{article_id}/comments', json={'author': 'Commenter', 'content': 'First'})
+            self.app.post(f'/api/articles/{article_id}/comments/bulk?batch_size=2',
+                          json=[{'author': 'A', 'content': 'Bulk 1'}, {'author': 'A'}, {'author': 'A', 'content': 'Bulk 2'}])
+
+            data = json.loads(self.app.get('/api/articles').data)
+            self.assertEqual(data['data'][0]['comment_count'], 3)
+            data = json.loads(self.app.get(f'/api/article/{article_id}?include=').data)
+            self.assertEqual(data['data']['comment_count'], 3)
+            db.session.expire_all()
+            self.assertEqual(db.session.get(Article, article_id).updated_at, updated_at)
+
+    def test_sort_by_comment_count(self):
+        """
+        Test case for listing the most discussed articles first.
+
+        - Creates articles with different numbers of comments.
+        - Asserts the order of sort_by=comment_count in both directions and with cursors.
+        """
+        with app.app_context():
+            articles = [Article(title=f'Title {i}', content='Content', author='Author') for i in range(3)]
+            db.session.add_all(articles)
+            db.session.commit()
+            for article, count in zip(articles, [1, 3, 2]):
+                db.session.add_all([Comment(author='C', content='Comment', article=article) for _ in range(count)])
+            db.session.commit()
+
+            data = json.loads(self.app.get('/api/articles?sort_by=comment_count&sort_order=desc').data)
+            self.assertEqual([item['title'] for item in data['data']], ['Title 1', 'Title 2', 'Title 0'])
+            self.assertEqual([item['comment_count'] for item in data['data']], [3, 2, 1])
+
+            data = json.loads(self.app.get('/api/articles?sort_by=comment_count&per_page=2&cursor=').data)
+            self.assertEqual([item['comment_count'] for item in data['data']], [1, 2])
+            data = json.loads(self.app.get(f"/api/articles?sort_by=comment_count&per_page=2&cursor={data['next_cursor']}").data)
+            self.assertEqual([item['comment_count'] for item in data['data']], [3])
+
+    def test_reconcile_comment_counts(self):
+        """
+        Test case for the reconcile-comment-counts command.
+
+        - Corrupts the stored count of an article.
+        - Asserts that the command restores it and reports the number of corrected articles.
+        """
+        with app.app_context():
+            article = Article(title='Test Title', content='Test Content', author='Test Author')
+            db.session.add(article)
+            db.session.commit()
+            self.app.post(f'/api/articles/{article.id}/comments', json={'author': 'Commenter', 'content': 'First'})
+            db.session.execute(db.update(Article.__table__).values(comment_count=7))
+            db.session.commit()
+
+            result = app.test_cli_runner().invoke(args=['reconcile-comment-counts'])
+            self.assertIn('1 article comment counts corrected', result.output)
+            data = json.loads(self.app.get(f'/api/article/{article.id}?include=').data)
+            self.assertEqual(data['data']['comment_count'], 1)
+
+    def test_get_articles_sparse_fields(self):
+        """
+        Test case for sparse fieldsets and the summary view of article lists.
+
+        - Asserts that only the requested fields (and the id) are returned and that the content
+          column is not read when it is not requested.
+        - Asserts that the summary view returns an excerpt of the content cut by the database.
+        - Asserts that cursors work when the sort field is not returned and that unknown fields
+          and views are rejected.
+        """
+        with app.app_context():
+            db.session.add_all([Article(title=f'Title {i}', content='x' * 500, author=f'Author {i}') for i in range(3)])
+            db.session.commit()
+
+            with count_queries() as statements:
+                data = json.loads(self.app.get('/api/articles?fields=title,author,pub_date&include_total=false').data)
+            self.assertEqual(set(data['data'][0]), {'id', 'title', 'author', 'pub_date'})
+            self.assertNotIn('article.content', statements[-1])
+
+            with count_queries() as statements:
+                data = json.loads(self.app.get('/api/articles?view=summary').data)
+            self.assertEqual(set(data['data'][0]),
+                             {'id', 'title', 'author', 'pub_date', 'comment_count', 'excerpt'})
+            self.assertEqual(data['data'][0]['excerpt'], 'x' * 200)
+            self.assertIn('substr(article.content', statements[-1])
+
+            data = json.loads(self.app.get('/api/articles?fields=title&sort_by=author&sort_order=desc&per_page=2&cursor=').data)
+            self.assertEqual([item['title'] for item in data['data']], ['Title 2', 'Title 1'])
+            data = json.loads(self.app.get(f"/api/articles?fields=title&sort_by=author&sort_order=desc&per_page=2&cursor={data['next_cursor']}").data)
+            self.assertEqual([item['title'] for item in data['data']], ['Title 0'])
+
+            self.assertEqual(self.app.get('/api/articles?fields=title,password').status_code, 400)
+            self.assertEqual(self.app.get('/api/articles?view=tiny').status_code, 400)
+            self.assertEqual(self.app.get('/api/articles?view=summary&fields=title').status_code, 400)
+
+    def test_get_articles_multi_key_sort(self):
+        """
+        Test case for sorting by several fields with the sort parameter.
+
+        - Adds articles sharing authors.
+        - Asserts the order of sort=-author,title and that cursors follow it across pages.
+        """
+        with app.app_context():
+            db.session.add_all([Article(title=title, content='Content', author=author)
+                                for title, author in [('B', 'X'), ('A', 'Y'), ('C', 'X'), ('A', 'X'), ('B', 'Y')]])
+            db.session.commit()
+            expected = [('Y', 'A'), ('Y', 'B'), ('X', 'A'), ('X', 'B'), ('X', 'C')]
+
+            data = json.loads(self.app.get('/api/articles?sort=-author,title').data)
+            self.assertEqual([(item['author'], item['title']) for item in data['data']], expected)
+
+            seen, cursor = [], ''
+            while cursor is not None:
+                data = json.loads(self.app.get(f'/api/articles?sort=-author,%2Btitle&per_page=2&cursor={cursor}').data)
+                seen += [(item['author'], item['title']) for item in data['data']]
+                cursor = data['next_cursor']
+            self.assertEqual(seen, expected)
+
+    def test_get_articles_rejects_unsortable_fields(self):
+        """
+        Test case for the sortable-field whitelist.
+
+        - Asserts that unindexed or unknown fields, duplicate fields and too many fields are
+          rejected with 400 and a message listing the sortable fields.
+        """
+        response = self.app.get('/api/articles?sort_by=content')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('sortable fields: id, pub_date', json.loads(response.data)['message'])
+        for sort in ['-pub_date,is_published', '__class__', 'title,-title', 'title,author,pub_date,created_at', ',']:
+            self.assertEqual(self.app.get(f'/api/articles?sort={sort}').status_code, 400, sort)
+
+        with self.assertRaises(ValueError):
+            SortableFields(Article, ['content'])
+
+    def test_sortable_fields_use_indexes(self):
+        """
+        Test case for the query plans of the sortable fields.
+
+        - Asserts that SQLite reads every registered sort order from an index, without sorting
+          the table, and only sorts ties for a secondary key.
+        """
+        with app.app_context():
+            def plan(fields):
+                statement = (db.select(Article.id)
+                             .order_by(*order_by_clauses(article_sort_fields.keys(fields)))
+                             .limit(10))
+                sql = str(statement.compile(db.engine, compile_kwargs={'literal_binds': True}))
+                return str(db.session.execute(db.text(f'EXPLAIN QUERY PLAN {sql}')).all())
+
+            for name in article_sort_fields.columns:
+                for descending in (False, True):
+                    self.assertNotIn('TEMP B-TREE', plan([(name, descending)]), name)
+            self.assertIn('RIGHT PART OF ORDER BY', plan([('pub_date', True), ('title', False)]))
+
+    def test_delete_article_cascades_comments(self):
+        """
+        Test case for deleting an article together with its comments.
+
+        - Creates an article with comments.
+        - Asserts that a single DELETE statement removes the article and, through the foreign key
+          cascade, its comments; the other statements only count the delete and update the
+          author aggregates.
+        """
+        with app.app_context():
+            article = Article(title='Test Title', content='Test Content', author='Test Author')
+            db.session.add(article)
+            db.session.add_all([Comment(author='Commenter', content='Nice', article=article) for _ in range(3)])
+            db.session.commit()
+            article_id = article.id
+            db.session.remove()
+
+            with count_queries() as statements:
+                response = self.app.delete(f'/api/articles/{article_id}')
+            self.assertEqual(response.status_code, 200)
+            deletes = [statement for statement in statements if statement.startswith('DELETE FROM article ')]
+            self.assertEqual(len(deletes), 1)
+            # The other statements only count the delete and maintain the author's aggregates
+            self.assertTrue(all(statement.startswith('UPDATE article_deletions') or 'author_stats' in statement
+                                or statement.startswith('SELECT article.author_key')
+                                for statement in statements if statement not in deletes), statements)
+            self.assertEqual(db.session.query(Comment).count(), 0)
+
+    def test_bulk_delete_articles(self):
+        """
+        Test case for deleting many articles at once.
+
+        - Deletes articles by id list in batches, ignoring unknown ids.
+        - Deletes articles by author and publication date.
+        - Asserts the reported counts, that comments are removed with their articles and that
+          cached list responses are invalidated.
+        - Asserts that requests without a selection or with invalid ids are rejected.
+        """
+        with app.app_context():
+            articles = [Article(title=f'Title {i}', content='Content', author='Old' if i < 3 else 'New',
+                                pub_date=datetime(2020 + i, 1, 1)) for i in range(6)]
+            db.session.add_all(articles)
+            db.session.commit()
+            for article in articles:
+                db.session.add_all([Comment(author='C', content='Comment', article=article) for _ in range(2)])
+            db.session.commit()
+            ids = [article.id for article in articles]
+            self.assertEqual(json.loads(self.app.get('/api/articles').data)['total_article'], 6)
+
+            response = self.app.delete('/api/articles/bulk?batch_size=2', json={'ids': ids[3:] + [999]})
+            data = json.loads(response.data)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual((data['deleted'], data['comments_deleted'], data['batches']), (3, 6, 2))
+            self.assertEqual(sorted(data['ids']), ids[3:])
+            self.assertEqual(json.loads(self.app.get('/api/articles').data)['total_article'], 3)
+
+            response = self.app.delete('/api/articles/bulk?batch_size=1',
+                                       json={'author': 'old', 'older_than': '2022-01-01T00:00:00'})
+            data = json.loads(response.data)
+            self.assertEqual((data['deleted'], data['comments_deleted'], data['batches']), (2, 4, 3))
+            self.assertEqual(sorted(data['ids']), ids[:2])
+            self.assertEqual(db.session.query(Comment).count(), 2)
+
+            self.assertEqual(self.app.delete('/api/articles/bulk', json={}).status_code, 400)
+            self.assertEqual(self.app.delete('/api/articles/bulk', json={'ids': ['1']}).status_code, 400)
+            self.assertEqual(self.app.delete('/api/articles/bulk', json={'older_than': 'yesterday'}).status_code, 400)
+            self.assertEqual(db.session.query(Article).count(), 1)
+
+    def test_patch_article(self):
+        """
+        Test case for partially updating an article.
+
+        - Sends a PATCH request with only the title.
+        - Asserts that one UPDATE ... RETURNING statement writes the title, increments the version
+          and returns the article with the ETag a GET of it returns, leaving the other fields as they were.
+        - Asserts that invalid, empty and unknown-article requests are rejected.
+        """
+        with app.app_context():
+            article = Article(title='Test Title', content='Test Content', author='Test Author')
+            db.session.add(article)
+            db.session.commit()
+            article_id = article.id
+            db.session.remove()
+
+            with count_queries() as statements:
+                response = self.app.patch(f'/api/articles/{article_id}', json={'title': 'New Title'})
+            data = json.loads(response.data)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(statements), 1)
+            self.assertTrue(statements[0].startswith('UPDATE article SET title=?'))
+            self.assertNotIn('content', statements[0].split('RETURNING')[0])
+            self.assertEqual((data['data']['title'], data['data']['content']), ('New Title', 'Test Content'))
+            self.assertEqual(data['data']['version'], 2)
+            # The response carries the validators of a GET of the updated article
+            etag = response.headers['ETag']
+            self.assertTrue(etag.startswith('"v2.'))
+            self.assertEqual(self.app.get(f'/api/article/{article_id}', headers={'If-None-Match': etag}).status_code, 304)
+
+            self.assertEqual(self.app.patch(f'/api/articles/{article_id}', json={}).status_code, 400)
+            response = self.app.patch(f'/api/articles/{article_id}', json={'title': '', 'views': 1})
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(set(json.loads(response.data)['errors']), {'title', 'views'})
+            self.assertEqual(self.app.patch('/api/articles/6463', json={'title': 'Title'}).status_code, 404)
+
+    def test_update_article_preconditions(self):
+        """
+        Test case for optimistic concurrency on article updates.
+
+        - Reads an article and updates it with its ETag in If-Match.
+        - Asserts that a second update sent with the now stale ETag fails with 412, for PATCH and PUT,
+          and that the stored article keeps the first update.
+        - Asserts that a PUT whose article changed between load and commit fails with 409, and that
+          the ETag of a successful PUT validates the next GET.
+        """
+        with app.app_context():
+            article = Article(title='Test Title', content='Test Content', author='Test Author')
+            db.session.add(article)
+            db.session.commit()
+            article_id = article.id
+
+            etag = self.app.get(f'/api/article/{article_id}').headers['ETag']
+            self.assertTrue(etag.startswith('"v1.'))
+            response = self.app.patch(f'/api/articles/{article_id}', json={'title': 'First'},
+                                      headers={'If-Match': etag})
+            self.assertEqual(response.status_code, 200)
+
+            response = self.app.patch(f'/api/articles/{article_id}', json={'title': 'Second'},
+                                      headers={'If-Match': etag})
+            self.assertEqual(response.status_code, 412)
+            response = self.app.put(f'/api/articles/{article_id}', json={'title': 'Second'},
+                                    headers={'If-Match': etag})
+            self.assertEqual(response.status_code, 412)
+
+            response = self.app.get(f'/api/article/{article_id}')
+            self.assertEqual(json.loads(response.data)['data']['title'], 'First')
+            self.assertTrue(response.headers['ETag'].startswith('"v2.'))
+            response = self.app.put(f'/api/articles/{article_id}', json={'title': 'Third'},
+                                    headers={'If-Match': response.headers['ETag']})
+            self.assertEqual(response.status_code, 200)
+            etag = response.headers['ETag']
+            self.assertTrue(etag.startswith('"v3.'))
+            response = self.app.get(f'/api/article/{article_id}', headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 304)
+
+            # Another writer commits between the PUT's load and its flush
+            def concurrent_update(session, flush_context, instances):
+                with db.engine.begin() as connection:
+                    connection.execute(db.update(Article.__table__).where(Article.__table__.c.id == article_id)
+                                       .values(version=Article.__table__.c.version + 1))
+
+            db.session.remove()
+            event.listen(db.session, 'before_flush', concurrent_update)
+            try:
+                response = self.app.put(f'/api/articles/{article_id}', json={'title': 'Lost'})
+            finally:
+                event.remove(db.session, 'before_flush', concurrent_update)
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(db.session.get(Article, article_id).title, 'Third')
+
+    def test_latest_feed(self):
+        """
+        Test case for the in-memory feed of the newest published articles.
+
+        - Asserts that pages list published articles newest first and are served without queries.
+        - Creates, updates, comments on and deletes articles, and asserts that the feed follows
+          each change while only re-reading the changed articles.
+        - Asserts that a feed shortened by a delete is refilled from older articles.
+        """
+        with app.app_context():
+            latest_feed.clear()
+            articles = [Article(title=f'Title {i}', content='Content ' * 100, author='Author',
+                                pub_date=datetime(2024, 1, 1 + i)) for i in range(5)]
+            articles.append(Article(title='Draft', content='Draft', author='Author', is_published=False,
+                                    pub_date=datetime(2024, 2, 1)))
+            db.session.add_all(articles)
+            db.session.commit()
+            ids = [article.id for article in articles]
+            app.config['FEED_SIZE'] = 4
+            try:
+                data = json.loads(self.app.get('/api/articles/latest?per_page=3').data)
+                self.assertEqual([item['title'] for item in data['data']], ['Title 4', 'Title 3', 'Title 2'])
+                self.assertEqual(set(data['data'][0]), {'id', 'title', 'author', 'pub_date', 'comment_count', 'excerpt'})
+                with count_queries() as statements:
+                    data = json.loads(self.app.get(f"/api/articles/latest?per_page=3&cursor={data['next_cursor']}").data)
+                self.assertEqual(statements, [])
+                self.assertEqual([item['title'] for item in data['data']], ['Title 1'])
+                self.assertIsNone(data['next_cursor'])
+
+                self.app.post('/api/articles', json={'title': 'Breaking', 'content': 'News', 'author': 'Author'})
+                self.app.patch(f'/api/articles/{ids[3]}', json={'title': 'Title 3 (updated)'})
+                self.app.post(f'/api/articles/{ids[4]}/comments', json={'author': 'Reader', 'content': 'Nice'})
+                with count_queries() as statements:
+                    data = json.loads(self.app.get('/api/articles/latest').data)
+                self.assertEqual(len(statements), 1)
+                self.assertEqual([item['title'] for item in data['data']],
+                                 ['Breaking', 'Title 4', 'Title 3 (updated)', 'Title 2'])
+                self.assertEqual(data['data'][1]['comment_count'], 1)
+
+                self.app.delete(f'/api/articles/{ids[4]}')
+                data = json.loads(self.app.get('/api/articles/latest').data)
+                self.assertEqual([item['title'] for item in data['data']],
+                                 ['Breaking', 'Title 3 (updated)', 'Title 2', 'Title 1'])
+                self.assertEqual(self.app.get('/api/articles/latest?cursor=invalid').status_code, 400)
+            finally:
+                app.config['FEED_SIZE'] = TestingConfig.FEED_SIZE
+                latest_feed.clear()
+
+    def test_latest_feed_consistency(self):
+        """
+        Test case for feed updates that must not leave gaps.
+
+        - Unpublishes an article of the feed and edits an older one outside it in one commit, and
+          asserts that the feed is refilled in order instead of taking the older one in.
+        - Deletes an article while the feed is rebuilt from another thread, and asserts that the
+          delete is not blocked by the query and that the deleted article is not served.
+        """
+        with app.app_context():
+            latest_feed.clear()
+            articles = [Article(title=f'Title {i}', content='Content', author='Author',
+                                pub_date=datetime(2024, 1, 1 + i)) for i in range(5)]
+            db.session.add_all(articles)
+            db.session.commit()
+            app.config['FEED_SIZE'] = 3
+            try:
+                titles = lambda: [item['title'] for item in json.loads(self.app.get('/api/articles/latest').data)['data']]
+                self.assertEqual(titles(), ['Title 4', 'Title 3', 'Title 2'])
+
+                articles[3].is_published = False
+                articles[0].title = 'Title 0 (updated)'
+                db.session.commit()
+                self.assertEqual(titles(), ['Title 4', 'Title 2', 'Title 1'])
+
+                read_newest = LatestFeed._read_newest
+                deleted = []
+
+                def concurrent_delete(feed, session, config):
+                    rows = read_newest(feed, session, config)
+                    if not deleted:
+                        # An article is deleted, and the commit reported by another thread, while
+                        # the rows are in flight
+                        with db.engine.begin() as connection:
+                            connection.execute(db.delete(Article.__table__).where(Article.id == articles[4].id))
+                        writer = threading.Thread(target=feed.invalidate, args=(ChangeSet(deleted={articles[4].id}),))
+                        writer.start()
+                        writer.join(timeout=5)
+                        deleted.append(not writer.is_alive())
+                    return rows
+
+                latest_feed.clear()
+                with patch.object(LatestFeed, '_read_newest', concurrent_delete):
+                    self.assertEqual(titles(), ['Title 2', 'Title 1', 'Title 0 (updated)'])
+                self.assertEqual(deleted, [True])
+            finally:
+                app.config['FEED_SIZE'] = TestingConfig.FEED_SIZE
+                latest_feed.clear()
+
+    def test_author_aggregates_maintained(self):
+        """
+        Test case for the per-author aggregates.
+
+        - Creates articles, then renames, comments on, unpublishes and deletes them through the API.
+        - Asserts after each change that the author's article count, last publication date and
+          comment count match the articles, and that authors without articles are removed.
+        - Asserts that moving an article to another author upserts the aggregates by deltas,
+          without reading the previous author first.
+        """
+        with app.app_context():
+            def author(name):
+                response = self.app.get(f'/api/authors/{name}')
+                return json.loads(response.data)['data'] if response.status_code == 200 else None
+
+            articles = [Article(title=f'Day {day}', content='Content', author='Ada  Lovelace',
+                                pub_date=datetime(2024, 1, day)) for day in (1, 3)]
+            db.session.add_all(articles)
+            db.session.commit()
+            ids = [article.id for article in articles]
+            data = author('ada lovelace')
+            self.assertEqual((data['author'], data['author_key'], data['article_count'], data['comment_count']),
+                             ('Ada  Lovelace', 'ada lovelace', 2, 0))
+            self.assertTrue(data['last_published_at'].startswith('2024-01-03'))
+
+            self.app.post(f'/api/articles/{ids[0]}/comments', json={'author': 'Reader', 'content': 'Nice'})
+            self.app.post(f'/api/articles/{ids[0]}/comments/bulk',
+                          json=[{'author': 'Reader', 'content': 'Bulk 1'}, {'author': 'Reader', 'content': 'Bulk 2'}])
+            self.assertEqual(author('ADA LOVELACE')['comment_count'], 3)
+
+            articles[1].is_published = False
+            db.session.commit()
+            self.assertTrue(author('Ada Lovelace')['last_published_at'].startswith('2024-01-01'))
+
+            with count_queries() as statements:
+                self.app.patch(f'/api/articles/{ids[0]}', json={'author': 'Grace Hopper'})
+            # The aggregates move by deltas, without grouping the authors' articles or reading the
+            # previous author first
+            self.assertFalse([statement for statement in statements if 'GROUP BY' in statement])
+            self.assertFalse([statement for statement in statements if statement.startswith('SELECT')])
+            self.assertTrue([statement for statement in statements if 'ON CONFLICT (author_key) DO UPDATE' in statement])
+            self.assertEqual((author('Ada Lovelace')['article_count'], author('Ada Lovelace')['comment_count']), (1, 0))
+            self.assertEqual((author('Grace Hopper')['article_count'], author('Grace Hopper')['comment_count']), (1, 3))
+
+            self.app.delete(f'/api/articles/{ids[1]}')
+            self.assertIsNone(author('Ada Lovelace'))
+            self.assertEqual(self.app.get('/api/authors/Ada Lovelace').status_code, 404)
+            self.app.delete('/api/articles/bulk', json={'author': 'Grace Hopper'})
+            self.assertIsNone(author('Grace Hopper'))
+
+    def test_author_move_counts_concurrent_comments(self):
+        """
+        Test case for moving an article to another author while it is being commented.
+
+        - Loads an article, adds a comment from another session, then changes the article's
+          author through the ORM like PUT does.
+        - Asserts that both authors' comment totals count the comment where it now belongs.
+        """
+        with app.app_context():
+            def author(name):
+                return json.loads(self.app.get(f'/api/authors/{name}').data)['data']
+
+            db.session.add_all([Article(title=f'Title {i}', content='Content', author='Ada Lovelace') for i in range(2)])
+            db.session.commit()
+            article = db.session.scalars(db.select(Article).filter_by(title='Title 0')).one()
+            self.assertEqual(article.comment_count, 0)
+
+            with orm.Session(db.engine) as other:
+                other.add(Comment(author='Reader', content='Nice', article_id=article.id))
+                other.commit()
+
+            article.author = 'Grace Hopper'
+            db.session.commit()
+            self.assertEqual((author('Ada Lovelace')['article_count'], author('Ada Lovelace')['comment_count']), (1, 0))
+            self.assertEqual((author('Grace Hopper')['article_count'], author('Grace Hopper')['comment_count']), (1, 1))
+
+    def test_get_authors(self):
+        """
+        Test case for listing authors.
+
+        - Creates articles for three authors.
+        - Asserts the default order (most articles first), other sort keys and cursor pages, and
+          that the list is read from the aggregates table without grouping articles.
+        - Asserts that the author filter of article lists ignores case and extra whitespace.
+        """
+        with app.app_context():
+            for name, count in (('Ada', 1), ('Grace', 3), ('Linus', 2)):
+                db.session.add_all([Article(title=f'{name} {i}', content='Content', author=name,
+                                            pub_date=datetime(2024, count, 1 + i)) for i in range(count)])
+            db.session.commit()
+
+            with count_queries() as statements:
+                data = json.loads(self.app.get('/api/authors').data)
+            self.assertEqual([(item['author'], item['article_count']) for item in data['data']],
+                             [('Grace', 3), ('Linus', 2), ('Ada', 1)])
+            self.assertEqual(len(statements), 1)
+            self.assertIn('FROM author_stats', statements[0])
+            self.assertNotIn('GROUP BY', statements[0])
+
+            data = json.loads(self.app.get('/api/authors?sort=author_key&per_page=2').data)
+            self.assertEqual([item['author'] for item in data['data']], ['Ada', 'Grace'])
+            data = json.loads(self.app.get(f"/api/authors?sort=author_key&per_page=2&cursor={data['next_cursor']}").data)
+            self.assertEqual([item['author'] for item in data['data']], ['Linus'])
+            self.assertIsNone(data['next_cursor'])
+            data = json.loads(self.app.get('/api/authors?sort=-last_published_at').data)
+            self.assertEqual([item['author'] for item in data['data']], ['Grace', 'Linus', 'Ada'])
+            self.assertEqual(self.app.get('/api/authors?sort=author').status_code, 400)
+
+            data = json.loads(self.app.get('/api/articles?author=%20GRACE%20').data)
+            self.assertEqual(data['total_article'], 3)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import patch
+from flask import json
+from app import db, create_app
+from app.models.article import Article
+from app.models.comment import Comment
+from app.schemas.article_schema import ArticleSchema
+from app.schemas.comment_schema import CommentSchema
+from app.utils import serializer
+from app.utils.serializer import article_serializer, comment_serializer
+from config import TestingConfig
+
+# Application bound to the testing database
+app = create_app(TestingConfig)
+
+
+# Test case class for testing the fast serializer
+class SerializerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create the test database with one article and a comment.
+        """
+        with app.app_context():
+            db.create_all()
+            article = Article(title='Title', content='Content', author='Author')
+            db.session.add(article)
+            db.session.add(Comment(author='Commenter', content='Nice', article=article))
+            db.session.commit()
+
+    def tearDown(self):
+        """
+        Remove the test database and session.
+        """
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_matches_schema_dump(self):
+        """
+        Test case for the fast serializer producing the same output as the marshmallow schemas.
+        """
+        with app.app_context():
+            article = Article.query.first()
+            row = db.session.execute(db.select(*article_serializer.columns)).first()
+            comment_row = db.session.execute(db.select(*comment_serializer.columns)).first()
+
+            self.assertEqual(article_serializer.to_dict(row), ArticleSchema(exclude=('comments',)).dump(article))
+            self.assertEqual(comment_serializer.to_dict(comment_row), CommentSchema().dump(article.comments[0]))
+
+    def test_json_encoders_agree(self):
+        """
+        Test case for the orjson and stdlib encoders producing equivalent JSON.
+        """
+        with app.app_context():
+            row = db.session.execute(db.select(*article_serializer.columns)).first()
+            payload = {"data": [article_serializer.to_dict(row)]}
+            with patch.object(serializer, 'orjson', None):
+                fallback = serializer.dumps(payload)
+            self.assertEqual(json.loads(serializer.dumps(payload)), json.loads(fallback))
+
+
+if __name__ == '__main__':
+    unittest.main()